@@ -0,0 +1,128 @@
+"""
+Times each RepositoryGateway method across backends and storage layouts as the number of files,
+versions and objects grows. Each version after the first rewrites a tenth of the bundle's files.
+
+    python -m benchmarks.gateway --file-counts 1,100,10000 --version-counts 1,10,100 --output results.json
+
+Comparing the ocfl and native backends' commit_object_changes timings gives per-commit latency
+of rocfl against the native writer.
+"""
+import json
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable
+
+import typer
+
+from benchmarks.stage_object_files import make_bundle
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.fake_repository_gateway import FakeRepositoryGateway
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+from gateway.repository_gateway import RepositoryGateway
+from gateway.storage_layout import StorageLayout
+
+app = typer.Typer()
+
+COORDINATOR = Coordinator("benchmark", "benchmark@example.edu")
+
+
+def make_gateway(backend: str, layout: StorageLayout, storage_path: Path) -> RepositoryGateway:
+    match backend:
+        case "fake":
+            return FakeRepositoryGateway()
+        case "ocfl":
+            return OcflRepositoryGateway(storage_path=storage_path, storage_layout=layout)
+        case "native":
+            return NativeOcflRepositoryGateway(storage_path=storage_path, storage_layout=layout)
+    raise ValueError(f"Unknown backend {backend}")
+
+
+def update_bundle(bundle: Bundle, version: int) -> None:
+    changed_count = max(1, len(bundle.entries) // 10)
+    start = (version * changed_count) % len(bundle.entries)
+    for entry in (bundle.entries * 2)[start:start + changed_count]:
+        (bundle.root_path / entry).write_text(f"{entry} in version {version}\n")
+
+
+class Timings:
+
+    def __init__(self) -> None:
+        self.durations: defaultdict[str, list[float]] = defaultdict(list)
+
+    def time(self, method: Callable[..., Any], *args: Any) -> Any:
+        start = time.perf_counter()
+        result = method(*args)
+        self.durations[method.__name__].append(time.perf_counter() - start)
+        return result
+
+
+def run_scenario(
+    backend: str, layout: StorageLayout, file_count: int, version_count: int, object_count: int
+) -> Timings:
+    timings = Timings()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        gateway = make_gateway(backend, layout, temp_path / "storage")
+        gateway.create_repository()
+        for object_index in range(object_count):
+            id = f"benchmark_{object_index:05d}"
+            bundle = make_bundle(temp_path / "bundles" / id, file_count, files_per_directory=100)
+            timings.time(gateway.create_staged_object, id)
+            for version in range(1, version_count + 1):
+                if version > 1:
+                    update_bundle(bundle, version)
+                timings.time(gateway.stage_object_files, id, bundle)
+                timings.time(gateway.commit_object_changes, id, COORDINATOR, f"Version {version}")
+            timings.time(gateway.has_object, id)
+            timings.time(gateway.get_object_files, id)
+            timings.time(gateway.log, id)
+    return timings
+
+
+@app.command()
+def run(
+    backends: str = typer.Option("fake,ocfl,native", help="Comma-separated backends to time: fake, ocfl, native"),
+    layouts: str = typer.Option(
+        ",".join(layout.name for layout in StorageLayout), help="Comma-separated storage layout names for ocfl and native"
+    ),
+    file_counts: str = typer.Option("1,100,1000", help="Comma-separated numbers of files per object"),
+    version_counts: str = typer.Option("1,10", help="Comma-separated numbers of versions per object"),
+    object_count: int = typer.Option(1, help="Number of objects stored in each scenario"),
+    output: Path | None = typer.Option(None, help="Write results as JSON to this path"),
+):
+    results = []
+    for backend in backends.split(","):
+        backend_layouts = [StorageLayout[name] for name in layouts.split(",")] if backend != "fake" else [None]
+        for layout in backend_layouts:
+            for file_count in [int(count) for count in file_counts.split(",")]:
+                for version_count in [int(count) for count in version_counts.split(",")]:
+                    timings = run_scenario(backend, layout, file_count, version_count, object_count)
+                    for method, durations in timings.durations.items():
+                        result = {
+                            "backend": backend,
+                            "layout": layout.name if layout else None,
+                            "files": file_count,
+                            "versions": version_count,
+                            "objects": object_count,
+                            "method": method,
+                            "calls": len(durations),
+                            "total_seconds": sum(durations),
+                            "mean_seconds": sum(durations) / len(durations),
+                            "max_seconds": max(durations),
+                        }
+                        results.append(result)
+                        print(
+                            f"{backend:>5} {result['layout'] or '-':>15} {file_count:>6} files {version_count:>4} versions"
+                            f"  {method:<22} mean {result['mean_seconds']:.6f}s  total {result['total_seconds']:.3f}s"
+                        )
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,91 @@
+"""
+Compares hashing a payload the way ingest did with bagit alone (bagit hashes it when making the bag and
+again when validating it, then staging hashes it once more) with recording its digests once through
+utils.digest_ledger, making the bag from them and validating it with BagAdapter's single-pass check.
+
+    python -m benchmarks.hashing --path /path/to/large.tif
+    python -m benchmarks.hashing --size-mb 2048
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import bagit
+import typer
+
+from dor.adapters.bag_adapter import BagAdapter
+from dor.providers.file_system_file_provider import FilesystemFileProvider
+from utils.digest_ledger import LEDGER_ALGORITHMS, DigestLedger, TrustPolicy
+from utils.digests import compute_digest
+
+app = typer.Typer()
+
+
+def make_payload(file_path: Path, work_path: Path) -> Path:
+    payload_path = Path(tempfile.mkdtemp(dir=work_path))
+    try:
+        os.link(file_path, payload_path / file_path.name)
+    except OSError:
+        shutil.copy(file_path, payload_path / file_path.name)
+    return payload_path
+
+
+def hash_per_tool(payload_path: Path) -> None:
+    bag = bagit.make_bag(str(payload_path), checksums=LEDGER_ALGORITHMS)
+    bag.validate()
+    for file_path in (payload_path / "data").iterdir():
+        compute_digest(file_path, "sha512")
+
+
+def hash_with_ledger(payload_path: Path) -> None:
+    # Staging reuses the ledger's sha512 digests, so it does not hash again
+    digest_ledger = DigestLedger.record_directory(payload_path)
+    bag = BagAdapter.make(
+        payload_path, FilesystemFileProvider(), digest_ledger=digest_ledger, trust_policy=TrustPolicy.reuse
+    )
+    bag.validate()
+
+
+def time_hashing(hash_payload: Callable[[Path], None], file_path: Path, work_path: Path, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        payload_path = make_payload(file_path, work_path)
+        start = time.perf_counter()
+        hash_payload(payload_path)
+        timings.append(time.perf_counter() - start)
+        shutil.rmtree(payload_path)
+    return min(timings)
+
+
+@app.command()
+def run(
+    path: Path | None = typer.Option(None, help="Existing file to hash, such as a preservation TIFF"),
+    size_mb: int = typer.Option(1024, help="Size of the random file to generate when no path is given"),
+    repeat: int = typer.Option(3, help="Number of timed runs; the fastest is reported"),
+    output: Path | None = typer.Option(None, help="Write results as JSON to this path"),
+):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_path = Path(temp_dir)
+        if path is None:
+            path = work_path / "random.bin"
+            with open(path, "wb") as file:
+                for _ in range(size_mb):
+                    file.write(os.urandom(1024 * 1024))
+
+        size = path.stat().st_size
+        per_tool = time_hashing(hash_per_tool, path, work_path, repeat)
+        with_ledger = time_hashing(hash_with_ledger, path, work_path, repeat)
+
+    results = {"bytes": size, "per_tool_seconds": per_tool, "with_ledger_seconds": with_ledger}
+    megabytes = size / (1024 * 1024)
+    print(f"{megabytes:.0f} MB  per tool {per_tool:.3f}s  with ledger {with_ledger:.3f}s")
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,63 @@
+"""
+Times OcflRepositoryGateway.stage_object_files as the number of files in a bundle grows,
+comparing batched staging with one rocfl invocation per file.
+
+    python -m benchmarks.stage_object_files --file-counts 1,10,100,1000
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from gateway.bundle import Bundle
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+
+app = typer.Typer()
+
+
+def make_bundle(root_path: Path, file_count: int, files_per_directory: int) -> Bundle:
+    entries = []
+    for i in range(file_count):
+        entry = Path(f"directory_{i // files_per_directory:05d}") / f"file_{i:06d}.txt"
+        (root_path / entry).parent.mkdir(parents=True, exist_ok=True)
+        (root_path / entry).write_text(f"File {i}\n")
+        entries.append(entry)
+    return Bundle(root_path=root_path, entries=entries)
+
+
+def time_staging(storage_path: Path, bundle: Bundle, max_files_per_copy: int) -> float:
+    gateway = OcflRepositoryGateway(storage_path=storage_path)
+    gateway.max_files_per_copy = max_files_per_copy
+    gateway.create_repository()
+    gateway.create_staged_object("benchmark")
+
+    start = time.perf_counter()
+    gateway.stage_object_files("benchmark", bundle)
+    return time.perf_counter() - start
+
+
+@app.command()
+def run(
+    file_counts: str = typer.Option("1,10,100,1000", help="Comma-separated bundle sizes to time"),
+    files_per_directory: int = typer.Option(100, help="Number of files placed in each bundle directory"),
+    output: Path | None = typer.Option(None, help="Write results as JSON to this path"),
+):
+    results = []
+    for file_count in [int(count) for count in file_counts.split(",")]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            bundle = make_bundle(temp_path / "bundle", file_count, files_per_directory)
+            batched = time_staging(temp_path / "batched", bundle, OcflRepositoryGateway.max_files_per_copy)
+            per_file = time_staging(temp_path / "per_file", bundle, 1)
+
+        results.append({"files": file_count, "batched_seconds": batched, "per_file_seconds": per_file})
+        print(f"{file_count:>8} files  batched {batched:10.3f}s  per file {per_file:10.3f}s")
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    app()
@@ -1,9 +1,37 @@
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Self
 
 import bagit
 
-from dor.providers.file_provider import FileProvider 
+from dor.providers.file_provider import FileProvider
+from utils.digest_ledger import DigestLedger, DigestLedgerMismatchError, LedgerEntry, TrustPolicy, choose_sample
+from utils.digests import compute_digests, copy_with_digests
+
+
+# Below this many payload bytes, starting extra workers costs more than it saves
+SMALL_PAYLOAD_SIZE = 64 * 1024 * 1024
+
+
+def choose_workers(file_sizes: list[int]) -> int:
+    """
+    Picks how many files to hash at once: at most one worker per core and per file, and no more than
+    the total size over the largest file's size, since each file is hashed by a single worker.
+    """
+    total_size = sum(file_sizes)
+    if total_size < SMALL_PAYLOAD_SIZE:
+        return 1
+    balanced_workers = math.ceil(total_size / max(file_sizes))
+    return max(1, min(os.cpu_count() or 1, len(file_sizes), balanced_workers))
+
+
+def encode_manifest_path(path: str) -> str:
+    """Percent-encodes line breaks, which a BagIt manifest line cannot hold, as bagit.make_bag does."""
+    return path.replace("\r", "%0D").replace("\n", "%0A")
 
 
 class DorInfoMissingError(Exception):
@@ -28,10 +56,70 @@ class BagAdapter:
         return cls(bagit_bag, file_provider)
 
     @classmethod
-    def make(cls, payload_path: Path, file_provider: FileProvider) -> Self:
-        bagit_bag = bagit.make_bag(str(payload_path))
+    def make(
+        cls,
+        payload_path: Path,
+        file_provider: FileProvider,
+        workers: int | None = None,
+        digest_ledger: DigestLedger | None = None,
+        trust_policy: TrustPolicy = TrustPolicy.full,
+    ) -> Self:
+        """
+        Makes a bag of the files in payload_path. Manifest digests come from digest_ledger, relative to
+        payload_path, as far as trust_policy allows; other files are hashed.
+        """
+        if workers is None:
+            workers = choose_workers([
+                (Path(directory) / file_name).stat().st_size
+                for directory, _, file_names in os.walk(payload_path)
+                for file_name in file_names
+            ])
+        if digest_ledger is not None and trust_policy != TrustPolicy.full:
+            try:
+                return cls(cls._make_bag_from_ledger(payload_path, digest_ledger, trust_policy, workers), file_provider)
+            except DigestLedgerMismatchError:
+                # A sampled file no longer matches the ledger, so none of it is trusted
+                pass
+        bagit_bag = bagit.make_bag(str(payload_path), processes=workers)
         return cls(bagit_bag, file_provider)
 
+    @staticmethod
+    def _make_bag_from_ledger(
+        payload_path: Path, digest_ledger: DigestLedger, trust_policy: TrustPolicy, workers: int
+    ) -> bagit.Bag:
+        # bagit.make_bag bags an empty directory, the payload is moved in afterwards, and the payload manifests
+        # are written from resolved digests instead of hashing every file. The digests are resolved before
+        # anything moves, so a mismatch leaves the payload as it was.
+        payload_path = payload_path.absolute()
+        file_paths = sorted(
+            (Path(directory) / file_name).relative_to(payload_path).as_posix()
+            for directory, _, file_names in os.walk(payload_path)
+            for file_name in file_names
+        )
+        digests = digest_ledger.resolve(
+            payload_path, file_paths, bagit.DEFAULT_CHECKSUMS, trust_policy, workers=workers
+        )
+        total_bytes = sum((payload_path / file_path).stat().st_size for file_path in file_paths)
+
+        held_path = Path(tempfile.mkdtemp(dir=payload_path.parent, prefix=f".{payload_path.name}."))
+        for entry in payload_path.iterdir():
+            entry.rename(held_path / entry.name)
+        bagit.make_bag(str(payload_path), checksums=bagit.DEFAULT_CHECKSUMS)
+        for entry in held_path.iterdir():
+            entry.rename(payload_path / "data" / entry.name)
+        held_path.rmdir()
+
+        for algorithm in bagit.DEFAULT_CHECKSUMS:
+            with open(payload_path / f"manifest-{algorithm}.txt", "w", encoding="utf-8") as manifest:
+                for file_path in file_paths:
+                    manifest.write(f"{digests[file_path][algorithm]}  {encode_manifest_path(f'data/{file_path}')}\n")
+
+        bagit_bag = bagit.Bag(str(payload_path))
+        bagit_bag.info["Payload-Oxum"] = f"{total_bytes}.{len(file_paths)}"
+        # Writes bag-info.txt and the tag manifests
+        bagit_bag.save()
+        return bagit_bag
+
     def __init__(self, bag, file_provider: FileProvider) -> None:
         self.bag = bag
         self.file_provider = file_provider
@@ -57,16 +145,138 @@ class BagAdapter:
         except DorInfoMissingError:
             return False
 
-    def validate(self) -> None:
+    def _get_file_path(self, relative_path: str) -> Path:
+        return Path(self.bag.path) / self.bag.normalized_filesystem_names.get(relative_path, relative_path)
+
+    def _get_algorithms(self, expected_digests: dict[str, str]) -> list[str]:
+        return sorted(algorithm for algorithm in expected_digests if algorithm in self.bag.algorithms)
+
+    @staticmethod
+    def _find_mismatches(
+        relative_path: str, expected_digests: dict[str, str], digests: dict[str, str]
+    ) -> list[bagit.ChecksumMismatch]:
+        return [
+            bagit.ChecksumMismatch(relative_path, algorithm, expected_digests[algorithm].lower(), digest)
+            for algorithm, digest in digests.items()
+            if expected_digests[algorithm].lower() != digest
+        ]
+
+    def _check_entry(self, relative_path: str, expected_digests: dict[str, str]) -> list[bagit.ChecksumMismatch]:
+        file_path = self._get_file_path(relative_path)
+        try:
+            digests = compute_digests(file_path, self._get_algorithms(expected_digests))
+        except OSError as e:
+            raise bagit.BagValidationError(f"Could not read {file_path}: {e}")
+        return self._find_mismatches(relative_path, expected_digests, digests)
+
+    def _choose_entries_to_check(self, trust_policy: TrustPolicy) -> list[str]:
+        if trust_policy == TrustPolicy.reuse:
+            return []
+        if trust_policy == TrustPolicy.sample:
+            return choose_sample(self.bag.entries)
+        return list(self.bag.entries)
+
+    def _validate_entries(self, workers: int | None = None, trust_policy: TrustPolicy = TrustPolicy.full) -> None:
+        # Replaces bagit's own fixity pass so every manifest algorithm is checked from one read per file.
+        # hashlib releases the GIL while hashing, so threads hash files in parallel.
+        relative_paths = self._choose_entries_to_check(trust_policy)
+        if not relative_paths:
+            return
+        if workers is None:
+            workers = choose_workers([self._get_file_path(path).stat().st_size for path in relative_paths])
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            mismatches = executor.map(lambda path: self._check_entry(path, self.bag.entries[path]), relative_paths)
+            errors = [error for entry_errors in mismatches for error in entry_errors]
+        if errors:
+            raise bagit.BagValidationError("Bag validation failed", errors)
+
+    def validate(self, workers: int | None = None, trust_policy: TrustPolicy = TrustPolicy.full) -> None:
+        """
+        Checks the bag, hashing up to workers files at once; by default the count suits the payload.
+        Under the reuse trust policy only the bag's completeness is checked, and under the sample policy
+        only a random sample of its files is hashed.
+        """
+        try:
+            self.bag.validate(completeness_only=True)
+            self._validate_entries(workers, trust_policy)
+        except bagit.BagValidationError as e:
+            raise ValidationError(f"Validation failed with the following message: \"{str(e)}\"")
+        self._validate_dor_info()
+
+    def get_digest_ledger(self) -> DigestLedger:
+        """The bag's manifest digests as a ledger of the files under its directory."""
+        return DigestLedger({
+            relative_path: LedgerEntry.for_file(self._get_file_path(relative_path), digests)
+            for relative_path, digests in self.bag.payload_entries().items()
+        })
+
+    def _copy_file(
+        self, relative_path: Path, destination_path: Path, entry: tuple[str, dict[str, str]] | None
+    ) -> list[bagit.ChecksumMismatch]:
+        source_file_path = Path(self.bag.path) / relative_path
+        destination_file_path = destination_path / relative_path
+        destination_file_path.parent.mkdir(parents=True, exist_ok=True)
+        if entry is None:
+            shutil.copy2(source_file_path, destination_file_path)
+            return []
+
+        manifest_path, expected_digests = entry
+        try:
+            digests = copy_with_digests(source_file_path, destination_file_path, self._get_algorithms(expected_digests))
+            shutil.copystat(source_file_path, destination_file_path)
+        except OSError as e:
+            raise bagit.BagValidationError(f"Could not copy {source_file_path}: {e}")
+        return self._find_mismatches(manifest_path, expected_digests, digests)
+
+    def copy_validated(
+        self, destination_path: Path, workers: int | None = None, trust_policy: TrustPolicy = TrustPolicy.full
+    ) -> Self:
+        """
+        Copies the bag to destination_path, checking each manifest entry against digests computed while it is
+        copied rather than from a second read, and returns the copy. Raises ValidationError as validate does,
+        after removing the partial copy. The trust policy limits which entries are checked as validate's does.
+        """
+        source_path = Path(self.bag.path)
+        entries = {}
+        for manifest_path in self._choose_entries_to_check(trust_policy):
+            file_path = self.bag.normalized_filesystem_names.get(manifest_path, manifest_path)
+            entries[file_path] = (manifest_path, self.bag.entries[manifest_path])
         try:
-            self.bag.validate()
+            self.bag.validate(completeness_only=True)
         except bagit.BagValidationError as e:
             raise ValidationError(f"Validation failed with the following message: \"{str(e)}\"")
 
+        file_paths = [
+            (Path(directory) / file_name).relative_to(source_path)
+            for directory, _, file_names in os.walk(source_path)
+            for file_name in file_names
+        ]
+        if workers is None:
+            workers = choose_workers([(source_path / file_path).stat().st_size for file_path in file_paths])
+        destination_path.mkdir(parents=True)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                mismatches = executor.map(
+                    lambda file_path: self._copy_file(file_path, destination_path, entries.get(file_path.as_posix())),
+                    file_paths
+                )
+                errors = [error for file_errors in mismatches for error in file_errors]
+            if errors:
+                raise bagit.BagValidationError("Bag validation failed", errors)
+            bag_copy = type(self).load(destination_path, self.file_provider)
+            bag_copy._validate_dor_info()
+        except (bagit.BagValidationError, ValidationError) as e:
+            # Leaves nothing behind for a later attempt to trip over
+            shutil.rmtree(destination_path)
+            if isinstance(e, ValidationError):
+                raise
+            raise ValidationError(f"Validation failed with the following message: \"{str(e)}\"")
+        return bag_copy
+
+    def _validate_dor_info(self) -> None:
         if self.has_dor_info:
             tag_files = [file for file in self.bag.tagfile_entries()]
             dor_info_in_tagmanifest = self.dor_info_file_name in tag_files
             if not dor_info_in_tagmanifest:
                 raise ValidationError("dor-info.txt must be listed in the tagmanifest file.")
-        return
 
@@ -0,0 +1,71 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from dor.adapters.sqlalchemy import Base
+from dor.domain import models
+
+
+class CheckpointStore(ABC):
+
+    @abstractmethod
+    def add(self, checkpoint: models.IngestCheckpoint) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, tracking_identifier: str) -> models.IngestCheckpoint | None:
+        raise NotImplementedError
+
+
+class MemoryCheckpointStore(CheckpointStore):
+
+    def __init__(self):
+        self.checkpoints: dict[str, models.IngestCheckpoint] = {}
+
+    def add(self, checkpoint: models.IngestCheckpoint) -> None:
+        self.checkpoints[checkpoint.tracking_identifier] = checkpoint
+
+    def get(self, tracking_identifier: str) -> models.IngestCheckpoint | None:
+        return self.checkpoints.get(tracking_identifier)
+
+
+class IngestCheckpoint(Base):
+    __tablename__ = "ingest_checkpoint"
+
+    tracking_identifier: Mapped[str] = mapped_column(String(), primary_key=True)
+    package_identifier: Mapped[str] = mapped_column(String())
+    event_type: Mapped[str] = mapped_column(String())
+    event_data: Mapped[dict] = mapped_column(JSONB)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class SqlalchemyCheckpointStore(CheckpointStore):
+
+    def __init__(self, session):
+        self.session = session
+
+    def add(self, checkpoint: models.IngestCheckpoint) -> None:
+        entry = self.session.get(IngestCheckpoint, checkpoint.tracking_identifier)
+        if entry is None:
+            entry = IngestCheckpoint(tracking_identifier=checkpoint.tracking_identifier)
+            self.session.add(entry)
+        entry.package_identifier = checkpoint.package_identifier
+        entry.event_type = checkpoint.event_type.value
+        entry.event_data = checkpoint.event_data
+        entry.recorded_at = checkpoint.recorded_at
+
+    def get(self, tracking_identifier: str) -> models.IngestCheckpoint | None:
+        entry = self.session.get(IngestCheckpoint, tracking_identifier)
+        if entry is None:
+            return None
+        return models.IngestCheckpoint(
+            tracking_identifier=entry.tracking_identifier,
+            package_identifier=entry.package_identifier,
+            event_type=models.WorkflowEventType(entry.event_type),
+            event_data=entry.event_data,
+            recorded_at=entry.recorded_at
+        )
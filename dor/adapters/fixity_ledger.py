@@ -0,0 +1,93 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, select
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from dor.adapters.sqlalchemy import Base
+from dor.domain import models
+
+
+class FixityLedger(ABC):
+
+    @abstractmethod
+    def add(self, record: models.FixityRecord) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, identifier: str) -> models.FixityRecord | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_many(self, identifiers: list[str]) -> list[models.FixityRecord]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_all(self) -> list[models.FixityRecord]:
+        raise NotImplementedError
+
+
+class MemoryFixityLedger(FixityLedger):
+
+    def __init__(self):
+        self.records: dict[str, models.FixityRecord] = {}
+
+    def add(self, record: models.FixityRecord) -> None:
+        self.records[record.identifier] = record
+
+    def get(self, identifier: str) -> models.FixityRecord | None:
+        return self.records.get(identifier)
+
+    def get_many(self, identifiers: list[str]) -> list[models.FixityRecord]:
+        return [self.records[identifier] for identifier in identifiers if identifier in self.records]
+
+    def get_all(self) -> list[models.FixityRecord]:
+        return list(self.records.values())
+
+
+class FixityLedgerEntry(Base):
+    __tablename__ = "fixity_ledger"
+
+    identifier: Mapped[str] = mapped_column(String(), primary_key=True)
+    inventory_digest: Mapped[str] = mapped_column(String())
+    validated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True, nullable=True)
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class SqlalchemyFixityLedger(FixityLedger):
+
+    def __init__(self, session):
+        self.session = session
+
+    @staticmethod
+    def _convert_orm_to_domain(entry: FixityLedgerEntry) -> models.FixityRecord:
+        return models.FixityRecord(
+            identifier=entry.identifier,
+            inventory_digest=entry.inventory_digest,
+            validated_at=entry.validated_at,
+            failed_at=entry.failed_at
+        )
+
+    def add(self, record: models.FixityRecord) -> None:
+        entry = self.session.get(FixityLedgerEntry, record.identifier)
+        if entry is None:
+            entry = FixityLedgerEntry(identifier=record.identifier)
+            self.session.add(entry)
+        entry.inventory_digest = record.inventory_digest
+        entry.validated_at = record.validated_at
+        entry.failed_at = record.failed_at
+
+    def get(self, identifier: str) -> models.FixityRecord | None:
+        entry = self.session.get(FixityLedgerEntry, identifier)
+        if entry is None:
+            return None
+        return self._convert_orm_to_domain(entry)
+
+    def get_many(self, identifiers: list[str]) -> list[models.FixityRecord]:
+        statement = select(FixityLedgerEntry).where(FixityLedgerEntry.identifier.in_(identifiers))
+        return [self._convert_orm_to_domain(entry) for entry in self.session.scalars(statement).all()]
+
+    def get_all(self) -> list[models.FixityRecord]:
+        statement = select(FixityLedgerEntry).order_by(FixityLedgerEntry.validated_at)
+        return [self._convert_orm_to_domain(entry) for entry in self.session.scalars(statement).all()]
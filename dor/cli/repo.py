@@ -1,11 +1,43 @@
+import json
+import os
+import sys
+from contextlib import nullcontext
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Optional
+
 import typer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dor.config import config
 from dor.domain.events import PackageSubmitted
-from dor.service_layer.framework import create_repo, workframe
+from dor.service_layer import fixity_service
+from dor.service_layer.checkpoint_service import CheckpointNotFoundError, FINAL_EVENT_TYPES, resume_ingest
+from dor.service_layer.framework import create_repo, get_storage_paths, make_gateway, workframe
+from dor.service_layer.unit_of_work import SqlalchemyUnitOfWork
+from gateway.layout_migration import LayoutMigration
+from gateway.object_index import ObjectIndex
+from gateway.object_lock import ObjectLocker
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+from gateway.pooled_repository_gateway import PooledRepositoryGateway
+from gateway.replication import ReplicationStatus, StorageRootReplicator
+from gateway.storage_layout import StorageLayout
+from gateway.structural_audit import StructuralAuditor
+from gateway.storage_root import read_storage_layout
+from gateway.validate import (
+    ParallelFixityValidator, RocflOCFLFixityValidator, ValidationReportSummary, write_validation_report
+)
 from utils.minter import minter
 
 app = typer.Typer(no_args_is_help=True)
 
 
+def get_report_path(storage_path: Path, object_path: Path) -> Path:
+    # With a storage pool configured, reported object paths include their storage root
+    return storage_path / object_path if config.pool_storage_paths else object_path
+
+
 @app.command()
 def initialize():
     create_repo()
@@ -20,4 +52,199 @@ def store(
         package_identifier=package_identifier,
         tracking_identifier=minter()
     )
-    message_bus.handle(event, uow)
+    typer.echo(f"Tracking identifier: {event.tracking_identifier}")
+    message_bus.handle(event)
+
+
+@app.command()
+def resume(
+    tracking_identifier: str = typer.Option(help="Tracking identifier of the interrupted ingest"),
+):
+    message_bus, uow = workframe()
+    try:
+        checkpoint = resume_ingest(tracking_identifier, uow, message_bus)
+    except CheckpointNotFoundError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1)
+    if checkpoint.event_type in FINAL_EVENT_TYPES:
+        typer.echo(f"Ingest of {checkpoint.package_identifier} already ended with {checkpoint.event_type.value}.")
+    else:
+        typer.echo(f"Resumed ingest of {checkpoint.package_identifier} after {checkpoint.event_type.value}.")
+
+
+@app.command()
+def validate(
+    workers: int = typer.Option(os.cpu_count() or 1, help="Number of rocfl processes to run at once per storage root"),
+    readers_per_device: int = typer.Option(4, help="Maximum number of objects read at once from a single device"),
+    no_fixity: bool = typer.Option(False, help="Skip content fixity checks"),
+    output: Optional[Path] = typer.Option(None, help="Write one JSON line per object to this file as it completes"),
+    records: bool = typer.Option(
+        False, help="Validate with a single rocfl process, writing one JSON line per reported problem instead"
+    ),
+):
+    if records:
+        summary = ValidationReportSummary(records=0, errors=0, warnings=0)
+        with open(output, "w") if output else nullcontext(sys.stdout) as report:
+            for storage_path in get_storage_paths():
+                rocfl_validator = RocflOCFLFixityValidator(repository_path=storage_path)
+                summary += write_validation_report(rocfl_validator.iter_repository(no_fixity=no_fixity), report)
+        typer.echo(f"Reported {summary.errors} errors and {summary.warnings} warnings.", err=True)
+        return
+
+    gateway = make_gateway()
+    if isinstance(gateway, PooledRepositoryGateway):
+        results = gateway.validate_repositories(
+            workers_per_root=workers, readers_per_device=readers_per_device, no_fixity=no_fixity
+        )
+    else:
+        validator = ParallelFixityValidator(
+            RocflOCFLFixityValidator(repository_path=config.storage_path),
+            workers=workers,
+            readers_per_device=readers_per_device
+        )
+        results = validator.validate_repository(no_fixity=no_fixity)
+    total = invalid = 0
+    with open(output, "w") if output else nullcontext(sys.stdout) as report:
+        for result in results:
+            total += 1
+            invalid += 0 if result.is_valid else 1
+            report.write(json.dumps({
+                "object_path": str(result.object_path),
+                "is_valid": result.is_valid,
+                "message": result.message,
+                "records": [record.to_dict() for record in result.records]
+            }) + "\n")
+            report.flush()
+    typer.echo(f"Validated {total} objects; {invalid} invalid.", err=True)
+
+
+@app.command()
+def audit_structure(
+    workers: int = typer.Option(os.cpu_count() or 1, help="Number of objects to check at once"),
+    output: Optional[Path] = typer.Option(None, help="Write one JSON line per invalid object to this file"),
+):
+    total = invalid = 0
+    with open(output, "w") if output else nullcontext(sys.stdout) as report:
+        for storage_path in get_storage_paths():
+            auditor = StructuralAuditor(storage_path, workers=workers)
+            for result in auditor.audit_repository():
+                total += 1
+                if result.is_valid:
+                    continue
+                invalid += 1
+                report.write(json.dumps({
+                    "object_path": str(get_report_path(storage_path, result.object_path)),
+                    "records": [record.to_dict() for record in result.records]
+                }) + "\n")
+                report.flush()
+    typer.echo(f"Audited the structure of {total} objects; {invalid} invalid.", err=True)
+    if invalid:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def audit_fixity(
+    max_age_days: int = typer.Option(365, help="Revalidate objects whose last successful check is older than this"),
+    window_runs: Optional[int] = typer.Option(
+        None, help="Spread revalidation of stale objects over this many runs (e.g. 30 for nightly runs over a month)"
+    ),
+    retry_after_hours: float = typer.Option(24, help="Check objects that failed again once this many hours pass"),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Number of rocfl processes to run at once"),
+    readers_per_device: int = typer.Option(4, help="Maximum number of objects read at once from a single device"),
+):
+    validators = [
+        ParallelFixityValidator(
+            RocflOCFLFixityValidator(repository_path=storage_path),
+            workers=workers,
+            readers_per_device=readers_per_device
+        )
+        for storage_path in get_storage_paths()
+    ]
+    uow = SqlalchemyUnitOfWork(
+        gateway=make_gateway(),
+        session_factory=sessionmaker(bind=create_engine(config.get_database_engine_url()))
+    )
+    total = invalid = 0
+    results = fixity_service.audit_pool_fixity(
+        uow, validators, now=datetime.now(tz=UTC), max_age=timedelta(days=max_age_days), window_runs=window_runs,
+        retry_after=timedelta(hours=retry_after_hours)
+    )
+    for result in results:
+        total += 1
+        if not result.is_valid:
+            invalid += 1
+            typer.echo(f"Object {result.identifier} is invalid:\n{result.message}")
+    typer.echo(f"Audited {total} objects; {invalid} invalid.", err=True)
+
+
+@app.command()
+def reindex(
+    workers: int = typer.Option(os.cpu_count() or 1, help="Number of inventories to read at once"),
+):
+    total = sum(ObjectIndex(storage_path).rebuild(workers=workers) for storage_path in get_storage_paths())
+    typer.echo(f"Indexed {total} objects.")
+
+
+@app.command()
+def migrate_layout(
+    target_layout: str = typer.Option(StorageLayout.HASHED_N_TUPLE.name, help="Name of the layout to move objects into"),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Number of objects to move at once"),
+):
+    # Only its object locks are used, so a version already being written when the migration starts finishes first
+    gateway = OcflRepositoryGateway(
+        storage_path=config.storage_path,
+        object_locker=ObjectLocker(config.storage_path, timeout=config.object_lock_timeout)
+    )
+    migration = LayoutMigration.read_in_progress(config.storage_path, workers=workers, gateway=gateway)
+    if migration is not None:
+        typer.echo(f"Resuming migration to {migration.target_layout.name}.", err=True)
+    else:
+        source_layout = read_storage_layout(config.storage_path) or StorageLayout.FLAT_DIRECT
+        migration = LayoutMigration(
+            config.storage_path, source_layout, StorageLayout[target_layout], workers=workers, gateway=gateway
+        )
+        migration.start()
+    typer.echo(
+        f"While the migration runs, set STORAGE_LAYOUT={migration.target_layout.name} and "
+        f"PREVIOUS_STORAGE_LAYOUT={migration.source_layout.name} so services can read objects in either layout; "
+        "writes to the repository are refused until it finishes.",
+        err=True
+    )
+
+    total = sum(1 for _ in migration.run())
+    migration.finish()
+
+    object_index = ObjectIndex(config.storage_path)
+    if object_index.exists():
+        object_index.rebuild(workers=workers)
+    typer.echo(
+        f"Moved {total} objects. Set STORAGE_LAYOUT={migration.target_layout.name} and clear PREVIOUS_STORAGE_LAYOUT."
+    )
+
+
+@app.command()
+def replicate(
+    mirror_path: list[Path] = typer.Option(
+        help="Storage root to bring up to date with the repository; with a storage pool, one per root in pool order"
+    ),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Number of objects to copy at once"),
+):
+    storage_paths = get_storage_paths()
+    if len(mirror_path) != len(storage_paths):
+        typer.echo(f"Give one mirror path for each of the {len(storage_paths)} storage roots.", err=True)
+        raise typer.Exit(code=1)
+    counts = {status: 0 for status in ReplicationStatus}
+    copied_bytes = 0
+    for storage_path, root_mirror_path in zip(storage_paths, mirror_path):
+        replicator = StorageRootReplicator(storage_path, root_mirror_path, workers=workers)
+        for result in replicator.replicate():
+            counts[result.status] += 1
+            copied_bytes += result.copied_bytes
+            if result.status == ReplicationStatus.failed:
+                typer.echo(
+                    f"Failed to replicate {get_report_path(storage_path, result.object_path)}: {result.message}"
+                )
+    summary = ", ".join(f"{count} {status.value}" for status, count in counts.items())
+    typer.echo(f"Replicated objects: {summary}; {copied_bytes} bytes copied.", err=True)
+    if counts[ReplicationStatus.failed]:
+        raise typer.Exit(code=1)
@@ -4,6 +4,12 @@ from pathlib import Path
 
 import sqlalchemy
 
+from dor.providers.translocator import InboxPolicy
+from gateway.enumerations import StagingMode
+from gateway.pooled_repository_gateway import PlacementPolicy
+from gateway.storage_layout import StorageLayout
+from utils.digest_ledger import TrustPolicy
+
 
 @dataclass
 class DatabaseConfig:
@@ -34,7 +40,17 @@ class RabbitMqConfig:
 @dataclass
 class Config:
     storage_path: Path
+    storage_layout: StorageLayout
+    previous_storage_layout: StorageLayout | None
+    staging_mode: StagingMode
+    object_lock_timeout: float
+    pool_storage_paths: list[Path]
+    pool_placement_policy: PlacementPolicy
     inbox_path: Path
+    inbox_policy: InboxPolicy
+    bag_workers: int | None
+    verify_on_receive: bool
+    digest_trust_policy: TrustPolicy
     workspaces_path: Path
     filesets_path: Path
     database: DatabaseConfig
@@ -47,7 +63,19 @@ class Config:
     def from_env(cls):
         return cls(
             storage_path=Path(os.getenv("STORAGE_PATH", "")),
+            storage_layout=StorageLayout[os.getenv("STORAGE_LAYOUT", StorageLayout.FLAT_DIRECT.name)],
+            previous_storage_layout=(
+                StorageLayout[os.environ["PREVIOUS_STORAGE_LAYOUT"]] if os.getenv("PREVIOUS_STORAGE_LAYOUT") else None
+            ),
+            staging_mode=StagingMode(os.getenv("STAGING_MODE", StagingMode.copy.value)),
+            object_lock_timeout=float(os.getenv("OBJECT_LOCK_TIMEOUT", "300")),
+            pool_storage_paths=[Path(path) for path in os.getenv("POOL_STORAGE_PATHS", "").split(os.pathsep) if path],
+            pool_placement_policy=PlacementPolicy(os.getenv("POOL_PLACEMENT_POLICY", PlacementPolicy.hash.value)),
             inbox_path=Path(os.getenv("INBOX_PATH", "")),
+            inbox_policy=InboxPolicy(os.getenv("INBOX_POLICY", InboxPolicy.keep.value)),
+            bag_workers=int(os.environ["BAG_WORKERS"]) if os.getenv("BAG_WORKERS") else None,
+            verify_on_receive=os.getenv("VERIFY_ON_RECEIVE", "true").lower() == "true",
+            digest_trust_policy=TrustPolicy(os.getenv("DIGEST_TRUST_POLICY", TrustPolicy.full.value)),
             workspaces_path=Path(os.getenv("WORKSPACES_PATH", "")),
             filesets_path=Path(os.getenv("FILESETS_PATH", "/data/filesets")),
             database=DatabaseConfig(
@@ -3,6 +3,7 @@ from typing import Any
 
 from dor.domain.models import VersionInfo
 from dor.providers.models import PackageResource
+from gateway.staging_summary import StagingSummary
 
 
 @dataclass
@@ -56,6 +57,8 @@ class PackageReceived(PackageEvent):
 @dataclass
 class PackageVerified(PackageEvent):
     workspace_identifier: str
+    # The verified bag's dor-info, so unpacking need not load the bag again
+    dor_info: dict[str, Any] | None = None
 
 
 @dataclass
@@ -77,6 +80,8 @@ class PackageStored(PackageEvent):
     resources: list[PackageResource]
     workspace_identifier: str
     revision_number: int
+    # What staging copied into the revision and what it skipped as already stored
+    staging_summary: StagingSummary = StagingSummary()
 
 
 @dataclass
@@ -59,3 +59,23 @@ class WorkflowEvent:
             timestamp=datetime.now(tz=UTC),
             message=message
         )
+
+
+@dataclass
+class FixityRecord:
+    identifier: str
+    # The inventory digest at the latest check
+    inventory_digest: str
+    # The latest successful check, if any
+    validated_at: datetime | None
+    # The latest check, if it failed
+    failed_at: datetime | None = None
+
+
+@dataclass
+class IngestCheckpoint:
+    tracking_identifier: str
+    package_identifier: str
+    event_type: WorkflowEventType
+    event_data: dict[str, Any]
+    recorded_at: datetime
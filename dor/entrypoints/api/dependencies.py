@@ -1,6 +1,10 @@
+from functools import cache
+
 import sqlalchemy
 
 from dor.config import config
+from dor.service_layer.framework import make_gateway
+from gateway.repository_gateway import RepositoryGateway
 
 
 def get_db_session():
@@ -15,3 +19,9 @@ def get_inbox_path():
 
 def get_pending_path():
     return config.filesets_path
+
+
+# One gateway serves every request, so its inventory cache is shared between them
+@cache
+def get_repository_gateway() -> RepositoryGateway:
+    return make_gateway()
@@ -5,6 +5,7 @@ import logging
 
 from .catalog import catalog_router
 from .filesets import filesets_router
+from .objects import objects_router
 from .packages import packages_router
 
 app = FastAPI()
@@ -20,5 +21,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(catalog_router)
 api_router.include_router(filesets_router)
+api_router.include_router(objects_router)
 api_router.include_router(packages_router)
 app.include_router(api_router)
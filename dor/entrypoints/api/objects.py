@@ -0,0 +1,61 @@
+import mimetypes
+import os
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.types import Receive, Scope, Send
+
+from dor.entrypoints.api.dependencies import get_repository_gateway
+from gateway.exceptions import RepositoryGatewayError
+from gateway.repository_gateway import RepositoryGateway
+
+
+objects_router = APIRouter(prefix="/objects")
+
+
+class ObjectFileResponse(FileResponse):
+    """
+    Hands whole-file responses to servers supporting the ASGI pathsend extension, which send them with
+    sendfile, and otherwise serves files, including Range requests, as FileResponse does.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        has_range = any(name == b"range" for name, _ in scope["headers"])
+        if "http.response.pathsend" not in scope.get("extensions", {}) or has_range or scope["method"] == "HEAD":
+            return await super().__call__(scope, receive, send)
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+
+
+def matches_etag(if_none_match: str, etag: str) -> bool:
+    return any(tag.strip() in ("*", etag) for tag in if_none_match.split(","))
+
+
+@objects_router.api_route("/{identifier}/files/{logical_path:path}", methods=["GET", "HEAD"])
+def get_object_file(
+    identifier: str,
+    logical_path: str,
+    version: int | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    gateway: RepositoryGateway = Depends(get_repository_gateway),
+) -> Response:
+    try:
+        object_file = gateway.get_object_file(identifier, Path(logical_path), version)
+        stat_result = object_file.literal_path.stat()
+    except (RepositoryGatewayError, FileNotFoundError):
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content="File not found")
+
+    # Content digests are stable across versions and moves, so they make strong validators.
+    headers = {"ETag": f'"{object_file.digest}"'} if object_file.digest else {}
+    if if_none_match is not None and headers and matches_etag(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return ObjectFileResponse(
+        object_file.literal_path,
+        media_type=mimetypes.guess_type(logical_path)[0] or "application/octet-stream",
+        headers=headers,
+        stat_result=stat_result,
+    )
@@ -6,6 +6,7 @@ from dor.providers.accumulator import Accumulator
 from dor.providers.file_set_identifier import FileSetIdentifier
 from dor.providers.file_system_file_provider import FilesystemFileProvider
 from dor.providers.operations import CopySource, Operation, OrientSourceImage
+from utils.digest_ledger import DigestLedger, TrustPolicy
 
 
 @dataclass
@@ -33,6 +34,7 @@ def build_file_set(
     inputs: list[Input],
     output_path: Path,
     collection_manager_email: str = "example@org.edu",
+    trust_policy: TrustPolicy = TrustPolicy.full,
 ) -> bool:
     file_set_directory = output_path / file_set_identifier.identifier
     create_file_set_directories(file_set_directory)
@@ -50,4 +52,7 @@ def build_file_set(
             command.operation(accumulator=accumulator, **command.kwargs).run()
 
     accumulator.write()
+    if trust_policy != TrustPolicy.full:
+        # Recorded while the files are fresh so packaging can reuse the digests
+        DigestLedger.record_directory(file_set_directory).write(DigestLedger.get_sidecar_path(file_set_directory))
     return True
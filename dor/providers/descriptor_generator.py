@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import datetime, UTC
 
@@ -32,6 +33,9 @@ class DescriptorGenerator:
             descriptor_file_path = build_descriptor_file_path(resource)
             output_path = self.package_path / descriptor_file_path
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            with (output_path).open("w") as f:
+            # Replaces rather than truncates the file, which may be hard linked to the inbox copy
+            temp_path = output_path.with_name(f".{output_path.name}.tmp")
+            with temp_path.open("w") as f:
                 f.write(xmldata)
+            os.replace(temp_path, output_path)
             self.entries.append(descriptor_file_path)
@@ -27,6 +27,14 @@ class FileProvider(ABC):
     def clone_directory_structure(self, source_path: Path, destination_path: Path):
         pass
 
+    @abstractmethod
+    def link_directory_structure(self, source_path: Path, destination_path: Path, hard_links: bool = False):
+        pass
+
+    @abstractmethod
+    def move_directory(self, source_path: Path, destination_path: Path):
+        pass
+
     @abstractmethod
     def delete_dir_and_contents(self, path: Path):
         pass
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 import shutil
 from dor.providers.file_provider import FileProvider
+from utils.file_clone import CloneMethod, clone_tree
 
 
 class FilesystemFileProvider(FileProvider):
@@ -32,6 +33,18 @@ class FilesystemFileProvider(FileProvider):
     def clone_directory_structure(self, source_path: Path, destination_path: Path):
         shutil.copytree(source_path, destination_path)
 
+    def link_directory_structure(self, source_path: Path, destination_path: Path, hard_links: bool = False):
+        # Reflinks share blocks copy-on-write; hard links share the files themselves, so neither copy may be edited in place.
+        methods = (CloneMethod.REFLINK, CloneMethod.HARDLINK, CloneMethod.COPY) if hard_links else (
+            CloneMethod.REFLINK, CloneMethod.COPY
+        )
+        clone_tree(source_path, destination_path, methods)
+
+    def move_directory(self, source_path: Path, destination_path: Path):
+        # A rename within a filesystem; across filesystems shutil.move falls back to copying then deleting.
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(source_path, destination_path)
+
     def delete_dir_and_contents(self, path: Path):
         shutil.rmtree(path, ignore_errors=True)
 
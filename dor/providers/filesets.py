@@ -101,7 +101,9 @@ def creates_a_file_set_from_uploaded_materials(
         file_commands = [command for profile in profiles for command in PROFILE_COMMANDS[profile]]
         inputs.append(Input(file_path=src_dir / file_name, commands=file_commands))
 
-    success = build_file_set(file_set_identifier=fsid, inputs=inputs, output_path=build_dir)
+    success = build_file_set(
+        file_set_identifier=fsid, inputs=inputs, output_path=build_dir, trust_policy=config.digest_trust_policy
+    )
     if success:
         eventpublisher.publish_to_exchange(
             FileSetCreated(identifier=fsid.identifier, job_idx=job_idx)
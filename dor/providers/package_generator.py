@@ -23,6 +23,7 @@ from dor.providers.models import (
 from dor.providers.repository_client import RepositoryClient
 from dor.providers.serializers import PreservationEventSerializer
 from dor.settings import template_env
+from utils.digest_ledger import DigestLedger, TrustPolicy
 from utils.minter import minter
 
 
@@ -73,7 +74,8 @@ class FileSetsPending:
     def pending(self, file_set_id: str) -> bool:
         return (self.root_path / file_set_id).exists()
 
-    def push(self, file_set_id: str, destination_path: Path) -> None:
+    def push(self, file_set_id: str, destination_path: Path) -> DigestLedger:
+        """Copies the latest build of the file set into destination_path and returns the build's digest ledger."""
         if not self.pending(file_set_id):
             raise FileSetsPendingError(
                 f"Expected file set \"{file_set_id}\" to be pending"
@@ -84,10 +86,9 @@ class FileSetsPending:
             if entry.is_dir()
         ]
 
-        self.file_provider.clone_directory_structure(
-            self.root_path / file_set_id / file_set_directories[0] / "build" / file_set_id,
-            destination_path / file_set_id
-        )
+        build_path = self.root_path / file_set_id / file_set_directories[0] / "build" / file_set_id
+        self.file_provider.clone_directory_structure(build_path, destination_path / file_set_id)
+        return DigestLedger.read(DigestLedger.get_sidecar_path(build_path))
 
 
 class PackageGenerator:
@@ -102,6 +103,8 @@ class PackageGenerator:
         file_sets_path: Path,
         timestamp: datetime,
         collection_manager_email: str = "example@org.edu",
+        bag_workers: int | None = None,
+        trust_policy: TrustPolicy = TrustPolicy.full,
     ):
         self.file_provider = file_provider
         self.metadata = metadata
@@ -112,6 +115,8 @@ class PackageGenerator:
         self.timestamp = timestamp
         self.repository_client = repository_client
         self.collection_manager_email = collection_manager_email
+        self.bag_workers = bag_workers
+        self.trust_policy = trust_policy
 
         self.root_resource_identifier: str = self.metadata["identifier"]
         self.type: str = self.metadata["type"]
@@ -258,10 +263,12 @@ class PackageGenerator:
 
         missing_file_set_ids = []
         file_set_ids = []
+        digest_ledger = DigestLedger()
         for struct_map_item in physical_struct_map.items:
             file_set_id = struct_map_item.file_set_id
             if self.file_sets_pending.pending(file_set_id=file_set_id):
-                self.file_sets_pending.push(file_set_id=file_set_id, destination_path=self.package_path)
+                file_set_ledger = self.file_sets_pending.push(file_set_id=file_set_id, destination_path=self.package_path)
+                digest_ledger.merge(file_set_ledger, prefix=file_set_id)
                 file_set_ids.append(file_set_id)
             else:
                 search_results = self.repository_client.search_for_file_set(file_set_id)
@@ -351,7 +358,13 @@ class PackageGenerator:
             "Root-Identifier": self.root_resource_identifier,
             "Identifier": file_set_ids,
         }
-        bag = BagAdapter.make(self.package_path, self.file_provider)
+        bag = BagAdapter.make(
+            self.package_path,
+            self.file_provider,
+            workers=self.bag_workers,
+            digest_ledger=digest_ledger,
+            trust_policy=self.trust_policy,
+        )
         bag.add_dor_info(dor_info=dor_info)
 
         return self.get_package_result(success=True, message="Generated package successfully!")
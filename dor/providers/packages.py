@@ -3,6 +3,7 @@ from datetime import datetime, UTC
 from pathlib import Path
 
 from dor.adapters import eventpublisher
+from dor.config import config
 from dor.domain.events import PackageGenerated
 from dor.providers.file_system_file_provider import FilesystemFileProvider
 from dor.providers.repository_client import FakeRepositoryClient
@@ -27,7 +28,9 @@ def create_package_from_metadata(
         deposit_group=deposit_group,
         output_path=inbox_path,
         file_sets_path=pending_path,
-        timestamp=datetime.now(tz=UTC)
+        timestamp=datetime.now(tz=UTC),
+        bag_workers=config.bag_workers,
+        trust_policy=config.digest_trust_policy
     ).generate()
 
     event = PackageGenerated(
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
 from typing import Callable
 
 from dor.providers.file_provider import FileProvider
 from gateway.bundle import Bundle
+from utils.digest_ledger import DigestLedger
 
 
 @dataclass
@@ -19,7 +21,7 @@ class FakeWorkspace:
             raise Exception()
         return self.package_directory() / "data"
 
-    def get_bundle(self, entries: list[Path]) -> Bundle:
+    def get_bundle(self, entries: list[Path], with_digests: bool = True) -> Bundle:
         return Bundle(
             root_path=self.object_data_directory(),
             entries=entries
@@ -39,31 +41,78 @@ class Workspace:
             raise Exception()
         return self.package_directory() / "data"
 
-    def get_bundle(self, entries: list[Path]) -> Bundle:
+    def get_bundle(self, entries: list[Path], with_digests: bool = True) -> Bundle:
+        """
+        Bundles entries of the object data directory. Digests verifying the package left in its ledger are
+        included with_digests; files written after verification should be bundled without them.
+        """
+        digests = {}
+        if with_digests:
+            package_directory = self.package_directory()
+            digest_ledger = DigestLedger.read(DigestLedger.get_sidecar_path(package_directory))
+            for entry in entries:
+                entry_digests = digest_ledger.get_current(package_directory, f"data/{entry.as_posix()}")
+                if entry_digests is not None:
+                    digests[entry] = entry_digests
         return Bundle(
             root_path=self.object_data_directory(),
-            entries=entries
+            entries=entries,
+            digests=digests
         )
 
 
+class InboxPolicy(Enum):
+    # The inbox keeps an independent copy, made with reflinks where the filesystem supports them
+    keep = "keep"
+    # The inbox keeps its files, which the workspace may hard link to; neither may then be edited in place
+    share = "share"
+    # The package is moved out of the inbox, a rename when both are on one filesystem
+    consume = "consume"
+
+
 class FakeTranslocator:
 
-    def create_workspace_for_package(self, package_identifier: str) -> FakeWorkspace:
+    def create_workspace_for_package(
+        self, package_identifier: str, copy_package: Callable[[Path, Path], None] | None = None
+    ) -> FakeWorkspace:
         return FakeWorkspace(package_identifier)
 
 
 class Translocator():
 
-    def __init__(self, inbox_path: Path, workspaces_path: Path, minter: Callable[[], str], file_provider: FileProvider) -> None:
+    def __init__(
+        self,
+        inbox_path: Path,
+        workspaces_path: Path,
+        minter: Callable[[], str],
+        file_provider: FileProvider,
+        inbox_policy: InboxPolicy = InboxPolicy.keep
+    ) -> None:
         self.inbox_path = inbox_path
         self.workspaces_path = workspaces_path
         self.minter = minter
         self.file_provider = file_provider
-
-    def create_workspace_for_package(self, package_identifier: str) -> Workspace:
+        self.inbox_policy = inbox_policy
+
+    def create_workspace_for_package(
+        self, package_identifier: str, copy_package: Callable[[Path, Path], None] | None = None
+    ) -> Workspace:
+        """
+        Places the package in a new workspace as the inbox policy directs,
+        or by calling copy_package with the package and workspace paths.
+        """
         workspace_id = self.minter()
         workspace_path = self.workspaces_path / workspace_id
-        self.file_provider.clone_directory_structure(
-            self.inbox_path / package_identifier, workspace_path
-        )
+        package_path = self.inbox_path / package_identifier
+        if copy_package is not None:
+            copy_package(package_path, workspace_path)
+            return Workspace(str(workspace_path))
+
+        match self.inbox_policy:
+            case InboxPolicy.keep:
+                self.file_provider.link_directory_structure(package_path, workspace_path)
+            case InboxPolicy.share:
+                self.file_provider.link_directory_structure(package_path, workspace_path, hard_links=True)
+            case InboxPolicy.consume:
+                self.file_provider.move_directory(package_path, workspace_path)
         return Workspace(str(workspace_path))
@@ -0,0 +1,50 @@
+from datetime import datetime, UTC
+
+from dor.adapters.converter import converter
+from dor.domain import events
+from dor.domain.events import PackageEvent, PackageUnpacked
+from dor.domain.models import IngestCheckpoint, WorkflowEventType
+from dor.service_layer.handlers.store_files import find_uncataloged_version
+from dor.service_layer.message_bus.memory_message_bus import MemoryMessageBus
+from dor.service_layer.unit_of_work import AbstractUnitOfWork
+
+# Ingest ends with these, so there is nothing left to resume after them
+FINAL_EVENT_TYPES = {WorkflowEventType.REVISION_CATALOGED, WorkflowEventType.PACKAGE_NOT_VERIFIED}
+
+
+class CheckpointNotFoundError(Exception):
+    pass
+
+
+def create_checkpoint(event: PackageEvent) -> IngestCheckpoint:
+    return IngestCheckpoint(
+        tracking_identifier=event.tracking_identifier,
+        package_identifier=event.package_identifier,
+        event_type=WorkflowEventType(event.__class__.__name__),
+        event_data=converter.unstructure(event),
+        recorded_at=datetime.now(tz=UTC)
+    )
+
+
+def rehydrate_event(checkpoint: IngestCheckpoint) -> PackageEvent:
+    event_class = getattr(events, checkpoint.event_type.value)
+    return converter.structure(checkpoint.event_data, event_class)
+
+
+def resume_ingest(tracking_identifier: str, uow: AbstractUnitOfWork, message_bus: MemoryMessageBus) -> IngestCheckpoint:
+    """
+    Handles the last event recorded for the ingest again, so it carries on with the stage after the last
+    one completed. Returns the checkpoint it resumed from, which is left alone if ingest already ended.
+    If storing had already committed the package's version, ingest carries on from that version
+    rather than committing another.
+    """
+    with uow:
+        checkpoint = uow.checkpoint_store.get(tracking_identifier)
+    if checkpoint is None:
+        raise CheckpointNotFoundError(f"No checkpoint found for tracking identifier {tracking_identifier}")
+    if checkpoint.event_type not in FINAL_EVENT_TYPES:
+        event = rehydrate_event(checkpoint)
+        if isinstance(event, PackageUnpacked):
+            event = find_uncataloged_version(event, uow) or event
+        message_bus.handle(event)
+    return checkpoint
@@ -0,0 +1,166 @@
+import math
+from dataclasses import dataclass, replace
+from itertools import batched
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from dor.domain.models import FixityRecord
+from dor.service_layer.unit_of_work import AbstractUnitOfWork
+from gateway.ocfl_inventory import OcflInventory
+from gateway.storage_root import find_object_paths
+from gateway.validate import ParallelFixityValidator
+
+# How long an object that failed its check waits before it is checked again
+DEFAULT_RETRY_AFTER = timedelta(days=1)
+
+# How many candidates are selected from at once
+DEFAULT_PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class AuditCandidate:
+    identifier: str
+    object_path: Path
+    inventory_digest: str
+
+
+@dataclass
+class FixityAuditResult:
+    identifier: str
+    object_path: Path
+    is_valid: bool
+    message: str
+
+
+def find_audit_candidates(storage_path: Path) -> Iterator[AuditCandidate]:
+    for object_path in find_object_paths(storage_path):
+        inventory = OcflInventory.read(storage_path / object_path)
+        inventory_digest = OcflInventory.read_sidecar_digest(storage_path / object_path)
+        if inventory is None or inventory_digest is None:
+            # Leave broken objects to the full validation, which reports them properly
+            continue
+        yield AuditCandidate(
+            identifier=inventory.id, object_path=object_path, inventory_digest=inventory_digest
+        )
+
+
+def select_due_candidates(
+    candidates: Iterable[AuditCandidate],
+    records: dict[str, FixityRecord],
+    now: datetime,
+    max_age: timedelta,
+    window_runs: int | None = None,
+    retry_after: timedelta = DEFAULT_RETRY_AFTER
+) -> list[AuditCandidate]:
+    """
+    Objects whose inventory changed since their last check are always due, and objects that failed their last
+    check are due again once retry_after has passed. Objects never validated, then those last validated longer
+    than max_age ago, are due oldest first, but only 1/window_runs of the candidates is taken from them per run
+    so re-verification trickles.
+    """
+    candidates = list(candidates)
+    changed: list[AuditCandidate] = []
+    retried: list[AuditCandidate] = []
+    unvalidated: list[AuditCandidate] = []
+    stale: list[tuple[datetime, AuditCandidate]] = []
+    for candidate in candidates:
+        record = records.get(candidate.identifier)
+        if record is not None and record.inventory_digest != candidate.inventory_digest:
+            changed.append(candidate)
+        elif record is not None and record.failed_at is not None:
+            if now - record.failed_at >= retry_after:
+                retried.append(candidate)
+        elif record is None or record.validated_at is None:
+            unvalidated.append(candidate)
+        elif now - record.validated_at >= max_age:
+            stale.append((record.validated_at, candidate))
+
+    queued = unvalidated + [candidate for _, candidate in sorted(stale, key=lambda item: item[0])]
+    if window_runs:
+        queued = queued[:math.ceil(len(candidates) / window_runs)]
+    return changed + retried + queued
+
+
+def find_due_candidates(
+    uow: AbstractUnitOfWork,
+    storage_path: Path,
+    now: datetime,
+    max_age: timedelta,
+    window_runs: int | None = None,
+    retry_after: timedelta = DEFAULT_RETRY_AFTER,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Iterator[AuditCandidate]:
+    """
+    Selects due candidates a page at a time, reading only the page's fixity records, so neither the
+    repository nor the ledger is held in memory. Ordering and the window share apply within each page.
+    """
+    for page in batched(find_audit_candidates(storage_path), page_size):
+        with uow:
+            records = {
+                record.identifier: record
+                for record in uow.fixity_ledger.get_many([candidate.identifier for candidate in page])
+            }
+        yield from select_due_candidates(page, records, now, max_age, window_runs, retry_after)
+
+
+def audit_fixity(
+    uow: AbstractUnitOfWork,
+    validator: ParallelFixityValidator,
+    now: datetime,
+    max_age: timedelta,
+    window_runs: int | None = None,
+    retry_after: timedelta = DEFAULT_RETRY_AFTER,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Iterator[FixityAuditResult]:
+    # Only the candidates waiting on the validator are kept
+    due_candidates: dict[Path, AuditCandidate] = {}
+
+    def get_due_object_paths() -> Iterator[Path]:
+        for candidate in find_due_candidates(
+            uow, validator.rocflvalidator.repository_path, now, max_age, window_runs, retry_after, page_size
+        ):
+            due_candidates[candidate.object_path] = candidate
+            yield candidate.object_path
+
+    for result in validator.validate_objects_by_path(get_due_object_paths()):
+        candidate = due_candidates.pop(result.object_path)
+        checked_at = datetime.now(tz=UTC)
+        with uow:
+            if result.is_valid:
+                validated_at, failed_at = checked_at, None
+            else:
+                record = uow.fixity_ledger.get(candidate.identifier)
+                validated_at, failed_at = (record.validated_at if record is not None else None), checked_at
+            uow.fixity_ledger.add(FixityRecord(
+                identifier=candidate.identifier,
+                inventory_digest=candidate.inventory_digest,
+                validated_at=validated_at,
+                failed_at=failed_at
+            ))
+            uow.commit()
+        yield FixityAuditResult(
+            identifier=candidate.identifier,
+            object_path=result.object_path,
+            is_valid=result.is_valid,
+            message=result.message
+        )
+
+
+def audit_pool_fixity(
+    uow: AbstractUnitOfWork,
+    validators: list[ParallelFixityValidator],
+    now: datetime,
+    max_age: timedelta,
+    window_runs: int | None = None,
+    retry_after: timedelta = DEFAULT_RETRY_AFTER,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Iterator[FixityAuditResult]:
+    """
+    Audits the storage roots of a pool, one validator per root, in turn.
+    Each result's object_path includes its storage root.
+    """
+    for validator in validators:
+        storage_path = validator.rocflvalidator.repository_path
+        for result in audit_fixity(uow, validator, now, max_age, window_runs, retry_after, page_size):
+            yield replace(result, object_path=storage_path / result.object_path)
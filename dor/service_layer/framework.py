@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Callable, Type, Tuple
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -6,6 +7,7 @@ from dor.adapters.sqlalchemy import Base
 from dor.config import config
 from dor.domain.events import (
     Event,
+    PackageNotVerified,
     PackageReceived,
     PackageStored,
     PackageSubmitted,
@@ -15,21 +17,53 @@ from dor.domain.events import (
 )
 from dor.providers.file_system_file_provider import FilesystemFileProvider
 from dor.providers.package_resource_provider import PackageResourceProvider
-from dor.providers.translocator import Translocator, Workspace
+from dor.providers.translocator import InboxPolicy, Translocator, Workspace
 from dor.service_layer.handlers.catalog_revision import catalog_revision
+from dor.service_layer.handlers.receive_and_verify_package import receive_and_verify_package
 from dor.service_layer.handlers.receive_package import receive_package
+from dor.service_layer.handlers.record_checkpoint import record_checkpoint
 from dor.service_layer.handlers.record_workflow_event import record_workflow_event
 from dor.service_layer.handlers.store_files import store_files
 from dor.service_layer.handlers.unpack_package import unpack_package
 from dor.service_layer.handlers.verify_package import verify_package
 from dor.service_layer.message_bus.memory_message_bus import MemoryMessageBus
 from dor.service_layer.unit_of_work import SqlalchemyUnitOfWork
+from gateway.object_index import ObjectIndex
+from gateway.object_lock import ObjectLocker
 from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+from gateway.pooled_repository_gateway import PooledRepositoryGateway, PoolLookup
+from gateway.repository_gateway import RepositoryGateway
 from utils.minter import minter
 
 
+def make_root_gateway(storage_path: Path) -> OcflRepositoryGateway:
+    return OcflRepositoryGateway(
+        storage_path=storage_path,
+        storage_layout=config.storage_layout,
+        previous_storage_layout=config.previous_storage_layout,
+        object_index=ObjectIndex(storage_path),
+        staging_mode=config.staging_mode,
+        object_locker=ObjectLocker(storage_path, timeout=config.object_lock_timeout)
+    )
+
+
+def get_storage_paths() -> list[Path]:
+    # The storage path and the pool's roots make one pool, whose lookup is kept in the storage path
+    return [config.storage_path, *config.pool_storage_paths]
+
+
+def make_gateway() -> RepositoryGateway:
+    if not config.pool_storage_paths:
+        return make_root_gateway(config.storage_path)
+    return PooledRepositoryGateway(
+        [make_root_gateway(storage_path) for storage_path in get_storage_paths()],
+        placement_policy=config.pool_placement_policy,
+        lookup=PoolLookup.in_storage_root(config.storage_path)
+    )
+
+
 def create_repo():
-    gateway = OcflRepositoryGateway(storage_path=config.storage_path)
+    gateway = make_gateway()
     gateway.create_repository()
 
     engine = create_engine(config.get_database_engine_url())
@@ -37,7 +71,7 @@ def create_repo():
 
 
 def workframe() -> Tuple[MemoryMessageBus, SqlalchemyUnitOfWork]:
-    gateway = OcflRepositoryGateway(storage_path=config.storage_path)
+    gateway = make_gateway()
 
     engine = create_engine(config.get_database_engine_url())
     session_factory = sessionmaker(bind=engine)
@@ -48,34 +82,60 @@ def workframe() -> Tuple[MemoryMessageBus, SqlalchemyUnitOfWork]:
         inbox_path=config.inbox_path,
         workspaces_path=config.workspaces_path,
         minter=minter,
-        file_provider=file_provider
+        file_provider=file_provider,
+        inbox_policy=config.inbox_policy
     )
 
+    # Copying into the workspace reads the whole package anyway, so it can be verified in the same pass.
+    # Under the other inbox policies nothing is copied, and verifying separately reads the package once.
+    if config.verify_on_receive and config.inbox_policy == InboxPolicy.keep:
+        def receive_handler(event: PackageSubmitted) -> None:
+            receive_and_verify_package(
+                event, uow, translocator, BagAdapter, file_provider,
+                workers=config.bag_workers, trust_policy=config.digest_trust_policy
+            )
+    else:
+        def receive_handler(event: PackageSubmitted) -> None:
+            receive_package(event, uow, translocator)
+
     event_handlers: dict[Type[Event], list[Callable]] = {
         PackageSubmitted: [
             lambda event: record_workflow_event(event, uow),
-            lambda event: receive_package(event, uow, translocator)
+            lambda event: record_checkpoint(event, uow),
+            receive_handler
         ],
         PackageReceived: [
             lambda event: record_workflow_event(event, uow),
-            lambda event: verify_package(event, uow, BagAdapter, Workspace, file_provider)
+            lambda event: record_checkpoint(event, uow),
+            lambda event: verify_package(
+                event, uow, BagAdapter, Workspace, file_provider,
+                workers=config.bag_workers, trust_policy=config.digest_trust_policy
+            )
         ],
         PackageVerified: [
             lambda event: record_workflow_event(event, uow),
+            lambda event: record_checkpoint(event, uow),
             lambda event: unpack_package(
                 event, uow, BagAdapter, PackageResourceProvider, Workspace, file_provider
             )
         ],
         PackageUnpacked: [
             lambda event: record_workflow_event(event, uow),
+            lambda event: record_checkpoint(event, uow),
             lambda event: store_files(event, uow, Workspace)
         ],
         PackageStored: [
             lambda event: record_workflow_event(event, uow),
+            lambda event: record_checkpoint(event, uow),
             lambda event: catalog_revision(event, uow)
         ],
+        PackageNotVerified: [
+            lambda event: record_workflow_event(event, uow),
+            lambda event: record_checkpoint(event, uow)
+        ],
         RevisionCataloged: [
-            lambda event: record_workflow_event(event, uow)
+            lambda event: record_workflow_event(event, uow),
+            lambda event: record_checkpoint(event, uow)
         ]
     }
 
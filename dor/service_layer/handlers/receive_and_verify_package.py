@@ -0,0 +1,50 @@
+from pathlib import Path
+from typing import Any
+
+from dor.adapters.bag_adapter import ValidationError
+from dor.domain.events import PackageNotVerified, PackageSubmitted, PackageVerified
+from dor.providers.file_provider import FileProvider
+from dor.service_layer.unit_of_work import AbstractUnitOfWork
+from utils.digest_ledger import DigestLedger, TrustPolicy
+
+
+def receive_and_verify_package(
+    event: PackageSubmitted,
+    uow: AbstractUnitOfWork,
+    translocator: Any,
+    bag_adapter_class: type,
+    file_provider: FileProvider,
+    workers: int | None = None,
+    trust_policy: TrustPolicy = TrustPolicy.full
+) -> None:
+    # Stands in for receive_package and verify_package, checking the bag as it is copied
+    # so its payload is read once rather than twice.
+    dor_info: dict[str, Any] | None = None
+
+    def copy_package(package_path: Path, workspace_path: Path) -> None:
+        nonlocal dor_info
+        bag_copy = bag_adapter_class.load(package_path, file_provider).copy_validated(
+            workspace_path, workers=workers, trust_policy=trust_policy
+        )
+        if trust_policy != TrustPolicy.full:
+            # Lets storing the files reuse the verified digests
+            bag_copy.get_digest_ledger().write(DigestLedger.get_sidecar_path(workspace_path))
+        if bag_copy.has_dor_info:
+            dor_info = bag_copy.dor_info
+
+    try:
+        workspace = translocator.create_workspace_for_package(event.package_identifier, copy_package=copy_package)
+        uow.add_event(PackageVerified(
+            package_identifier=event.package_identifier,
+            tracking_identifier=event.tracking_identifier,
+            workspace_identifier=workspace.identifier,
+            update_flag=event.update_flag,
+            dor_info=dor_info,
+        ))
+    except ValidationError as e:
+        uow.add_event(PackageNotVerified(
+            package_identifier=event.package_identifier,
+            tracking_identifier=event.tracking_identifier,
+            message=e.message,
+            update_flag=event.update_flag,
+        ))
@@ -0,0 +1,10 @@
+from dor.domain.events import PackageEvent
+from dor.service_layer.checkpoint_service import create_checkpoint
+from dor.service_layer.unit_of_work import AbstractUnitOfWork
+
+
+def record_checkpoint(event: PackageEvent, uow: AbstractUnitOfWork):
+    # Replaces the previous checkpoint, so only the latest completed stage is kept
+    with uow:
+        uow.checkpoint_store.add(create_checkpoint(event))
+        uow.commit()
@@ -1,8 +1,45 @@
 from pathlib import Path
 from dor.domain.events import PackageStored, PackageUnpacked
+from dor.domain.models import Revision
+from dor.providers.models import PackageResource
 from dor.providers.package_resources_merger import PackageResourcesMerger
 from dor.service_layer.unit_of_work import AbstractUnitOfWork
 from dor.providers.descriptor_generator import DescriptorGenerator
+from gateway.exceptions import StagedObjectAlreadyExistsError
+
+
+def get_stored_resources(event: PackageUnpacked, revision: Revision | None) -> list[PackageResource]:
+    if revision:
+        merger = PackageResourcesMerger(current=revision.package_resources, incoming=event.resources)
+        return merger.merge_changes()
+    return event.resources
+
+
+def find_uncataloged_version(event: PackageUnpacked, uow: AbstractUnitOfWork) -> PackageStored | None:
+    """
+    Gets the PackageStored event for the object's head version if it was committed with the event's message
+    after the latest cataloged revision, as when storing stopped between committing and recording it.
+    """
+    with uow.gateway.lock_object(event.identifier):
+        if not uow.gateway.has_object(event.identifier):
+            return None
+        head_version = uow.gateway.log(id=event.identifier)[0]
+        with uow:
+            revision = uow.catalog.get(event.identifier)
+    if revision is not None and head_version.version <= revision.revision_number:
+        return None
+    if head_version.message != event.version_info.message:
+        return None
+    return PackageStored(
+        identifier=event.identifier,
+        workspace_identifier=event.workspace_identifier,
+        tracking_identifier=event.tracking_identifier,
+        package_identifier=event.package_identifier,
+        resources=get_stored_resources(event, revision),
+        update_flag=event.update_flag,
+        revision_number=head_version.version,
+    )
+
 
 def store_files(event: PackageUnpacked, uow: AbstractUnitOfWork, workspace_class: type) -> None:
     workspace = workspace_class(event.workspace_identifier, event.identifier)
@@ -13,39 +50,44 @@ def store_files(event: PackageUnpacked, uow: AbstractUnitOfWork, workspace_class
 
     bundle = workspace.get_bundle(entries)
 
-    revision = uow.catalog.get(event.identifier)
-    if revision is None: 
-        uow.gateway.create_staged_object(id=event.identifier)
+    # Workers handling packages for the same object take turns from staging through commit
+    with uow.gateway.lock_object(event.identifier):
+        revision = uow.catalog.get(event.identifier)
+        if revision is None and not uow.gateway.has_object(event.identifier):
+            try:
+                uow.gateway.create_staged_object(id=event.identifier)
+            except StagedObjectAlreadyExistsError:
+                # Left by an ingest that stopped partway through storing and is being resumed;
+                # files it already staged are skipped below
+                pass
 
-    uow.gateway.stage_object_files(
-        id=event.identifier,
-        source_bundle=bundle,
-    )
+        staging_summary = uow.gateway.stage_object_files(
+            id=event.identifier,
+            source_bundle=bundle,
+        )
 
-    resources = event.resources
-    if revision:
-        merger = PackageResourcesMerger(current=revision.package_resources, incoming=resources)
-        resources = merger.merge_changes()
+        resources = get_stored_resources(event, revision)
 
-    generator = DescriptorGenerator(
-        package_path=workspace.object_data_directory(),
-        resources=resources
-    )
-    generator.write_files()
-    descriptor_bundle = workspace.get_bundle(generator.entries)
-    uow.gateway.stage_object_files(
-        id=event.identifier,
-        source_bundle=descriptor_bundle,
-    )
+        generator = DescriptorGenerator(
+            package_path=workspace.object_data_directory(),
+            resources=resources
+        )
+        generator.write_files()
+        # The descriptors were just rewritten, so the package's recorded digests do not describe them
+        descriptor_bundle = workspace.get_bundle(generator.entries, with_digests=False)
+        staging_summary += uow.gateway.stage_object_files(
+            id=event.identifier,
+            source_bundle=descriptor_bundle,
+        )
 
-    uow.gateway.commit_object_changes(
-        id=event.identifier,
-        coordinator=event.version_info.coordinator,
-        message=event.version_info.message,
-    )
+        uow.gateway.commit_object_changes(
+            id=event.identifier,
+            coordinator=event.version_info.coordinator,
+            message=event.version_info.message,
+        )
 
-    version_log = uow.gateway.log(id=event.identifier)
-    revision_number = version_log[0].version
+        version_log = uow.gateway.log(id=event.identifier)
+        revision_number = version_log[0].version
 
     stored_event = PackageStored(
         identifier=event.identifier,
@@ -55,5 +97,6 @@ def store_files(event: PackageUnpacked, uow: AbstractUnitOfWork, workspace_class
         resources=resources,
         update_flag=event.update_flag,
         revision_number=revision_number,
+        staging_summary=staging_summary,
     )
     uow.add_event(stored_event)
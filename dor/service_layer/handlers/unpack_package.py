@@ -14,9 +14,9 @@ def unpack_package(
     file_provider: FileProvider,
 ) -> None:
     workspace = workspace_class(event.workspace_identifier)
-    bag_adapter = bag_adapter_class.load(workspace.package_directory(), file_provider)
-
-    info = bag_adapter.dor_info
+    info = event.dor_info
+    if info is None:
+        info = bag_adapter_class.load(workspace.package_directory(), file_provider).dor_info
     workspace.root_identifier = info["Root-Identifier"]
     resources = package_resource_provider_class(
         workspace.object_data_directory(), file_provider
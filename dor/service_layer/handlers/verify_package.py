@@ -2,21 +2,32 @@ from dor.adapters.bag_adapter import ValidationError
 from dor.domain.events import PackageNotVerified, PackageReceived, PackageVerified
 from dor.providers.file_provider import FileProvider
 from dor.service_layer.unit_of_work import AbstractUnitOfWork
+from utils.digest_ledger import DigestLedger, TrustPolicy
 
 def verify_package(
-    event: PackageReceived, uow: AbstractUnitOfWork, bag_adapter_class: type, workspace_class: type, file_provider: FileProvider
+    event: PackageReceived,
+    uow: AbstractUnitOfWork,
+    bag_adapter_class: type,
+    workspace_class: type,
+    file_provider: FileProvider,
+    workers: int | None = None,
+    trust_policy: TrustPolicy = TrustPolicy.full
 ) -> None:
     workspace = workspace_class(event.workspace_identifier)
 
     bag_adapter = bag_adapter_class.load(workspace.package_directory(), file_provider)
 
     try:
-        bag_adapter.validate()
+        bag_adapter.validate(workers=workers, trust_policy=trust_policy)
+        if trust_policy != TrustPolicy.full:
+            # Lets storing the files reuse the verified digests
+            bag_adapter.get_digest_ledger().write(DigestLedger.get_sidecar_path(workspace.package_directory()))
         uow.add_event(PackageVerified(
             package_identifier=event.package_identifier,
             tracking_identifier=event.tracking_identifier,
             workspace_identifier=workspace.identifier,
             update_flag=event.update_flag,
+            dor_info=bag_adapter.dor_info if bag_adapter.has_dor_info else None,
         ))
     except ValidationError as e:
         uow.add_event(PackageNotVerified(
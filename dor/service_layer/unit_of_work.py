@@ -4,7 +4,9 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from dor.adapters.catalog import Catalog, MemoryCatalog, SqlalchemyCatalog
+from dor.adapters.checkpoint_store import CheckpointStore, MemoryCheckpointStore, SqlalchemyCheckpointStore
 from dor.adapters.event_store import EventStore, MemoryEventStore, SqlalchemyEventStore
+from dor.adapters.fixity_ledger import FixityLedger, MemoryFixityLedger, SqlalchemyFixityLedger
 from dor.config import config
 from dor.domain.events import Event
 from gateway.repository_gateway import RepositoryGateway
@@ -12,7 +14,9 @@ from gateway.repository_gateway import RepositoryGateway
 
 class AbstractUnitOfWork(ABC):
     catalog: Catalog
+    checkpoint_store: CheckpointStore
     event_store: EventStore
+    fixity_ledger: FixityLedger
     gateway: RepositoryGateway
 
     @abstractmethod
@@ -44,7 +48,9 @@ class UnitOfWork(AbstractUnitOfWork):
         self.gateway = gateway
         self.events: list[Event] = []
         self.catalog = MemoryCatalog()
+        self.checkpoint_store = MemoryCheckpointStore()
         self.event_store = MemoryEventStore()
+        self.fixity_ledger = MemoryFixityLedger()
 
     def __enter__(self):
         pass
@@ -82,7 +88,9 @@ class SqlalchemyUnitOfWork(AbstractUnitOfWork):
     def __enter__(self):
         self.session = self.session_factory()
         self.catalog = SqlalchemyCatalog(self.session)
+        self.checkpoint_store = SqlalchemyCheckpointStore(self.session)
         self.event_store = SqlalchemyEventStore(self.session)
+        self.fixity_ledger = SqlalchemyFixityLedger(self.session)
 
     def __exit__(self, *args):
         self.rollback()
@@ -0,0 +1,257 @@
+import asyncio
+import threading
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator, TypeVar
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.enumerations import LogOrder
+from gateway.object_diff import ObjectDiff
+from gateway.object_file import ObjectFile
+from gateway.repository_gateway import RepositoryGateway
+from gateway.staging_summary import StagingSummary
+from gateway.version_info import VersionInfo
+
+T = TypeVar("T")
+
+# The (gateway, object id) pairs whose locks the current task or thread holds through lock_object,
+# so its own calls for those objects run under the lock rather than waiting on it
+held_object_locks: ContextVar[frozenset[tuple[Any, str]]] = ContextVar("held_object_locks", default=frozenset())
+
+
+class AsyncRepositoryGateway(metaclass=ABCMeta):
+
+    def lock_object(self, id: str) -> AbstractAsyncContextManager[None]:
+        """Holds an object's lock across several calls. Gateways without locking return a no-op."""
+        return nullcontext()
+
+    @abstractmethod
+    async def create_repository(self) -> None:
+        pass
+
+    @abstractmethod
+    async def create_staged_object(self, id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
+        pass
+
+    @abstractmethod
+    async def commit_object_changes(
+        self,
+        id: str,
+        coordinator: Coordinator,
+        message: str,
+        date: datetime = datetime.now(timezone.utc).astimezone()
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def purge_object(self, id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def has_object(self, id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_object_files(self, id: str, include_staged: bool = False) -> list[ObjectFile]:
+        pass
+
+    @abstractmethod
+    async def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        pass
+
+    @abstractmethod
+    async def log(self, id: str, order: LogOrder = LogOrder.descending) -> list[VersionInfo]:
+        pass
+
+    @abstractmethod
+    async def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        pass
+
+
+class ThreadedAsyncRepositoryGateway(AsyncRepositoryGateway):
+    """
+    Runs a blocking gateway's calls in worker threads so calls for different objects overlap.
+    At most max_concurrency calls run at once, and changes to a single object run one at a time.
+    While lock_object holds an object, the blocking gateway's lock is held by a thread of its own,
+    which runs the holder's changes to the object, since the blocking lock is only re-entrant within a thread.
+    Its semaphore and locks belong to the first event loop that waits on them, so it is used from one loop.
+    """
+
+    def __init__(self, gateway: RepositoryGateway, max_concurrency: int = 8) -> None:
+        self.gateway = gateway
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.object_locks: dict[str, asyncio.Lock] = {}
+        # The calls holding or waiting on each object's lock; a lock is dropped once it has none
+        self.object_lock_users: dict[str, int] = {}
+        # The thread holding the blocking gateway's lock for each object held through lock_object
+        self.held_object_executors: dict[str, ThreadPoolExecutor] = {}
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        async with self.semaphore:
+            return await asyncio.to_thread(function, *args)
+
+    @asynccontextmanager
+    async def _hold_object_lock(self, id: str) -> AsyncIterator[None]:
+        lock = self.object_locks.setdefault(id, asyncio.Lock())
+        self.object_lock_users[id] = self.object_lock_users.get(id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self.object_lock_users[id] -= 1
+            if not self.object_lock_users[id]:
+                del self.object_lock_users[id]
+                del self.object_locks[id]
+
+    async def _run_for_object(self, id: str, function: Callable[..., T], *args: Any) -> T:
+        if (self, id) in held_object_locks.get():
+            async with self.semaphore:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.held_object_executors[id], function, id, *args
+                )
+        async with self._hold_object_lock(id):
+            return await self._run(function, id, *args)
+
+    @asynccontextmanager
+    async def lock_object(self, id: str) -> AsyncIterator[None]:
+        held = held_object_locks.get()
+        if (self, id) in held:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        async with self._hold_object_lock(id):
+            blocking_lock = self.gateway.lock_object(id)
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                await loop.run_in_executor(executor, blocking_lock.__enter__)
+                self.held_object_executors[id] = executor
+                held_object_locks.set(held | {(self, id)})
+                try:
+                    yield
+                finally:
+                    # Set rather than reset, since a blocking caller may release the lock from another task
+                    held_object_locks.set(held)
+                    del self.held_object_executors[id]
+                    await loop.run_in_executor(executor, blocking_lock.__exit__, None, None, None)
+            finally:
+                executor.shutdown()
+
+    async def create_repository(self) -> None:
+        await self._run(self.gateway.create_repository)
+
+    async def create_staged_object(self, id: str) -> None:
+        await self._run_for_object(id, self.gateway.create_staged_object)
+
+    async def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
+        return await self._run_for_object(id, self.gateway.stage_object_files, source_bundle)
+
+    async def commit_object_changes(
+        self,
+        id: str,
+        coordinator: Coordinator,
+        message: str,
+        date: datetime = datetime.now(timezone.utc).astimezone()
+    ) -> None:
+        await self._run_for_object(id, self.gateway.commit_object_changes, coordinator, message, date)
+
+    async def purge_object(self, id: str) -> None:
+        await self._run_for_object(id, self.gateway.purge_object)
+
+    async def has_object(self, id: str) -> bool:
+        return await self._run(self.gateway.has_object, id)
+
+    async def get_object_files(self, id: str, include_staged: bool = False) -> list[ObjectFile]:
+        return await self._run(self.gateway.get_object_files, id, include_staged)
+
+    async def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        return await self._run(self.gateway.get_object_file, id, logical_path, version)
+
+    async def log(self, id: str, order: LogOrder = LogOrder.descending) -> list[VersionInfo]:
+        return await self._run(self.gateway.log, id, order)
+
+    async def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        return await self._run(self.gateway.diff, id, from_version, to_version)
+
+
+class SyncRepositoryGateway(RepositoryGateway):
+    """
+    Exposes an asynchronous gateway to blocking callers, running each call to completion.
+    Calls from every thread run on one event loop in a background thread, which the asynchronous
+    gateway's semaphore and locks stay bound to, until close is called.
+    A thread holding an object through lock_object carries the held lock into the calls it makes.
+    """
+
+    def __init__(self, gateway: AsyncRepositoryGateway) -> None:
+        self.gateway = gateway
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    @contextmanager
+    def lock_object(self, id: str) -> Iterator[None]:
+        held = held_object_locks.get()
+        if (self.gateway, id) in held:
+            yield
+            return
+        lock = self.gateway.lock_object(id)
+        self._run(lock.__aenter__())
+        # Coroutines run for this thread copy its context, so its later calls see the held lock
+        token = held_object_locks.set(held | {(self.gateway, id)})
+        try:
+            yield
+        finally:
+            held_object_locks.reset(token)
+            self._run(lock.__aexit__(None, None, None))
+
+    def create_repository(self) -> None:
+        self._run(self.gateway.create_repository())
+
+    def create_staged_object(self, id: str) -> None:
+        self._run(self.gateway.create_staged_object(id))
+
+    def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
+        return self._run(self.gateway.stage_object_files(id, source_bundle))
+
+    def commit_object_changes(
+        self,
+        id: str,
+        coordinator: Coordinator,
+        message: str,
+        date: datetime = datetime.now(timezone.utc).astimezone()
+    ) -> None:
+        self._run(self.gateway.commit_object_changes(id, coordinator, message, date))
+
+    def purge_object(self, id: str) -> None:
+        self._run(self.gateway.purge_object(id))
+
+    def has_object(self, id: str) -> bool:
+        return self._run(self.gateway.has_object(id))
+
+    def get_object_files(self, id: str, include_staged: bool = False) -> list[ObjectFile]:
+        return self._run(self.gateway.get_object_files(id, include_staged))
+
+    def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        return self._run(self.gateway.get_object_file(id, logical_path, version))
+
+    def log(self, id: str, order: LogOrder = LogOrder.descending) -> list[VersionInfo]:
+        return self._run(self.gateway.log(id, order))
+
+    def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        return self._run(self.gateway.diff(id, from_version, to_version))
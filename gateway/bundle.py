@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -6,3 +6,5 @@ from pathlib import Path
 class Bundle:
     root_path: Path
     entries: list[Path]
+    # Digests already known for entries, by algorithm, so staging need not hash those files again
+    digests: dict[Path, dict[str, str]] = field(default_factory=dict)
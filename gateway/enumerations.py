@@ -4,3 +4,12 @@ from enum import Enum
 class LogOrder(Enum):
     ascending = "ascending"
     descending = "descending"
+
+
+class StagingMode(Enum):
+    # Copies source files into staging with rocfl cp
+    copy = "copy"
+    # Reflinks or hard links source files into a directory on the storage root's filesystem
+    # (copying only when neither works) and moves them into staging with rocfl mv.
+    # Hard linked sources share their content with the stored files, so they must not be modified afterwards.
+    clone = "clone"
@@ -9,3 +9,9 @@ class ObjectDoesNotExistError(RepositoryGatewayError):
 
 class StagedObjectAlreadyExistsError(RepositoryGatewayError):
     pass
+
+class ObjectLockTimeoutError(RepositoryGatewayError):
+    pass
+
+class ObjectFileDoesNotExistError(RepositoryGatewayError):
+    pass
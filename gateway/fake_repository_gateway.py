@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Set
@@ -6,9 +6,16 @@ from typing import Set
 from gateway.bundle import Bundle
 from gateway.coordinator import Coordinator
 from gateway.enumerations import LogOrder
-from gateway.exceptions import ObjectDoesNotExistError, StagedObjectAlreadyExistsError
+from gateway.exceptions import (
+    ObjectDoesNotExistError,
+    ObjectFileDoesNotExistError,
+    RepositoryGatewayError,
+    StagedObjectAlreadyExistsError,
+)
+from gateway.object_diff import FileChange, ObjectDiff
 from gateway.object_file import ObjectFile
 from gateway.repository_gateway import RepositoryGateway
+from gateway.staging_summary import StagingSummary
 from gateway.version_info import VersionInfo
 
 
@@ -19,6 +26,7 @@ class Version():
     message: str
     date: datetime
     files: Set[Path]
+    staged_files: Set[Path] = field(default_factory=set)
 
 
 @dataclass
@@ -47,12 +55,13 @@ class FakeRepositoryGateway(RepositoryGateway):
 
         self.store[id] = RepositoryObject(staged_files=set(), versions=[])
 
-    def stage_object_files(self, id: str, source_bundle: Bundle) -> None:
+    def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
         file_paths = set(source_bundle.entries)
         if id not in self.store:
             raise ObjectDoesNotExistError()
 
         self.store[id].staged_files = self.store[id].staged_files.union(file_paths)
+        return StagingSummary(staged_files=len(file_paths))
 
     def _get_latest_version(self, id: str) -> Version | None:
         if self.store[id].versions:
@@ -79,7 +88,8 @@ class FakeRepositoryGateway(RepositoryGateway):
             coordinator=coordinator,
             message=message,
             date=date,
-            files=files
+            files=files,
+            staged_files=self.store[id].staged_files
         ))
         self.store[id].staged_files = set()
 
@@ -97,6 +107,18 @@ class FakeRepositoryGateway(RepositoryGateway):
             object_files.append(ObjectFile(logical_path=file_path, literal_path=file_path))
         return object_files
 
+    def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        if id not in self.store or not self.store[id].versions:
+            raise ObjectDoesNotExistError()
+
+        versions = self.store[id].versions
+        if version is not None and not 1 <= version <= len(versions):
+            raise RepositoryGatewayError(f"Version {version} not found for object {id}")
+        files = versions[-1 if version is None else version - 1].files
+        if logical_path not in files:
+            raise ObjectFileDoesNotExistError()
+        return ObjectFile(logical_path=logical_path, literal_path=logical_path)
+
     def purge_object(self, id: str) -> None:
         if id in self.store:
             self.store.pop(id)
@@ -118,3 +140,28 @@ class FakeRepositoryGateway(RepositoryGateway):
             return version_log
         except KeyError as e:
             raise ObjectDoesNotExistError() from e
+
+    def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        # The fake keeps no content, so files staged again in a later version count as modified.
+        if id not in self.store or not self.store[id].versions:
+            raise ObjectDoesNotExistError()
+
+        versions = self.store[id].versions
+        if to_version is None:
+            to_version = versions[-1].number
+        if not 0 <= from_version <= len(versions) or not 1 <= to_version <= len(versions):
+            raise RepositoryGatewayError(f"Version not found for object {id}")
+
+        from_files = versions[from_version - 1].files if from_version > 0 else set()
+        to_files = versions[to_version - 1].files
+        restaged_files: Set[Path] = set()
+        for version in versions[from_version:to_version]:
+            restaged_files |= version.staged_files
+
+        return ObjectDiff(
+            from_version=from_version,
+            to_version=to_version,
+            added=[FileChange(file, None, None) for file in sorted(to_files - from_files)],
+            removed=[FileChange(file, None, None) for file in sorted(from_files - to_files)],
+            modified=[FileChange(file, None, None) for file in sorted(from_files & to_files & restaged_files)]
+        )
@@ -0,0 +1,86 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from gateway.ocfl_inventory import OcflInventory
+
+
+@dataclass(frozen=True)
+class InventoryCacheStats:
+    hits: int
+    misses: int
+    size: int
+
+
+@dataclass(frozen=True)
+class InventorySignature:
+    modified_ns: int
+    size: int
+    sidecar_digest: str | None
+
+
+class InventoryCache:
+    """
+    A bounded, least-recently-used cache of parsed inventories keyed by object path.
+    Entries are reused only while the inventory file's mtime, size and digest sidecar are unchanged.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[Path, tuple[InventorySignature, OcflInventory]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _get_signature(object_path: Path) -> InventorySignature | None:
+        try:
+            stat_result = os.stat(object_path / OcflInventory.file_name)
+        except FileNotFoundError:
+            return None
+        return InventorySignature(
+            modified_ns=stat_result.st_mtime_ns,
+            size=stat_result.st_size,
+            sidecar_digest=OcflInventory.read_sidecar_digest(object_path)
+        )
+
+    def get(self, object_path: Path) -> OcflInventory | None:
+        signature = self._get_signature(object_path)
+        if signature is None:
+            self.invalidate(object_path)
+            return None
+
+        with self.lock:
+            entry = self.entries.get(object_path)
+            if entry is not None and entry[0] == signature:
+                self.entries.move_to_end(object_path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        inventory = OcflInventory.read(object_path)
+        if inventory is None:
+            self.invalidate(object_path)
+            return None
+
+        with self.lock:
+            self.entries[object_path] = (signature, inventory)
+            self.entries.move_to_end(object_path)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return inventory
+
+    def invalidate(self, object_path: Path) -> None:
+        with self.lock:
+            self.entries.pop(object_path, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    @property
+    def stats(self) -> InventoryCacheStats:
+        with self.lock:
+            return InventoryCacheStats(hits=self.hits, misses=self.misses, size=len(self.entries))
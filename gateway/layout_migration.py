@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Self
+
+from gateway.exceptions import RepositoryGatewayError
+from gateway.ocfl_inventory import OcflInventory
+from gateway.repository_gateway import RepositoryGateway
+from gateway.storage_layout import StorageLayout
+from gateway.storage_root import find_object_paths, is_object_path, write_storage_layout
+
+
+@dataclass(frozen=True)
+class MigratedObject:
+    id: str
+    source_path: Path
+    target_path: Path
+
+
+class LayoutMigration:
+    """
+    Moves every object in a storage root from one storage layout to another.
+
+    The migration is recorded in an extension directory when started, and each completed
+    move is appended to a checkpoint, so an interrupted run can be resumed by running it again.
+    Moves are renames within the storage root, so each object is at either its old or its new path.
+    Each move holds the object's lock from gateway, so it does not run under a version being written.
+    The root's layout extension is only rewritten when the migration is finished, so rocfl, which finds
+    objects through it, cannot write to the root until then.
+    """
+
+    extension_name = "dor-layout-migration"
+    state_file_name = "migration.json"
+    checkpoint_file_name = "checkpoint.jsonl"
+
+    def __init__(
+        self,
+        storage_path: Path,
+        source_layout: StorageLayout,
+        target_layout: StorageLayout,
+        workers: int | None = None,
+        gateway: RepositoryGateway | None = None,
+    ) -> None:
+        self.storage_path = storage_path
+        self.source_layout = source_layout
+        self.target_layout = target_layout
+        self.workers = workers or os.cpu_count() or 1
+        self.gateway = gateway
+        self.migration_path = storage_path / "extensions" / self.extension_name
+        self.checkpoint_lock = threading.Lock()
+
+    @classmethod
+    def _get_state_path(cls, storage_path: Path) -> Path:
+        return storage_path / "extensions" / cls.extension_name / cls.state_file_name
+
+    @classmethod
+    def is_in_progress(cls, storage_path: Path) -> bool:
+        return cls._get_state_path(storage_path).exists()
+
+    @classmethod
+    def read_in_progress(
+        cls, storage_path: Path, workers: int | None = None, gateway: RepositoryGateway | None = None
+    ) -> Self | None:
+        try:
+            state = json.loads(cls._get_state_path(storage_path).read_text())
+        except FileNotFoundError:
+            return None
+        return cls(
+            storage_path,
+            source_layout=StorageLayout(state["source_layout"]),
+            target_layout=StorageLayout(state["target_layout"]),
+            workers=workers,
+            gateway=gateway
+        )
+
+    def start(self) -> None:
+        self.migration_path.mkdir(parents=True, exist_ok=True)
+        (self.migration_path / self.state_file_name).write_text(json.dumps({
+            "source_layout": self.source_layout.value,
+            "target_layout": self.target_layout.value
+        }))
+
+    def read_checkpoint(self) -> set[Path]:
+        try:
+            with open(self.migration_path / self.checkpoint_file_name) as checkpoint:
+                return set(Path(json.loads(line)["source_path"]) for line in checkpoint if line.strip())
+        except FileNotFoundError:
+            return set()
+
+    def _find_source_paths(self) -> Iterator[Path]:
+        migrated_paths = self.read_checkpoint()
+        if self.source_layout == StorageLayout.FLAT_DIRECT:
+            # Flat objects sit directly under the root, so the hashed tree being built need not be walked.
+            object_paths: Iterator[Path] = (
+                Path(entry.name) for entry in os.scandir(self.storage_path)
+                if entry.is_dir(follow_symlinks=False) and entry.name != "extensions"
+                and is_object_path(Path(entry.path))
+            )
+        else:
+            object_paths = find_object_paths(self.storage_path)
+        for object_path in object_paths:
+            if object_path not in migrated_paths:
+                yield object_path
+
+    def _migrate_object(self, source_path: Path) -> MigratedObject | None:
+        inventory = OcflInventory.read(self.storage_path / source_path)
+        if inventory is None:
+            return None
+        target_path = self.target_layout.get_object_path(inventory.id)
+        if target_path == source_path:
+            return None
+
+        full_target_path = self.storage_path / target_path
+        with self.gateway.lock_object(inventory.id) if self.gateway is not None else nullcontext():
+            if full_target_path.exists():
+                raise RepositoryGatewayError(f"Cannot move object {inventory.id} to {target_path}; the path exists")
+            full_target_path.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(self.storage_path / source_path, full_target_path)
+
+        migrated_object = MigratedObject(id=inventory.id, source_path=source_path, target_path=target_path)
+        with self.checkpoint_lock:
+            with open(self.migration_path / self.checkpoint_file_name, "a") as checkpoint:
+                checkpoint.write(json.dumps({
+                    "id": migrated_object.id,
+                    "source_path": source_path.as_posix(),
+                    "target_path": target_path.as_posix()
+                }) + "\n")
+        return migrated_object
+
+    def run(self) -> Iterator[MigratedObject]:
+        """Moves the objects not yet in the target layout, yielding each as it is moved."""
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending: set[Future] = set()
+            for source_path in self._find_source_paths():
+                pending.add(executor.submit(self._migrate_object, source_path))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if (migrated_object := future.result()) is not None:
+                            yield migrated_object
+            for future in as_completed(pending):
+                if (migrated_object := future.result()) is not None:
+                    yield migrated_object
+
+    def finish(self) -> None:
+        write_storage_layout(self.storage_path, self.target_layout)
+        for file_name in [self.state_file_name, self.checkpoint_file_name]:
+            (self.migration_path / file_name).unlink(missing_ok=True)
+        self.migration_path.rmdir()
@@ -0,0 +1,224 @@
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.enumerations import StagingMode
+from gateway.exceptions import (
+    NoStagedChangesError,
+    ObjectDoesNotExistError,
+    RepositoryGatewayError,
+    StagedObjectAlreadyExistsError,
+)
+from gateway.ocfl_inventory import OcflInventory
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway, locks_object
+from gateway.storage_root import write_storage_layout
+from utils.file_clone import CloneMethod, clone_file
+
+OCFL_VERSION = "1.1"
+INVENTORY_TYPE = f"https://ocfl.io/{OCFL_VERSION}/spec/#inventory"
+DIGEST_ALGORITHM = "sha512"
+
+
+class NativeOcflRepositoryGateway(OcflRepositoryGateway):
+    """
+    Writes OCFL objects directly rather than through rocfl, keeping staged versions
+    where rocfl does so either tool can pick up the other's work.
+
+    Content already in an object's manifest is referenced rather than stored again.
+    A version is published by renaming its finished directory into the object,
+    and the object's root inventory is replaced last.
+    """
+
+    commit_extension_name = "dor-native-commit"
+
+    def create_repository(self) -> None:
+        namaste_path = self.storage_path / f"0=ocfl_{OCFL_VERSION}"
+        if namaste_path.exists():
+            raise RepositoryGatewayError(f"Storage root already exists at {self.storage_path}")
+
+        try:
+            write_storage_layout(self.storage_path, self.storage_layout)
+            namaste_path.write_text(f"ocfl_{OCFL_VERSION}\n")
+        except OSError as e:
+            raise RepositoryGatewayError() from e
+        if self.object_index is not None:
+            self.object_index.create()
+
+    @staticmethod
+    def _serialize_inventory(data: dict[str, Any]) -> tuple[bytes, str]:
+        inventory_bytes = json.dumps(data, indent=2).encode("utf-8")
+        return inventory_bytes, hashlib.new(DIGEST_ALGORITHM, inventory_bytes).hexdigest()
+
+    @classmethod
+    def _write_inventory(cls, path: Path, data: dict[str, Any]) -> None:
+        inventory_bytes, digest = cls._serialize_inventory(data)
+        path.mkdir(parents=True, exist_ok=True)
+        for file_name, content in [
+            (OcflInventory.file_name, inventory_bytes),
+            (f"{OcflInventory.file_name}.{DIGEST_ALGORITHM}", f"{digest} {OcflInventory.file_name}\n".encode("utf-8"))
+        ]:
+            temp_path = path / f".{file_name}.tmp"
+            temp_path.write_bytes(content)
+            os.replace(temp_path, path / file_name)
+
+    @staticmethod
+    def _get_now() -> str:
+        return datetime.now(timezone.utc).astimezone().isoformat()
+
+    @locks_object
+    def create_staged_object(self, id: str) -> None:
+        if self._has_staged_object(id):
+            raise StagedObjectAlreadyExistsError()
+        if self.has_object(id):
+            raise RepositoryGatewayError(f"Cannot create object {id} because it already exists")
+
+        try:
+            self._write_inventory(self._get_staged_object_path(id), {
+                "id": id,
+                "type": INVENTORY_TYPE,
+                "digestAlgorithm": DIGEST_ALGORITHM,
+                "head": "v1",
+                "contentDirectory": "content",
+                "manifest": {},
+                "versions": {"v1": {"created": self._get_now(), "state": {}}}
+            })
+        except OSError as e:
+            raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+
+    def _read_or_start_staged_version(self, id: str) -> dict[str, Any]:
+        staged_inventory = self._read_staged_inventory(id)
+        if staged_inventory is not None:
+            return copy.deepcopy(staged_inventory.data)
+
+        inventory = self._read_inventory(id)
+        if inventory is None:
+            raise ObjectDoesNotExistError(f"No object or staged object found for id {id}")
+        data = copy.deepcopy(inventory.data)
+        next_version = f"v{inventory.head_version_number + 1}"
+        data["head"] = next_version
+        data["versions"][next_version] = {
+            "created": self._get_now(),
+            "state": copy.deepcopy(data["versions"][inventory.head]["state"])
+        }
+        return data
+
+    @staticmethod
+    def _remove_logical_path(data: dict[str, Any], staged_object_path: Path, logical_path: str) -> None:
+        head = data["head"]
+        state = data["versions"][head]["state"]
+        for digest, logical_paths in list(state.items()):
+            if logical_path not in logical_paths:
+                continue
+            logical_paths.remove(logical_path)
+            if logical_paths:
+                return
+            del state[digest]
+            # Content added in the staged version and no longer referenced anywhere is dropped.
+            still_referenced = any(digest in version["state"] for version in data["versions"].values())
+            content_paths = data["manifest"][digest]
+            if not still_referenced and all(path.startswith(head + "/") for path in content_paths):
+                for content_path in content_paths:
+                    (staged_object_path / content_path).unlink(missing_ok=True)
+                del data["manifest"][digest]
+            return
+
+    def _stage_object_files(self, id: str, source_bundle: Bundle, file_paths: list[Path], dest_path: str) -> None:
+        if dest_path.endswith("/"):
+            directory = dest_path.strip("/")
+            logical_paths = [
+                f"{directory}/{file_path.name}" if directory else file_path.name for file_path in file_paths
+            ]
+        else:
+            logical_paths = [dest_path]
+
+        clone_methods = (
+            (CloneMethod.REFLINK, CloneMethod.HARDLINK, CloneMethod.COPY)
+            if self.staging_mode == StagingMode.clone else (CloneMethod.COPY,)
+        )
+        staged_object_path = self._get_staged_object_path(id)
+        try:
+            data = self._read_or_start_staged_version(id)
+            head = data["head"]
+            state = data["versions"][head]["state"]
+            for file_path, logical_path in zip(file_paths, logical_paths):
+                source_path = source_bundle.root_path / file_path
+                digest = self._get_source_digest(source_bundle, file_path, data["digestAlgorithm"])
+                self._remove_logical_path(data, staged_object_path, logical_path)
+                if digest not in data["manifest"]:
+                    content_path = f"{head}/content/{logical_path}"
+                    suffix = 0
+                    while (staged_object_path / content_path).exists():
+                        suffix += 1
+                        content_path = f"{head}/content/{logical_path}~{suffix}"
+                    (staged_object_path / content_path).parent.mkdir(parents=True, exist_ok=True)
+                    clone_file(source_path, staged_object_path / content_path, clone_methods)
+                    data["manifest"][digest] = [content_path]
+                state.setdefault(digest, []).append(logical_path)
+            self._write_inventory(staged_object_path, data)
+        except OSError as e:
+            raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+
+    @locks_object
+    def commit_object_changes(
+        self, id: str, coordinator: Coordinator, message: str, date: datetime = datetime.now(timezone.utc).astimezone()
+    ) -> None:
+        staged_object_path = self._get_staged_object_path(id)
+        object_path = self._get_object_path(id)
+        try:
+            staged_inventory = OcflInventory.read(staged_object_path)
+            if staged_inventory is None:
+                raise NoStagedChangesError(f"No staged changes found for object {id}")
+
+            data = copy.deepcopy(staged_inventory.data)
+            head = data["head"]
+            data["versions"][head].update(
+                created=date.isoformat(),
+                message=message,
+                user={"name": coordinator.username, "address": f"mailto:{coordinator.email}"}
+            )
+
+            version_path = staged_object_path / head
+            self._write_inventory(version_path, data)
+            if object_path.exists():
+                os.rename(version_path, object_path / head)
+                self._write_inventory(object_path, data)
+            else:
+                scratch_root = self.storage_path / "extensions" / self.commit_extension_name
+                scratch_root.mkdir(parents=True, exist_ok=True)
+                new_object_path = Path(tempfile.mkdtemp(dir=scratch_root))
+                (new_object_path / f"0=ocfl_object_{OCFL_VERSION}").write_text(f"ocfl_object_{OCFL_VERSION}\n")
+                os.rename(version_path, new_object_path / head)
+                self._write_inventory(new_object_path, data)
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.rename(new_object_path, object_path)
+            shutil.rmtree(staged_object_path)
+        except OSError as e:
+            raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+        self._update_object_index(id)
+
+    @locks_object
+    def purge_object(self, id: str) -> None:
+        try:
+            for path in [self._get_object_path(id), self._get_staged_object_path(id)]:
+                if path.exists():
+                    shutil.rmtree(path)
+        except OSError as e:
+            raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+        if self._uses_object_index():
+            self.object_index.remove(id)
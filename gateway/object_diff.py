@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+
+@dataclass(frozen=True)
+class FileChange:
+    logical_path: Path
+    from_digest: str | None
+    to_digest: str | None
+
+
+@dataclass(frozen=True)
+class ObjectDiff:
+    from_version: int
+    to_version: int
+    added: list[FileChange]
+    removed: list[FileChange]
+    modified: list[FileChange]
+
+    @classmethod
+    def from_logical_paths(
+        cls, from_version: int, to_version: int, from_paths: dict[str, str], to_paths: dict[str, str]
+    ) -> Self:
+        """Compares two version states, each mapping logical path to digest."""
+        added = []
+        modified = []
+        for logical_path, to_digest in sorted(to_paths.items()):
+            from_digest = from_paths.get(logical_path)
+            if from_digest is None:
+                added.append(FileChange(Path(logical_path), None, to_digest))
+            elif from_digest != to_digest:
+                modified.append(FileChange(Path(logical_path), from_digest, to_digest))
+        removed = [
+            FileChange(Path(logical_path), from_digest, None)
+            for logical_path, from_digest in sorted(from_paths.items())
+            if logical_path not in to_paths
+        ]
+        return cls(
+            from_version=from_version, to_version=to_version, added=added, removed=removed, modified=modified
+        )
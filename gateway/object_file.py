@@ -5,3 +5,4 @@ from pathlib import Path
 class ObjectFile:
     logical_path: Path
     literal_path: Path
+    digest: str | None = None
@@ -0,0 +1,221 @@
+import fcntl
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from gateway.exceptions import RepositoryGatewayError
+from gateway.ocfl_inventory import OcflInventory
+from gateway.storage_root import find_object_paths
+
+
+@dataclass(frozen=True)
+class ObjectIndexEntry:
+    id: str
+    path: Path
+    head: str
+    inventory_digest: str | None
+    total_size: int
+
+
+class ObjectIndex:
+    """
+    A SQLite index of the objects in a storage root, kept as a storage root extension.
+    It maps each object identifier to its path (relative to the root), head version,
+    inventory digest and the total size of its content.
+    Writes share a flock()ed file with each other and are held off while a rebuild swaps the index in,
+    so none land in the replaced database.
+    """
+
+    extension_name = "dor-object-index"
+    file_name = "objects.sqlite3"
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS objects (
+            id TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            head TEXT NOT NULL,
+            inventory_digest TEXT,
+            total_size INTEGER NOT NULL
+        )
+    """
+
+    # Created in the current index while a rebuild runs, to list the objects written meanwhile
+    changes_schema = "CREATE TABLE IF NOT EXISTS rebuild_changes (id TEXT PRIMARY KEY)"
+
+    def __init__(self, storage_path: Path) -> None:
+        self.storage_path = storage_path
+        self.database_path = storage_path / "extensions" / self.extension_name / self.file_name
+        self.lock_path = self.database_path.with_name(self.file_name + ".lock")
+
+    def exists(self) -> bool:
+        return self.database_path.is_file()
+
+    def create(self) -> None:
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect(self.database_path) as connection:
+            connection.execute(self.schema)
+
+    @staticmethod
+    @contextmanager
+    def _connect(database_path: Path) -> Iterator[sqlite3.Connection]:
+        try:
+            with closing(sqlite3.connect(database_path, timeout=30)) as connection:
+                with connection:
+                    yield connection
+        except sqlite3.Error as e:
+            raise RepositoryGatewayError(f"Unable to use object index at {database_path}") from e
+
+    @contextmanager
+    def _lock(self, exclusive: bool = False) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(file_descriptor, fcntl.LOCK_UN)
+        finally:
+            os.close(file_descriptor)
+
+    @staticmethod
+    def _record_change(connection: sqlite3.Connection, id: str) -> None:
+        tracking = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rebuild_changes'"
+        ).fetchone()
+        if tracking is not None:
+            connection.execute("INSERT OR IGNORE INTO rebuild_changes (id) VALUES (?)", (id,))
+
+    @staticmethod
+    def _to_entry(row: tuple) -> ObjectIndexEntry:
+        id, path, head, inventory_digest, total_size = row
+        return ObjectIndexEntry(
+            id=id, path=Path(path), head=head, inventory_digest=inventory_digest, total_size=total_size
+        )
+
+    def get(self, id: str) -> ObjectIndexEntry | None:
+        with self._connect(self.database_path) as connection:
+            row = connection.execute(
+                "SELECT id, path, head, inventory_digest, total_size FROM objects WHERE id = ?", (id,)
+            ).fetchone()
+        return self._to_entry(row) if row is not None else None
+
+    def has(self, id: str) -> bool:
+        with self._connect(self.database_path) as connection:
+            row = connection.execute("SELECT 1 FROM objects WHERE id = ?", (id,)).fetchone()
+        return row is not None
+
+    def get_entries(self) -> list[ObjectIndexEntry]:
+        with self._connect(self.database_path) as connection:
+            rows = connection.execute(
+                "SELECT id, path, head, inventory_digest, total_size FROM objects ORDER BY id"
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    @staticmethod
+    def _put_entries(connection: sqlite3.Connection, entries: list[ObjectIndexEntry]) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO objects (id, path, head, inventory_digest, total_size) VALUES (?, ?, ?, ?, ?)",
+            [
+                (entry.id, entry.path.as_posix(), entry.head, entry.inventory_digest, entry.total_size)
+                for entry in entries
+            ]
+        )
+
+    def put(self, entry: ObjectIndexEntry) -> None:
+        with self._lock(), self._connect(self.database_path) as connection:
+            self._put_entries(connection, [entry])
+            self._record_change(connection, entry.id)
+
+    def remove(self, id: str) -> None:
+        with self._lock(), self._connect(self.database_path) as connection:
+            connection.execute("DELETE FROM objects WHERE id = ?", (id,))
+            self._record_change(connection, id)
+
+    def read_entry(self, object_path: Path) -> ObjectIndexEntry | None:
+        """Builds the entry for the object at object_path, relative to the storage root."""
+        full_object_path = self.storage_path / object_path
+        inventory = OcflInventory.read(full_object_path)
+        if inventory is None:
+            return None
+        total_size = sum(
+            os.stat(full_object_path / content_path).st_size
+            for content_paths in inventory.manifest.values()
+            for content_path in content_paths
+        )
+        return ObjectIndexEntry(
+            id=inventory.id,
+            path=object_path,
+            head=inventory.head,
+            inventory_digest=OcflInventory.read_sidecar_digest(full_object_path),
+            total_size=total_size
+        )
+
+    def _read_entries(self, object_paths: Iterator[Path], workers: int | None) -> Iterator[ObjectIndexEntry]:
+        max_pending = (workers or os.cpu_count() or 1) * 2
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: set[Future] = set()
+            for object_path in object_paths:
+                pending.add(executor.submit(self.read_entry, object_path))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if (entry := future.result()) is not None:
+                            yield entry
+            for future in as_completed(pending):
+                if (entry := future.result()) is not None:
+                    yield entry
+
+    def _apply_changes(self, connection: sqlite3.Connection) -> None:
+        # Objects written during the scan may have been read before they changed, so they are read again
+        with self._connect(self.database_path) as current_connection:
+            changed_ids = [row[0] for row in current_connection.execute("SELECT id FROM rebuild_changes")]
+            current_paths = dict(current_connection.execute(
+                "SELECT id, path FROM objects WHERE id IN (SELECT id FROM rebuild_changes)"
+            ).fetchall())
+        for id in changed_ids:
+            row = connection.execute("SELECT path FROM objects WHERE id = ?", (id,)).fetchone()
+            object_path = current_paths.get(id) or (row[0] if row is not None else None)
+            entry = self.read_entry(Path(object_path)) if object_path is not None else None
+            connection.execute("DELETE FROM objects WHERE id = ?", (id,))
+            if entry is not None and entry.id == id:
+                self._put_entries(connection, [entry])
+
+    def rebuild(self, workers: int | None = None) -> int:
+        """
+        Scans the storage root, reading inventories on a pool of threads, and replaces the index.
+        The new index is written alongside the current one and swapped in once complete. Objects written
+        to the current index in the meantime are read again just before the swap, while writes wait.
+        """
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        rebuild_path = self.database_path.with_name(self.file_name + ".rebuild")
+        rebuild_path.unlink(missing_ok=True)
+
+        tracks_changes = self.exists()
+        if tracks_changes:
+            with self._lock(exclusive=True), self._connect(self.database_path) as connection:
+                connection.execute(self.changes_schema)
+                connection.execute("DELETE FROM rebuild_changes")
+
+        with self._connect(rebuild_path) as connection:
+            connection.execute(self.schema)
+            batch: list[ObjectIndexEntry] = []
+            for entry in self._read_entries(find_object_paths(self.storage_path), workers):
+                batch.append(entry)
+                if len(batch) == 1000:
+                    self._put_entries(connection, batch)
+                    batch = []
+            self._put_entries(connection, batch)
+
+        with self._lock(exclusive=True):
+            if tracks_changes:
+                with self._connect(rebuild_path) as connection:
+                    self._apply_changes(connection)
+            with self._connect(rebuild_path) as connection:
+                total = connection.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+            os.replace(rebuild_path, self.database_path)
+        return total
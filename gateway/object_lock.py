@@ -0,0 +1,99 @@
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from gateway.exceptions import ObjectLockTimeoutError
+
+
+@dataclass(frozen=True)
+class ObjectLockStats:
+    acquisitions: int
+    timeouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class ObjectLocker:
+    """
+    Advisory per-object locks held as flock()ed files in the storage root, so they are shared by
+    every process and host using the root. Locks are re-entrant within a thread, which lets a caller
+    hold an object's lock across several gateway calls that each lock it too.
+    Lock files are left in place, since removing one would race with processes waiting on it.
+    """
+
+    extension_name = "dor-object-locks"
+
+    def __init__(self, storage_path: Path, timeout: float = 300.0, poll_interval: float = 0.05) -> None:
+        self.locks_path = storage_path / "extensions" / self.extension_name
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.held = threading.local()
+        self.stats_lock = threading.Lock()
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_lock_path(self, id: str) -> Path:
+        return self.locks_path / (hashlib.sha256(id.encode("utf-8")).hexdigest() + ".lock")
+
+    def _record(self, wait_seconds: float, timed_out: bool) -> None:
+        with self.stats_lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.acquisitions += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    @contextmanager
+    def lock(self, id: str, timeout: float | None = None) -> Iterator[None]:
+        held_counts: dict[str, int] = self.held.__dict__.setdefault("counts", {})
+        if held_counts.get(id):
+            held_counts[id] += 1
+            try:
+                yield
+            finally:
+                held_counts[id] -= 1
+            return
+
+        timeout = self.timeout if timeout is None else timeout
+        self.locks_path.mkdir(parents=True, exist_ok=True)
+        file_descriptor = os.open(self._get_lock_path(id), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            start = time.monotonic()
+            while True:
+                try:
+                    fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() - start >= timeout:
+                        self._record(time.monotonic() - start, timed_out=True)
+                        raise ObjectLockTimeoutError(f"Timed out after {timeout}s waiting to lock object {id}")
+                    time.sleep(self.poll_interval)
+            self._record(time.monotonic() - start, timed_out=False)
+
+            held_counts[id] = 1
+            try:
+                yield
+            finally:
+                del held_counts[id]
+                fcntl.flock(file_descriptor, fcntl.LOCK_UN)
+        finally:
+            os.close(file_descriptor)
+
+    @property
+    def stats(self) -> ObjectLockStats:
+        with self.stats_lock:
+            return ObjectLockStats(
+                acquisitions=self.acquisitions,
+                timeouts=self.timeouts,
+                total_wait_seconds=self.total_wait_seconds,
+                max_wait_seconds=self.max_wait_seconds
+            )
@@ -0,0 +1,106 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from gateway.exceptions import RepositoryGatewayError
+
+
+@dataclass(frozen=True)
+class InventoryVersion:
+    number: int
+    created: str
+    message: str | None
+    user_name: str | None
+    user_address: str | None
+    state: dict[str, list[str]]
+
+
+class OcflInventory:
+
+    file_name = "inventory.json"
+    sidecar_digest_algorithms = ["sha512", "sha256"]
+
+    @classmethod
+    def read(cls, object_path: Path) -> Self | None:
+        inventory_path = object_path / cls.file_name
+        try:
+            data = json.loads(inventory_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise RepositoryGatewayError(f"Unable to read inventory at {inventory_path}") from e
+        return cls(data)
+
+    @classmethod
+    def read_sidecar_digest(cls, object_path: Path) -> str | None:
+        for digest_algorithm in cls.sidecar_digest_algorithms:
+            sidecar_path = object_path / f"{cls.file_name}.{digest_algorithm}"
+            try:
+                return sidecar_path.read_text().split()[0]
+            except FileNotFoundError:
+                continue
+            except (OSError, IndexError) as e:
+                raise RepositoryGatewayError(f"Unable to read inventory sidecar at {sidecar_path}") from e
+        return None
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.data = data
+
+    @property
+    def id(self) -> str:
+        return self.data["id"]
+
+    @property
+    def digest_algorithm(self) -> str:
+        return self.data["digestAlgorithm"]
+
+    @property
+    def head(self) -> str:
+        return self.data["head"]
+
+    @property
+    def head_version_number(self) -> int:
+        return self._parse_version_number(self.head)
+
+    @property
+    def manifest(self) -> dict[str, list[str]]:
+        return self.data["manifest"]
+
+    @staticmethod
+    def _parse_version_number(version_name: str) -> int:
+        return int(version_name.lstrip("v"))
+
+    def get_versions(self) -> list[InventoryVersion]:
+        versions = []
+        for version_name, version_data in self.data["versions"].items():
+            user = version_data.get("user") or {}
+            versions.append(InventoryVersion(
+                number=self._parse_version_number(version_name),
+                created=version_data["created"],
+                message=version_data.get("message"),
+                user_name=user.get("name"),
+                user_address=user.get("address"),
+                state=version_data["state"]
+            ))
+        return sorted(versions, key=lambda version: version.number)
+
+    def get_version(self, number: int | None = None) -> InventoryVersion:
+        if number is None:
+            number = self.head_version_number
+        for version in self.get_versions():
+            if version.number == number:
+                return version
+        raise RepositoryGatewayError(f"Version {number} not found for object {self.id}")
+
+    def get_logical_paths(self, number: int | None = None) -> dict[str, str]:
+        """Maps each logical path in the version's state to its digest."""
+        version = self.get_version(number)
+        return {
+            logical_path: digest
+            for digest, logical_paths in version.state.items()
+            for logical_path in logical_paths
+        }
+
+    def get_content_path(self, digest: str) -> str:
+        return self.manifest[digest][0]
@@ -1,36 +1,70 @@
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime, timezone
+import functools
 import subprocess
-from enum import Enum
+import tempfile
 from pathlib import Path
 from subprocess import CalledProcessError
 
 from gateway.bundle import Bundle
 from gateway.coordinator import Coordinator
-from gateway.enumerations import LogOrder
+from gateway.enumerations import LogOrder, StagingMode
 from gateway.exceptions import (
     NoStagedChangesError,
     StagedObjectAlreadyExistsError,
     ObjectDoesNotExistError,
+    ObjectFileDoesNotExistError,
     RepositoryGatewayError,
 )
+from gateway.inventory_cache import InventoryCache
+from gateway.layout_migration import LayoutMigration
+from gateway.object_diff import ObjectDiff
 from gateway.object_file import ObjectFile
+from gateway.object_index import ObjectIndex
+from gateway.object_lock import ObjectLocker
+from gateway.ocfl_inventory import OcflInventory
 from gateway.repository_gateway import RepositoryGateway
+from gateway.staging_summary import StagingSummary
+from gateway.storage_layout import StorageLayout
+from gateway.storage_root import find_object_paths
 from gateway.version_info import VersionInfo
+from utils.digests import compute_digest
+from utils.file_clone import clone_file
 
 
-class StorageLayout(Enum):
-    FLAT_DIRECT = "0002-flat-direct-storage-layout"
-    HASHED_N_TUPLE = "0004-hashed-n-tuple-storage-layout"
+def locks_object(method):
+    @functools.wraps(method)
+    def locked_method(self, id: str, *args, **kwargs):
+        with self.lock_object(id):
+            return method(self, id, *args, **kwargs)
+    return locked_method
 
 
 class OcflRepositoryGateway(RepositoryGateway):
+    staging_extension_name = "rocfl-staging"
+    clone_staging_extension_name = "dor-clone-staging"
+    # rocfl keeps staged versions under a hashed n-tuple layout regardless of the storage root's layout
+    staging_layout = StorageLayout.HASHED_N_TUPLE
+    # Keeps each rocfl cp invocation well under the operating system's argument length limit
+    max_files_per_copy = 500
+
     def __init__(
         self,
         storage_path: Path,
         storage_layout: StorageLayout = StorageLayout.FLAT_DIRECT,
+        inventory_cache: InventoryCache | None = None,
+        object_index: ObjectIndex | None = None,
+        staging_mode: StagingMode = StagingMode.copy,
+        previous_storage_layout: StorageLayout | None = None,
+        object_locker: ObjectLocker | None = None,
     ):
         self.storage_path: Path = storage_path
         self.storage_layout: StorageLayout = storage_layout
+        self.inventory_cache: InventoryCache = inventory_cache if inventory_cache is not None else InventoryCache()
+        self.object_index: ObjectIndex | None = object_index
+        self.staging_mode: StagingMode = staging_mode
+        self.previous_storage_layout: StorageLayout | None = previous_storage_layout
+        self.object_locker: ObjectLocker | None = object_locker
 
     def create_repository(self) -> None:
         args: list[str | Path] = [
@@ -45,8 +79,18 @@ class OcflRepositoryGateway(RepositoryGateway):
             subprocess.run(args, check=True, capture_output=True)
         except CalledProcessError as e:
             raise RepositoryGatewayError() from e
+        if self.object_index is not None:
+            self.object_index.create()
+
+    def _check_layout_is_settled(self) -> None:
+        # rocfl finds objects through the root's layout extension, which a layout migration only
+        # rewrites when it finishes, so until then rocfl would miss moved objects and create new ones at old paths.
+        if self.previous_storage_layout is not None or LayoutMigration.is_in_progress(self.storage_path):
+            raise RepositoryGatewayError("Cannot write to the repository while a storage layout migration runs")
 
+    @locks_object
     def create_staged_object(self, id: str) -> None:
+        self._check_layout_is_settled()
         args: list[str | Path] = ["rocfl", "-r", self.storage_path, "new", id]
         try:
             subprocess.run(args, check=True, capture_output=True)
@@ -55,8 +99,16 @@ class OcflRepositoryGateway(RepositoryGateway):
             if already_exists_message in e.stderr.decode():
                 raise StagedObjectAlreadyExistsError() from e
             raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+
+    def _stage_object_files(self, id: str, source_bundle: Bundle, file_paths: list[Path], dest_path: str) -> None:
+        self._check_layout_is_settled()
+        source_paths = [source_bundle.root_path / file_path for file_path in file_paths]
+        if self.staging_mode == StagingMode.clone:
+            self._clone_object_files(id, source_paths, dest_path)
+            return
 
-    def _stage_object_file(self, id, source_path: Path, dest_path: Path) -> None:
         args: list[str | Path] = [
             "rocfl",
             "-r",
@@ -64,7 +116,38 @@ class OcflRepositoryGateway(RepositoryGateway):
             "cp",
             "-r",
             id,
-            source_path,
+            *source_paths,
+            "--",
+            dest_path,
+        ]
+        try:
+            subprocess.run(args, check=True, capture_output=True)
+        except CalledProcessError as e:
+            raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+
+    def _clone_object_files(self, id: str, source_paths: list[Path], dest_path: str) -> None:
+        # The scratch directory sits inside the storage root so the clones, and rocfl's move
+        # of them into staging, stay on the storage root's filesystem.
+        scratch_root = self.storage_path / "extensions" / self.clone_staging_extension_name
+        scratch_root.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=scratch_root) as scratch_path:
+            cloned_paths = []
+            for source_path in source_paths:
+                cloned_path = Path(scratch_path) / source_path.name
+                clone_file(source_path, cloned_path)
+                cloned_paths.append(cloned_path)
+            self._move_object_files(id, cloned_paths, dest_path)
+
+    def _move_object_files(self, id: str, source_paths: list[Path], dest_path: str) -> None:
+        args: list[str | Path] = [
+            "rocfl",
+            "-r",
+            self.storage_path,
+            "mv",
+            id,
+            *source_paths,
             "--",
             dest_path,
         ]
@@ -72,20 +155,78 @@ class OcflRepositoryGateway(RepositoryGateway):
             subprocess.run(args, check=True, capture_output=True)
         except CalledProcessError as e:
             raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+
+    def _get_current_logical_paths(self, id: str) -> tuple[str, dict[str, str]] | None:
+        inventory = self._read_staged_inventory(id) or self._read_inventory(id)
+        if inventory is None:
+            return None
+        return inventory.digest_algorithm, inventory.get_logical_paths()
+
+    @staticmethod
+    def _get_source_digest(source_bundle: Bundle, file_path: Path, digest_algorithm: str) -> str:
+        recorded_digest = source_bundle.digests.get(file_path, {}).get(digest_algorithm)
+        return recorded_digest or compute_digest(source_bundle.root_path / file_path, digest_algorithm)
 
-    def stage_object_files(self, id: str, source_bundle: Bundle) -> None:
+    @locks_object
+    def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
         if not self.has_object(id) and not self._has_staged_object(id):
             raise ObjectDoesNotExistError(
                 f"No object or staged object found for id {id}"
             )
-        package_root = source_bundle.root_path
+
+        # Entries whose content already sits at the same logical path in the object are left alone.
+        current = self._get_current_logical_paths(id)
+        file_paths_to_stage: list[Path] = []
+        staged_files = staged_bytes = skipped_files = skipped_bytes = 0
         for file_path in source_bundle.entries:
-            source_path = package_root / file_path
-            self._stage_object_file(id=id, source_path=source_path, dest_path=file_path)
+            source_path = source_bundle.root_path / file_path
+            size = source_path.stat().st_size
+            if current is not None:
+                digest_algorithm, logical_paths = current
+                current_digest = logical_paths.get(file_path.as_posix())
+                if (
+                    current_digest is not None
+                    and current_digest == self._get_source_digest(source_bundle, file_path, digest_algorithm)
+                ):
+                    skipped_files += 1
+                    skipped_bytes += size
+                    continue
+            file_paths_to_stage.append(file_path)
+            staged_files += 1
+            staged_bytes += size
+
+        # Entries keep their relative paths in the object, so every entry sharing a parent
+        # directory can be copied into that directory with a single rocfl invocation.
+        entries_by_directory: dict[Path, list[Path]] = {}
+        for file_path in file_paths_to_stage:
+            entries_by_directory.setdefault(file_path.parent, []).append(file_path)
+
+        for directory, file_paths in entries_by_directory.items():
+            if len(file_paths) == 1:
+                self._stage_object_files(
+                    id=id, source_bundle=source_bundle, file_paths=file_paths, dest_path=file_paths[0].as_posix()
+                )
+                continue
 
+            dest_path = "/" if directory == Path(".") else directory.as_posix() + "/"
+            for start in range(0, len(file_paths), self.max_files_per_copy):
+                batch = file_paths[start:start + self.max_files_per_copy]
+                self._stage_object_files(id=id, source_bundle=source_bundle, file_paths=batch, dest_path=dest_path)
+
+        return StagingSummary(
+            staged_files=staged_files,
+            staged_bytes=staged_bytes,
+            skipped_files=skipped_files,
+            skipped_bytes=skipped_bytes
+        )
+
+    @locks_object
     def commit_object_changes(
         self, id: str, coordinator: Coordinator, message: str, date: datetime = datetime.now(timezone.utc).astimezone()
     ) -> None:
+        self._check_layout_is_settled()
         args: list[str | Path] = [
             "rocfl",
             "-r",
@@ -108,94 +249,160 @@ class OcflRepositoryGateway(RepositoryGateway):
             if no_staged_changes_message in e.stderr.decode():
                 raise NoStagedChangesError() from e
             raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+        self._update_object_index(id)
 
+    @locks_object
     def purge_object(self, id: str) -> None:
+        self._check_layout_is_settled()
         args: list[str | Path] = ["rocfl", "-r", self.storage_path, "purge", "-f", id]
         try:
             subprocess.run(args, check=True, capture_output=True)
         except CalledProcessError as e:
             raise RepositoryGatewayError() from e
+        finally:
+            self._invalidate_inventories(id)
+        if self._uses_object_index():
+            self.object_index.remove(id)
+
+    def _uses_object_index(self) -> bool:
+        # Until an index has been created or rebuilt for the storage root, the filesystem is authoritative.
+        return self.object_index is not None and self.object_index.exists()
+
+    def _update_object_index(self, id: str) -> None:
+        if not self._uses_object_index():
+            return
+        entry = self.object_index.read_entry(self._get_object_path(id).relative_to(self.storage_path))
+        if entry is not None:
+            self.object_index.put(entry)
+
+    def lock_object(self, id: str) -> AbstractContextManager[None]:
+        if self.object_locker is None:
+            return nullcontext()
+        return self.object_locker.lock(id)
+
+    def _get_object_path(self, id: str) -> Path:
+        object_path = self.storage_path / self.storage_layout.get_object_path(id)
+        # While a layout migration runs, objects not yet moved are found at their old path.
+        if self.previous_storage_layout is not None and not object_path.exists():
+            previous_object_path = self.storage_path / self.previous_storage_layout.get_object_path(id)
+            if previous_object_path.exists():
+                return previous_object_path
+        return object_path
+
+    def _get_staged_object_path(self, id: str) -> Path:
+        return (
+            self.storage_path / "extensions" / self.staging_extension_name /
+            self.staging_layout.get_object_path(id)
+        )
+
+    def _read_inventory(self, id: str) -> OcflInventory | None:
+        return self.inventory_cache.get(self._get_object_path(id))
+
+    def _read_staged_inventory(self, id: str) -> OcflInventory | None:
+        return self.inventory_cache.get(self._get_staged_object_path(id))
+
+    def _invalidate_inventories(self, id: str) -> None:
+        self.inventory_cache.invalidate(self._get_object_path(id))
+        self.inventory_cache.invalidate(self._get_staged_object_path(id))
 
     def has_object(self, id: str) -> bool:
-        args: list[str | Path] = ["rocfl", "-r", self.storage_path, "info", id]
-        try:
-            subprocess.run(args, check=True, capture_output=True)
-            return True
-        except CalledProcessError as e:
-            not_found_message = f"Not found: Object {id}"
-            if not_found_message in e.stderr.decode():
-                return False
-            raise RepositoryGatewayError() from e
+        if self._uses_object_index():
+            return self.object_index.has(id)
+        return (self._get_object_path(id) / OcflInventory.file_name).is_file()
 
-    def _has_staged_object(self, id: str):
-        args: list[str | Path] = ["rocfl", "-r", self.storage_path, "status", id]
-        try:
-            subprocess.run(args, check=True, capture_output=True)
-            return True
-        except CalledProcessError as e:
-            staged_version_not_found_message = (
-                f"Not found: {id} does not have a staged version."
-            )
-            if staged_version_not_found_message in e.stderr.decode():
-                return False
-            raise RepositoryGatewayError() from e
+    def get_object_ids(self) -> list[str]:
+        if self._uses_object_index():
+            return [entry.id for entry in self.object_index.get_entries()]
+        return sorted(
+            inventory.id
+            for object_path in find_object_paths(self.storage_path)
+            if (inventory := self.inventory_cache.get(self.storage_path / object_path)) is not None
+        )
+
+    def _has_staged_object(self, id: str) -> bool:
+        return (self._get_staged_object_path(id) / OcflInventory.file_name).is_file()
 
     def get_object_files(
         self, id: str, include_staged: bool = False
     ) -> list[ObjectFile]:
-        has_staged_object = self._has_staged_object(id)
-        if not self.has_object(id) and not has_staged_object:
+        inventory = self._read_inventory(id)
+        staged_inventory = self._read_staged_inventory(id)
+        if inventory is None and staged_inventory is None:
             raise ObjectDoesNotExistError(
                 f"No object or staged object found for id {id}"
             )
 
-        flags = "-ptS" if include_staged and has_staged_object else "-pt"
-        args: list[str | Path] = ["rocfl", "-r", self.storage_path, "ls", flags, id]
-        try:
-            result = subprocess.run(args, check=True, capture_output=True)
-        except CalledProcessError as e:
-            raise RepositoryGatewayError() from e
+        object_path = self._get_object_path(id)
+        if include_staged and staged_inventory is not None:
+            # Content added in the staged version lives in the staging area;
+            # everything else is still served from the committed object.
+            staged_version_prefix = staged_inventory.head + "/"
+            staged_object_path = self._get_staged_object_path(id)
+            logical_paths = staged_inventory.get_logical_paths()
+            object_files = []
+            for logical_path, digest in logical_paths.items():
+                content_path = staged_inventory.get_content_path(digest)
+                prefix = staged_object_path if content_path.startswith(staged_version_prefix) else object_path
+                object_files.append(ObjectFile(Path(logical_path), prefix / content_path))
+        elif inventory is not None:
+            object_files = [
+                ObjectFile(Path(logical_path), object_path / inventory.get_content_path(digest))
+                for logical_path, digest in inventory.get_logical_paths().items()
+            ]
+        else:
+            raise RepositoryGatewayError(f"No committed version found for id {id}")
 
-        data = result.stdout.decode()
-        if len(data) == 0:
-            return []
-        lines = data.strip().split("\n")
-        rows = [line.split("\t") for line in lines]
-        object_files = [
-            ObjectFile(Path(row[0].strip()), Path(row[1].strip())) for row in rows
-        ]
-        return object_files
+        return sorted(object_files, key=lambda object_file: str(object_file.logical_path))
 
-    def log(self, id: str, order: LogOrder = LogOrder.descending) -> list[VersionInfo]:
-        version_log = []
-        args: list[str | Path] = ["rocfl", "-r", self.storage_path, "log"]
-        if order == LogOrder.descending:
-            args.append("-r")
-        args.append(id)
+    def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        inventory = self._read_inventory(id)
+        if inventory is None:
+            raise ObjectDoesNotExistError(f"No object found for id {id}")
 
-        info = {}
-        try:
-            result = subprocess.run(args, check=True, capture_output=True)
-
-            for line in result.stdout.decode("utf-8").split("\n"):
-                line = line.strip()
-                if not line:
-                    if info:
-                        version_log.append(VersionInfo(**info))
-                        info = {}
-                    continue
+        digest = inventory.get_logical_paths(version).get(logical_path.as_posix())
+        if digest is None:
+            raise ObjectFileDoesNotExistError(f"No file {logical_path} found in object {id}")
+        return ObjectFile(logical_path, self._get_object_path(id) / inventory.get_content_path(digest), digest)
 
-                if line.startswith("Version "):
-                    info['version'] = int(line.split(" ")[-1])
-                else:
-                    key, value = [v.strip() for v in line.strip().split(":", 1)]
-                    info[key.lower()] = value
+    @staticmethod
+    def _format_author(name: str | None, address: str | None) -> str:
+        if name and address:
+            return f"{name} <{address}>"
+        return name or address or ""
 
-            if info:
-                version_log.append(VersionInfo(**info))
+    @staticmethod
+    def _format_date(created: str) -> str:
+        # Matches the RFC 2822 style date rocfl prints, in local time
+        return datetime.fromisoformat(created).astimezone().strftime("%a, %d %b %Y %H:%M:%S %z")
 
-            return version_log
-        except CalledProcessError as e:
-            if "Not found: Object" in e.stderr.decode():
-                raise ObjectDoesNotExistError() from e
-            raise RepositoryGatewayError() from e
+    def log(self, id: str, order: LogOrder = LogOrder.descending) -> list[VersionInfo]:
+        inventory = self._read_inventory(id)
+        if inventory is None:
+            raise ObjectDoesNotExistError()
+
+        version_log = [
+            VersionInfo(
+                version=version.number,
+                author=self._format_author(version.user_name, version.user_address),
+                date=self._format_date(version.created),
+                message=version.message or ""
+            )
+            for version in inventory.get_versions()
+        ]
+        if order == LogOrder.descending:
+            version_log.reverse()
+        return version_log
+
+    def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        inventory = self._read_inventory(id)
+        if inventory is None:
+            raise ObjectDoesNotExistError()
+
+        if to_version is None:
+            to_version = inventory.head_version_number
+        from_paths = inventory.get_logical_paths(from_version) if from_version > 0 else {}
+        return ObjectDiff.from_logical_paths(
+            from_version, to_version, from_paths, inventory.get_logical_paths(to_version)
+        )
@@ -0,0 +1,267 @@
+import hashlib
+import math
+import queue
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, closing, contextmanager
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Self
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.enumerations import LogOrder
+from gateway.exceptions import RepositoryGatewayError
+from gateway.object_diff import ObjectDiff
+from gateway.object_file import ObjectFile
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+from gateway.repository_gateway import RepositoryGateway
+from gateway.staging_summary import StagingSummary
+from gateway.validate import ObjectValidationResult, ParallelFixityValidator, RocflOCFLFixityValidator
+from gateway.version_info import VersionInfo
+
+
+class PlacementPolicy(Enum):
+    # Spreads objects evenly across roots
+    hash = "hash"
+    # Favors roots with more free space, in proportion to it
+    free_space = "free_space"
+
+
+class PoolLookup:
+    """Records which storage root holds each object, in memory and optionally in a SQLite file."""
+
+    extension_name = "dor-pool-lookup"
+    file_name = "objects.sqlite3"
+
+    @classmethod
+    def in_storage_root(cls, storage_path: Path) -> Self:
+        return cls(storage_path / "extensions" / cls.extension_name / cls.file_name)
+
+    def __init__(self, database_path: Path | None = None) -> None:
+        self.database_path = database_path
+        self.roots: dict[str, Path] = {}
+        self.lock = threading.Lock()
+        # The file is created on first use, so a lookup kept in a storage root can be set up before the root
+        self.created = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        try:
+            if not self.created:
+                self.database_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(self.database_path, timeout=30)) as connection:
+                with connection:
+                    if not self.created:
+                        connection.execute(
+                            "CREATE TABLE IF NOT EXISTS objects (id TEXT PRIMARY KEY, root TEXT NOT NULL)"
+                        )
+                        self.created = True
+                    yield connection
+        except sqlite3.Error as e:
+            raise RepositoryGatewayError(f"Unable to use pool lookup at {self.database_path}") from e
+
+    def get(self, id: str) -> Path | None:
+        with self.lock:
+            if id in self.roots:
+                return self.roots[id]
+        if self.database_path is None:
+            return None
+        with self._connect() as connection:
+            row = connection.execute("SELECT root FROM objects WHERE id = ?", (id,)).fetchone()
+        if row is None:
+            return None
+        with self.lock:
+            self.roots[id] = Path(row[0])
+        return Path(row[0])
+
+    def put(self, id: str, root: Path) -> None:
+        if self.database_path is not None:
+            with self._connect() as connection:
+                connection.execute("INSERT OR REPLACE INTO objects (id, root) VALUES (?, ?)", (id, str(root)))
+        with self.lock:
+            self.roots[id] = root
+
+    def claim(self, id: str, root: Path) -> Path:
+        """Records root for id unless a root is already recorded, and returns the recorded root."""
+        with self.lock:
+            if id in self.roots:
+                return self.roots[id]
+            if self.database_path is not None:
+                with self._connect() as connection:
+                    connection.execute("INSERT OR IGNORE INTO objects (id, root) VALUES (?, ?)", (id, str(root)))
+                    root = Path(connection.execute("SELECT root FROM objects WHERE id = ?", (id,)).fetchone()[0])
+            self.roots[id] = root
+            return root
+
+    def remove(self, id: str) -> None:
+        if self.database_path is not None:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM objects WHERE id = ?", (id,))
+        with self.lock:
+            self.roots.pop(id, None)
+
+
+class PooledRepositoryGateway(RepositoryGateway):
+    """
+    Spreads objects across several OCFL storage roots, usually on separate volumes.
+
+    New objects are placed with rendezvous hashing of the object id against each root, weighted by
+    free space under the free_space policy, so adding a root moves no existing objects. An object's root
+    is recorded in the lookup the first time the object is used, so it stays put while free space changes.
+    Objects not yet in the lookup are found by checking each root.
+    """
+
+    def __init__(
+        self,
+        gateways: list[OcflRepositoryGateway],
+        placement_policy: PlacementPolicy = PlacementPolicy.hash,
+        lookup: PoolLookup | None = None,
+    ) -> None:
+        if not gateways:
+            raise RepositoryGatewayError("A storage pool needs at least one storage root")
+        self.gateways: dict[Path, OcflRepositoryGateway] = {gateway.storage_path: gateway for gateway in gateways}
+        self.placement_policy = placement_policy
+        self.lookup = lookup if lookup is not None else PoolLookup()
+
+    def _get_weight(self, root: Path) -> float:
+        match self.placement_policy:
+            case PlacementPolicy.hash:
+                return 1.0
+            case PlacementPolicy.free_space:
+                return float(max(shutil.disk_usage(root).free, 1))
+
+    def _place(self, id: str) -> OcflRepositoryGateway:
+        def get_score(root: Path) -> float:
+            digest = hashlib.sha256(f"{root}\0{id}".encode("utf-8")).digest()
+            # Maps the digest to a point in (0, 1) for weighted rendezvous hashing
+            point = (int.from_bytes(digest[:8], "big") + 1) / (2**64 + 2)
+            return self._get_weight(root) / -math.log(point)
+
+        return self.gateways[max(self.gateways, key=get_score)]
+
+    def _locate(self, id: str) -> OcflRepositoryGateway | None:
+        root = self.lookup.get(id)
+        if root is not None and root in self.gateways:
+            return self.gateways[root]
+        for gateway in self.gateways.values():
+            if gateway.has_object(id) or gateway._has_staged_object(id):
+                self.lookup.put(id, gateway.storage_path)
+                return gateway
+        return None
+
+    def _get_gateway(self, id: str) -> OcflRepositoryGateway:
+        # Unknown objects go to the root they would be placed in, so its errors are raised.
+        gateway = self._locate(id)
+        if gateway is not None:
+            return gateway
+        placed_gateway = self._place(id)
+        return self.gateways.get(self.lookup.claim(id, placed_gateway.storage_path), placed_gateway)
+
+    def lock_object(self, id: str) -> AbstractContextManager[None]:
+        return self._get_gateway(id).lock_object(id)
+
+    def create_repository(self) -> None:
+        for gateway in self.gateways.values():
+            gateway.create_repository()
+
+    def create_staged_object(self, id: str) -> None:
+        gateway = self._get_gateway(id)
+        gateway.create_staged_object(id)
+        self.lookup.put(id, gateway.storage_path)
+
+    def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
+        return self._get_gateway(id).stage_object_files(id, source_bundle)
+
+    def commit_object_changes(
+        self,
+        id: str,
+        coordinator: Coordinator,
+        message: str,
+        date: datetime = datetime.now(timezone.utc).astimezone()
+    ) -> None:
+        self._get_gateway(id).commit_object_changes(id, coordinator, message, date)
+
+    def purge_object(self, id: str) -> None:
+        self._get_gateway(id).purge_object(id)
+        self.lookup.remove(id)
+
+    def has_object(self, id: str) -> bool:
+        gateway = self._locate(id)
+        return gateway is not None and gateway.has_object(id)
+
+    def get_object_files(self, id: str, include_staged: bool = False) -> list[ObjectFile]:
+        return self._get_gateway(id).get_object_files(id, include_staged)
+
+    def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        return self._get_gateway(id).get_object_file(id, logical_path, version)
+
+    def log(self, id: str, order: LogOrder = LogOrder.descending) -> list[VersionInfo]:
+        return self._get_gateway(id).log(id, order)
+
+    def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        return self._get_gateway(id).diff(id, from_version, to_version)
+
+    def get_many_object_files(
+        self, ids: list[str], include_staged: bool = False, readers_per_root: int = 4
+    ) -> dict[str, list[ObjectFile]]:
+        with ThreadPoolExecutor(max_workers=readers_per_root * len(self.gateways)) as executor:
+            object_files = executor.map(lambda id: self.get_object_files(id, include_staged), ids)
+            return dict(zip(ids, object_files))
+
+    def validate_repositories(
+        self, workers_per_root: int | None = None, readers_per_device: int = 4, no_fixity: bool = False
+    ) -> Iterator[ObjectValidationResult]:
+        """
+        Validates every root at once, yielding results as objects finish.
+        Each result's object_path includes its storage root.
+        """
+        results: queue.Queue[ObjectValidationResult | None] = queue.Queue(maxsize=len(self.gateways) * 16)
+        errors: list[BaseException] = []
+        # Set when the caller stops reading results, so validating threads do not wait on a full queue
+        stopped = threading.Event()
+
+        def put(result: ObjectValidationResult | None) -> bool:
+            while not stopped.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def validate_root(root: Path) -> None:
+            try:
+                validator = ParallelFixityValidator(
+                    RocflOCFLFixityValidator(repository_path=root),
+                    workers=workers_per_root,
+                    readers_per_device=readers_per_device
+                )
+                for result in validator.validate_repository(no_fixity=no_fixity):
+                    if not put(ObjectValidationResult(
+                        root / result.object_path, result.is_valid, result.message, result.records
+                    )):
+                        return
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                put(None)
+
+        threads = [threading.Thread(target=validate_root, args=(root,), daemon=True) for root in self.gateways]
+        for thread in threads:
+            thread.start()
+        remaining = len(threads)
+        try:
+            while remaining:
+                result = results.get()
+                if result is None:
+                    remaining -= 1
+                    continue
+                yield result
+        finally:
+            stopped.set()
+        if errors:
+            raise RepositoryGatewayError("Validation failed for a storage root") from errors[0]
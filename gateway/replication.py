@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from gateway.exceptions import RepositoryGatewayError
+from gateway.object_index import ObjectIndex
+from gateway.ocfl_inventory import OcflInventory
+from gateway.storage_root import find_object_paths, read_storage_layout
+from utils.digests import compute_digest
+
+
+class ReplicationStatus(Enum):
+    unchanged = "unchanged"
+    created = "created"
+    updated = "updated"
+    failed = "failed"
+
+
+@dataclass(frozen=True)
+class ReplicationResult:
+    object_path: Path
+    status: ReplicationStatus
+    copied_versions: int = 0
+    copied_bytes: int = 0
+    message: str = ""
+
+
+class StorageRootReplicator:
+    """
+    Brings a mirror of a storage root up to date by comparing each object's inventory digest,
+    so unchanged objects cost two small reads. For a changed object only the version directories
+    the mirror lacks are copied, each verified against the inventory before being renamed into place,
+    and the object's root inventory and sidecar are written last, from the same bytes the versions were read against.
+    Objects purged from the source are left on the mirror.
+    """
+
+    inventory_read_attempts = 5
+
+    def __init__(self, source_path: Path, mirror_path: Path, workers: int | None = None) -> None:
+        self.source_path = source_path
+        self.mirror_path = mirror_path
+        self.workers = workers or os.cpu_count() or 1
+
+    def _find_changed_object_paths(self) -> Iterator[Path]:
+        # The source's object index, if it has one, saves walking the source tree and reading its sidecars.
+        object_index = ObjectIndex(self.source_path)
+        if object_index.exists():
+            for entry in object_index.get_entries():
+                if entry.inventory_digest is None or (
+                    entry.inventory_digest != OcflInventory.read_sidecar_digest(self.mirror_path / entry.path)
+                ):
+                    yield entry.path
+            return
+        yield from find_object_paths(self.source_path)
+
+    def _replicate_root_files(self) -> None:
+        self.mirror_path.mkdir(parents=True, exist_ok=True)
+        for entry in os.scandir(self.source_path):
+            if entry.is_file():
+                shutil.copy2(entry.path, self.mirror_path / entry.name)
+        layout = read_storage_layout(self.source_path)
+        if layout is not None:
+            shutil.copytree(
+                self.source_path / "extensions" / layout.value,
+                self.mirror_path / "extensions" / layout.value,
+                dirs_exist_ok=True
+            )
+
+    @staticmethod
+    def _verify_version(inventory: OcflInventory, version_path: Path, version_name: str) -> None:
+        prefix = version_name + "/"
+        for digest, content_paths in inventory.manifest.items():
+            for content_path in content_paths:
+                if not content_path.startswith(prefix):
+                    continue
+                copied_digest = compute_digest(version_path / content_path[len(prefix):], inventory.digest_algorithm)
+                if copied_digest != digest:
+                    raise RepositoryGatewayError(f"Copied {content_path} does not match its inventory digest")
+
+    @staticmethod
+    def _copy_file_atomically(source_path: Path, dest_path: Path) -> None:
+        temp_path = dest_path.with_name(f".{dest_path.name}.tmp")
+        shutil.copy2(source_path, temp_path)
+        os.replace(temp_path, dest_path)
+
+    @staticmethod
+    def _write_file_atomically(data: bytes, dest_path: Path) -> None:
+        temp_path = dest_path.with_name(f".{dest_path.name}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, dest_path)
+
+    def _read_source_inventory(self, object_path: Path) -> tuple[bytes, str, bytes]:
+        """
+        Reads the inventory along with a sidecar whose digest matches it,
+        reading again while a commit is replacing the pair.
+        """
+        for _ in range(self.inventory_read_attempts):
+            for digest_algorithm in OcflInventory.sidecar_digest_algorithms:
+                sidecar_name = f"{OcflInventory.file_name}.{digest_algorithm}"
+                try:
+                    sidecar_data = (object_path / sidecar_name).read_bytes()
+                except FileNotFoundError:
+                    continue
+                break
+            else:
+                raise RepositoryGatewayError(f"No inventory sidecar found at {object_path}")
+            inventory_data = (object_path / OcflInventory.file_name).read_bytes()
+            inventory_digest = hashlib.new(digest_algorithm, inventory_data).hexdigest()
+            if sidecar_data.split()[:1] == [inventory_digest.encode()]:
+                return inventory_data, sidecar_name, sidecar_data
+        raise RepositoryGatewayError(f"Inventory at {object_path} does not match its sidecar")
+
+    def replicate_object(self, object_path: Path) -> ReplicationResult:
+        source_object_path = self.source_path / object_path
+        mirror_object_path = self.mirror_path / object_path
+        try:
+            source_digest = OcflInventory.read_sidecar_digest(source_object_path)
+            if source_digest is not None and source_digest == OcflInventory.read_sidecar_digest(mirror_object_path):
+                return ReplicationResult(object_path, ReplicationStatus.unchanged)
+
+            inventory_data, sidecar_name, sidecar_data = self._read_source_inventory(source_object_path)
+            try:
+                source_inventory = OcflInventory(json.loads(inventory_data))
+            except ValueError as e:
+                raise RepositoryGatewayError(f"Unable to read inventory at {source_object_path}") from e
+            mirror_inventory = OcflInventory.read(mirror_object_path)
+            mirror_versions = mirror_inventory.data["versions"] if mirror_inventory is not None else {}
+            for version_name, version in mirror_versions.items():
+                if source_inventory.data["versions"].get(version_name) != version:
+                    raise RepositoryGatewayError(f"Mirror version {version_name} differs from the source")
+
+            mirror_object_path.mkdir(parents=True, exist_ok=True)
+            copied_versions = copied_bytes = 0
+            for version in source_inventory.get_versions():
+                version_name = f"v{version.number}"
+                if version_name in mirror_versions:
+                    continue
+                # A partly copied version left by an earlier failed run is replaced.
+                shutil.rmtree(mirror_object_path / version_name, ignore_errors=True)
+                with tempfile.TemporaryDirectory(dir=mirror_object_path, prefix=f".{version_name}.") as temp_path:
+                    version_path = Path(temp_path) / version_name
+                    shutil.copytree(source_object_path / version_name, version_path)
+                    self._verify_version(source_inventory, version_path, version_name)
+                    copied_bytes += sum(path.stat().st_size for path in version_path.rglob("*") if path.is_file())
+                    os.rename(version_path, mirror_object_path / version_name)
+                copied_versions += 1
+
+            # A commit may have replaced the source inventory since it was read, so the inventory written
+            # is the one the versions above were copied against. Its sidecar goes last: the sidecar's digest
+            # is what marks the mirror's copy of the object as current.
+            for entry in os.scandir(source_object_path):
+                if entry.is_file() and not entry.name.startswith(OcflInventory.file_name):
+                    self._copy_file_atomically(Path(entry.path), mirror_object_path / entry.name)
+            self._write_file_atomically(inventory_data, mirror_object_path / OcflInventory.file_name)
+            self._write_file_atomically(sidecar_data, mirror_object_path / sidecar_name)
+        except (OSError, RepositoryGatewayError) as e:
+            return ReplicationResult(object_path, ReplicationStatus.failed, message=str(e))
+
+        return ReplicationResult(
+            object_path,
+            ReplicationStatus.updated if mirror_inventory is not None else ReplicationStatus.created,
+            copied_versions=copied_versions,
+            copied_bytes=copied_bytes
+        )
+
+    def replicate_objects(self, object_paths: Iterable[Path]) -> Iterator[ReplicationResult]:
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending: set[Future] = set()
+            for object_path in object_paths:
+                pending.add(executor.submit(self.replicate_object, object_path))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    def replicate(self) -> Iterator[ReplicationResult]:
+        self._replicate_root_files()
+        return self.replicate_objects(self._find_changed_object_paths())
@@ -1,14 +1,22 @@
 from abc import ABCMeta, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime, timezone
+from pathlib import Path
 
 from gateway.bundle import Bundle
 from gateway.coordinator import Coordinator
+from gateway.object_diff import ObjectDiff
 from gateway.object_file import ObjectFile
+from gateway.staging_summary import StagingSummary
 from gateway.version_info import VersionInfo
 
 
 class RepositoryGateway(metaclass=ABCMeta):
 
+    def lock_object(self, id: str) -> AbstractContextManager[None]:
+        """Holds an object's lock across several calls. Gateways without locking return a no-op."""
+        return nullcontext()
+
     @abstractmethod
     def create_repository(self) -> None:
         pass
@@ -18,7 +26,7 @@ class RepositoryGateway(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def stage_object_files(self, id: str, source_bundle: Bundle) -> None:
+    def stage_object_files(self, id: str, source_bundle: Bundle) -> StagingSummary:
         pass
 
     @abstractmethod
@@ -43,6 +51,20 @@ class RepositoryGateway(metaclass=ABCMeta):
     def get_object_files(self, id: str, include_staged: bool = False) -> list[ObjectFile]:
         pass
 
+    @abstractmethod
+    def get_object_file(self, id: str, logical_path: Path, version: int | None = None) -> ObjectFile:
+        """Resolves a logical path in a committed version, by default the head version."""
+        pass
+
     @abstractmethod
     def log(self, id: str, reversed: bool = True) -> list[VersionInfo]:
         pass
+
+    @abstractmethod
+    def diff(self, id: str, from_version: int, to_version: int | None = None) -> ObjectDiff:
+        """
+        Lists the logical paths added, removed and modified between two committed versions.
+        A from_version of 0 compares against the empty state before the first version;
+        to_version defaults to the head version.
+        """
+        pass
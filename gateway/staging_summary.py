@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StagingSummary:
+    staged_files: int = 0
+    staged_bytes: int = 0
+    skipped_files: int = 0
+    skipped_bytes: int = 0
+
+    def __add__(self, other: "StagingSummary") -> "StagingSummary":
+        return StagingSummary(
+            staged_files=self.staged_files + other.staged_files,
+            staged_bytes=self.staged_bytes + other.staged_bytes,
+            skipped_files=self.skipped_files + other.skipped_files,
+            skipped_bytes=self.skipped_bytes + other.skipped_bytes,
+        )
@@ -0,0 +1,29 @@
+import hashlib
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+
+class StorageLayout(Enum):
+    FLAT_DIRECT = "0002-flat-direct-storage-layout"
+    HASHED_N_TUPLE = "0004-hashed-n-tuple-storage-layout"
+
+    def get_object_path(self, id: str, tuple_size: int = 3, number_of_tuples: int = 3) -> Path:
+        match self:
+            case StorageLayout.FLAT_DIRECT:
+                return Path(id)
+            case StorageLayout.HASHED_N_TUPLE:
+                digest = hashlib.sha256(id.encode("utf-8")).hexdigest()
+                n_tuple = [
+                    digest[i: i + tuple_size]
+                    for i in range(0, tuple_size * number_of_tuples, tuple_size)
+                ]
+                return Path().joinpath(*n_tuple, digest)
+
+    def get_config(self, tuple_size: int = 3, number_of_tuples: int = 3) -> dict[str, Any]:
+        config: dict[str, Any] = {"extensionName": self.value}
+        if self == StorageLayout.HASHED_N_TUPLE:
+            config.update(
+                digestAlgorithm="sha256", tupleSize=tuple_size, numberOfTuples=number_of_tuples, shortObjectRoot=False
+            )
+        return config
@@ -0,0 +1,61 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator
+
+from gateway.storage_layout import StorageLayout
+
+OBJECT_NAMASTE_PREFIX = "0=ocfl_object_"
+LAYOUT_FILE_NAME = "ocfl_layout.json"
+
+
+def is_object_path(path: Path) -> bool:
+    try:
+        return any(entry.name.startswith(OBJECT_NAMASTE_PREFIX) for entry in os.scandir(path))
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def find_object_paths(storage_path: Path) -> Iterator[Path]:
+    """
+    Walks the storage root and yields the path of every OCFL object, relative to the root.
+    Object directories are not descended into, and the root's extensions directory is skipped.
+    """
+    directories = [storage_path]
+    while directories:
+        directory = directories.pop()
+        subdirectories = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.startswith(OBJECT_NAMASTE_PREFIX):
+                    yield Path(directory).relative_to(storage_path)
+                    subdirectories = []
+                    break
+                if entry.is_dir(follow_symlinks=False):
+                    if directory == storage_path and entry.name == "extensions":
+                        continue
+                    subdirectories.append(Path(entry.path))
+        directories.extend(sorted(subdirectories, reverse=True))
+
+
+def read_storage_layout(storage_path: Path) -> StorageLayout | None:
+    try:
+        layout_data = json.loads((storage_path / LAYOUT_FILE_NAME).read_text())
+    except FileNotFoundError:
+        return None
+    return StorageLayout(layout_data["extension"])
+
+
+def write_storage_layout(storage_path: Path, layout: StorageLayout) -> None:
+    """Records layout as the storage root's layout, replacing any other layout extension's configuration."""
+    for other_layout in StorageLayout:
+        if other_layout != layout:
+            shutil.rmtree(storage_path / "extensions" / other_layout.value, ignore_errors=True)
+    layout_path = storage_path / "extensions" / layout.value
+    layout_path.mkdir(parents=True, exist_ok=True)
+    (layout_path / "config.json").write_text(json.dumps(layout.get_config(), indent=2))
+    (storage_path / LAYOUT_FILE_NAME).write_text(json.dumps({
+        "extension": layout.value,
+        "description": f"See extensions/{layout.value}/config.json"
+    }, indent=2))
@@ -0,0 +1,99 @@
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from gateway.exceptions import RepositoryGatewayError
+from gateway.object_index import ObjectIndex
+from gateway.ocfl_inventory import OcflInventory
+from gateway.storage_root import find_object_paths
+from gateway.validate import ObjectValidationResult, Severity, ValidationRecord, is_valid
+
+
+class StructuralAuditor:
+    """
+    Checks objects at metadata speed, without hashing any content: each inventory must match its
+    digest sidecar, and every manifest path must exist as a file. Where the storage root has an
+    object index whose entry is current, the content's total size must match the indexed size.
+    Meant to run often, with full fixity validation run rarely.
+    """
+
+    def __init__(self, storage_path: Path, workers: int | None = None) -> None:
+        self.storage_path = storage_path
+        self.workers = workers or os.cpu_count() or 1
+        object_index = ObjectIndex(storage_path)
+        self.object_index = object_index if object_index.exists() else None
+
+    def _check_sidecar(self, object_path: Path, id: str | None) -> tuple[str | None, list[ValidationRecord]]:
+        full_object_path = self.storage_path / object_path
+        for digest_algorithm in OcflInventory.sidecar_digest_algorithms:
+            sidecar_path = full_object_path / f"{OcflInventory.file_name}.{digest_algorithm}"
+            if not sidecar_path.exists():
+                continue
+            sidecar_digest = OcflInventory.read_sidecar_digest(full_object_path)
+            inventory_digest = hashlib.new(
+                digest_algorithm, (full_object_path / OcflInventory.file_name).read_bytes()
+            ).hexdigest()
+            if sidecar_digest != inventory_digest:
+                return sidecar_digest, [ValidationRecord(
+                    id, Severity.error, "E060", f"Inventory digest does not match {sidecar_path.name}"
+                )]
+            return sidecar_digest, []
+        return None, [ValidationRecord(id, Severity.error, "E058", "Inventory has no digest sidecar")]
+
+    def audit_object(self, object_path: Path) -> ObjectValidationResult:
+        full_object_path = self.storage_path / object_path
+        records: list[ValidationRecord] = []
+        try:
+            inventory = OcflInventory.read(full_object_path)
+            if inventory is None:
+                records.append(ValidationRecord(None, Severity.error, "E034", "Object has no inventory"))
+            else:
+                sidecar_digest, sidecar_records = self._check_sidecar(object_path, inventory.id)
+                records.extend(sidecar_records)
+
+                total_size = 0
+                for content_paths in inventory.manifest.values():
+                    for content_path in content_paths:
+                        try:
+                            total_size += os.stat(full_object_path / content_path).st_size
+                        except FileNotFoundError:
+                            records.append(ValidationRecord(
+                                inventory.id, Severity.error, "E092", f"Manifest path {content_path} does not exist"
+                            ))
+
+                entry = self.object_index.get(inventory.id) if self.object_index is not None else None
+                if (
+                    entry is not None and entry.inventory_digest == sidecar_digest
+                    and not records and entry.total_size != total_size
+                ):
+                    records.append(ValidationRecord(
+                        inventory.id, Severity.error, None,
+                        f"Content totals {total_size} bytes but the object index records {entry.total_size}"
+                    ))
+        except (OSError, KeyError, RepositoryGatewayError) as e:
+            records.append(ValidationRecord(None, Severity.error, None, f"Unable to audit object: {e}"))
+
+        return ObjectValidationResult(
+            object_path=object_path,
+            is_valid=is_valid(records),
+            message="\n".join(record.message for record in records),
+            records=records
+        )
+
+    def audit_objects_by_path(self, object_paths: Iterable[Path]) -> Iterator[ObjectValidationResult]:
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending: set[Future] = set()
+            for object_path in object_paths:
+                pending.add(executor.submit(self.audit_object, object_path))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    def audit_repository(self) -> Iterator[ObjectValidationResult]:
+        return self.audit_objects_by_path(find_object_paths(self.storage_path))
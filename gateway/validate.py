@@ -1,13 +1,105 @@
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+import json
+import os
 from pathlib import Path
+import re
 import subprocess
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from gateway.storage_root import find_object_paths
+
+
+class Severity(Enum):
+    error = "error"
+    warning = "warning"
+    info = "info"
+
+
+@dataclass(frozen=True)
+class ValidationRecord:
+    object_id: Optional[str]
+    severity: Severity
+    code: Optional[str]
+    message: str
+
+    def to_dict(self) -> dict[str, Optional[str]]:
+        return asdict(self) | {"severity": self.severity.value}
+
+
+@dataclass(frozen=True)
+class ValidationReportSummary:
+    records: int
+    errors: int
+    warnings: int
+
+    def __add__(self, other: "ValidationReportSummary") -> "ValidationReportSummary":
+        return ValidationReportSummary(
+            records=self.records + other.records,
+            errors=self.errors + other.errors,
+            warnings=self.warnings + other.warnings,
+        )
+
+
+OBJECT_STATUS_PATTERN = re.compile(r"^Object (?P<id>.+) is (?P<status>valid|invalid)\.?$")
+CODE_PATTERN = re.compile(r"\b(?P<code>[EW]\d{3})\b")
+HEADING_PATTERN = re.compile(r"^(Errors|Warnings):$")
+
+
+def parse_validation_output(lines: Iterable[str]) -> Iterator[ValidationRecord]:
+    """
+    Turns rocfl validate output into records, one per non-blank line, without holding more than a line.
+    Indented lines following an "Object ... is (in)valid" line are attributed to that object.
+    """
+    object_id: Optional[str] = None
+    for line in lines:
+        message = line.strip()
+        if not message or HEADING_PATTERN.match(message):
+            continue
+        if not line[0].isspace():
+            object_id = None
+
+        if (match := OBJECT_STATUS_PATTERN.match(message)) is not None:
+            object_id = match.group("id")
+            severity = Severity.error if match.group("status") == "invalid" else Severity.info
+            yield ValidationRecord(object_id, severity, None, message)
+            continue
+
+        code = match.group("code") if (match := CODE_PATTERN.search(message)) is not None else None
+        lowered = message.lower()
+        if (code or "").startswith("E") or lowered.startswith(("error", "[error]")):
+            severity = Severity.error
+        elif (code or "").startswith("W") or lowered.startswith(("warning", "[warn")):
+            severity = Severity.warning
+        else:
+            severity = Severity.info
+        yield ValidationRecord(object_id, severity, code, message)
+
+
+def is_valid(records: Iterable[ValidationRecord]) -> bool:
+    return not any(record.severity == Severity.error for record in records)
+
+
+def write_validation_report(records: Iterable[ValidationRecord], report: TextIO) -> ValidationReportSummary:
+    """Writes each record to report as a JSON line as soon as it arrives."""
+    total = errors = warnings = 0
+    for record in records:
+        total += 1
+        errors += record.severity == Severity.error
+        warnings += record.severity == Severity.warning
+        report.write(json.dumps(record.to_dict()) + "\n")
+    report.flush()
+    return ValidationReportSummary(records=total, errors=errors, warnings=warnings)
+
 
 @dataclass
 class FixityCheckResult:
     is_valid: bool
     message: str
+    records: List[ValidationRecord] = field(default_factory=list)
 
 class OCFLFixityValidator(ABC):
     @abstractmethod
@@ -38,6 +130,29 @@ class RocflOCFLFixityValidator(OCFLFixityValidator):
         command = self._build_command(['rocfl', '-r', str(self.repository_path), 'validate', '-p'] + object_paths, no_fixity, log_level, suppress_warning)
         return self._run_rocfl_command(command)
 
+    def iter_repository(self, no_fixity: bool = False, log_level: Optional[str] = None, suppress_warning: Optional[str] = None) -> Iterator[ValidationRecord]:
+        command = self._build_command(['rocfl', '-r', str(self.repository_path), 'validate'], no_fixity, log_level, suppress_warning)
+        return self._stream_rocfl_command(command)
+
+    def iter_objects(self, object_ids: List[str], no_fixity: bool = False, log_level: Optional[str] = None, suppress_warning: Optional[str] = None) -> Iterator[ValidationRecord]:
+        command = self._build_command(['rocfl', '-r', str(self.repository_path), 'validate'] + object_ids, no_fixity, log_level, suppress_warning)
+        return self._stream_rocfl_command(command)
+
+    def iter_objects_by_path(self, object_paths: List[str], no_fixity: bool = False, log_level: Optional[str] = None, suppress_warning: Optional[str] = None) -> Iterator[ValidationRecord]:
+        command = self._build_command(['rocfl', '-r', str(self.repository_path), 'validate', '-p'] + object_paths, no_fixity, log_level, suppress_warning)
+        return self._stream_rocfl_command(command)
+
+    def _stream_rocfl_command(self, command: List[str]) -> Iterator[ValidationRecord]:
+        # stderr is merged into stdout so neither pipe can fill up while the other is read
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) as process:
+            assert process.stdout is not None
+            has_errors = False
+            for record in parse_validation_output(process.stdout):
+                has_errors = has_errors or record.severity == Severity.error
+                yield record
+        if process.returncode != 0 and not has_errors:
+            yield ValidationRecord(None, Severity.error, None, f"rocfl exited with status {process.returncode}")
+
     def _run_rocfl_command(self, command: List[str]) -> str:
         try:
             result = subprocess.run(
@@ -63,8 +178,63 @@ class FixityValidator():
         self.rocflvalidator = rocflvalidator
 
     def check_objects_fixity(self, object_ids: List[str]) -> FixityCheckResult:
-        result = self.rocflvalidator.validate_objects(object_ids)
-        if "error" in result.lower():
-            return FixityCheckResult(False, result)
-        return FixityCheckResult(True, result)
-    
\ No newline at end of file
+        records = list(self.rocflvalidator.iter_objects(object_ids))
+        message = "\n".join(record.message for record in records)
+        return FixityCheckResult(is_valid(records), message, records)
+
+
+@dataclass
+class ObjectValidationResult:
+    object_path: Path
+    is_valid: bool
+    message: str
+    records: List[ValidationRecord] = field(default_factory=list)
+
+
+class ParallelFixityValidator():
+    """
+    Validates every object in a storage root, one rocfl process per object, with up to `workers`
+    processes running at once and at most `readers_per_device` of them reading from the same device.
+    Results are yielded as each object finishes rather than when the whole root is done.
+    """
+
+    def __init__(self, rocflvalidator: RocflOCFLFixityValidator, workers: int | None = None, readers_per_device: int = 4):
+        self.rocflvalidator = rocflvalidator
+        self.workers = workers or os.cpu_count() or 1
+        self.readers_per_device = readers_per_device
+        self.device_semaphores: dict[int, threading.BoundedSemaphore] = {}
+        self.device_semaphores_lock = threading.Lock()
+
+    def _get_device_semaphore(self, object_path: Path) -> threading.BoundedSemaphore:
+        device = os.stat(self.rocflvalidator.repository_path / object_path).st_dev
+        with self.device_semaphores_lock:
+            if device not in self.device_semaphores:
+                self.device_semaphores[device] = threading.BoundedSemaphore(self.readers_per_device)
+            return self.device_semaphores[device]
+
+    def _validate_object(self, object_path: Path, no_fixity: bool, log_level: Optional[str], suppress_warning: Optional[str]) -> ObjectValidationResult:
+        # The streamed records include an error when rocfl exits non-zero without reporting one
+        with self._get_device_semaphore(object_path):
+            records = list(self.rocflvalidator.iter_objects_by_path(
+                [str(object_path)], no_fixity, log_level, suppress_warning
+            ))
+        message = "\n".join(record.message for record in records)
+        return ObjectValidationResult(object_path=object_path, is_valid=is_valid(records), message=message, records=records)
+
+    def validate_objects_by_path(self, object_paths: Iterable[Path], no_fixity: bool = False, log_level: Optional[str] = None, suppress_warning: Optional[str] = None) -> Iterator[ObjectValidationResult]:
+        # Only a few objects per worker are queued at a time so huge roots are never listed in memory
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending: set[Future] = set()
+            for object_path in object_paths:
+                pending.add(executor.submit(self._validate_object, object_path, no_fixity, log_level, suppress_warning))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    def validate_repository(self, no_fixity: bool = False, log_level: Optional[str] = None, suppress_warning: Optional[str] = None) -> Iterator[ObjectValidationResult]:
+        object_paths = find_object_paths(self.rocflvalidator.repository_path)
+        return self.validate_objects_by_path(object_paths, no_fixity, log_level, suppress_warning)
@@ -0,0 +1,19 @@
+import socket
+
+import pytest
+
+from dor.config import config
+
+# PostgreSQL's default port, which the engine URL relies on
+DATABASE_PORT = 5432
+
+
+def is_database_reachable() -> bool:
+    try:
+        with socket.create_connection((config.database.host, DATABASE_PORT), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+requires_database = pytest.mark.skipif(not is_database_reachable(), reason="The test database is not reachable")
@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Generator
+
+from fastapi.testclient import TestClient
+import pytest
+
+from dor.entrypoints.api.dependencies import get_repository_gateway
+from dor.entrypoints.api.main import app
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+
+CONTENT = b"Plain text transcription of page one"
+
+
+@pytest.fixture
+def gateway(tmp_path: Path) -> NativeOcflRepositoryGateway:
+    source_path = tmp_path / "source"
+    source_path.mkdir()
+    (source_path / "A.txt").write_bytes(CONTENT)
+    storage_path = tmp_path / "storage"
+    storage_path.mkdir()
+    gateway = NativeOcflRepositoryGateway(storage_path=storage_path)
+    gateway.create_repository()
+    gateway.create_staged_object("deposit_one")
+    gateway.stage_object_files("deposit_one", Bundle(root_path=source_path, entries=[Path("A.txt")]))
+    gateway.commit_object_changes("deposit_one", Coordinator("test", "test@example.edu"), "First version!")
+    return gateway
+
+
+@pytest.fixture
+def objects_test_client(gateway: NativeOcflRepositoryGateway) -> Generator[TestClient, None, None]:
+    app.dependency_overrides[get_repository_gateway] = lambda: gateway
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_objects_api_returns_file_with_digest_etag(
+    objects_test_client: TestClient, gateway: NativeOcflRepositoryGateway
+) -> None:
+    response = objects_test_client.get("api/v1/objects/deposit_one/files/A.txt")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["etag"] == f'"{gateway.get_object_file("deposit_one", Path("A.txt")).digest}"'
+
+
+def test_objects_api_returns_byte_range(objects_test_client: TestClient) -> None:
+    response = objects_test_client.get("api/v1/objects/deposit_one/files/A.txt", headers={"Range": "bytes=1-3"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[1:4]
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_objects_api_returns_not_modified_for_matching_etag(objects_test_client: TestClient) -> None:
+    etag = objects_test_client.head("api/v1/objects/deposit_one/files/A.txt").headers["etag"]
+
+    response = objects_test_client.get("api/v1/objects/deposit_one/files/A.txt", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_objects_api_returns_404_for_missing_file(objects_test_client: TestClient) -> None:
+    for path in ["deposit_one/files/B.txt", "deposit_one/files/A.txt?version=2", "deposit_two/files/A.txt"]:
+        assert objects_test_client.get(f"api/v1/objects/{path}").status_code == 404
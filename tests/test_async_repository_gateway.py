@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from gateway.async_repository_gateway import SyncRepositoryGateway, ThreadedAsyncRepositoryGateway
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.exceptions import ObjectDoesNotExistError, ObjectLockTimeoutError
+from gateway.fake_repository_gateway import FakeRepositoryGateway
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.object_file import ObjectFile
+from gateway.object_lock import ObjectLocker
+
+
+class SlowFakeRepositoryGateway(FakeRepositoryGateway):
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def has_object(self, id: str) -> bool:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return super().has_object(id)
+
+
+@pytest.fixture
+def bundle_a() -> Bundle:
+    return Bundle(root_path=Path("/"), entries=[Path("some"), Path("some/path")])
+
+
+def test_async_gateway_stores_and_reads_object(bundle_a: Bundle) -> None:
+    gateway = ThreadedAsyncRepositoryGateway(FakeRepositoryGateway())
+
+    async def store_and_read() -> list[ObjectFile]:
+        await gateway.create_staged_object("A")
+        await gateway.stage_object_files("A", bundle_a)
+        await gateway.commit_object_changes("A", Coordinator("test", "test@example.edu"), "First version!")
+        assert await gateway.has_object("A")
+        return await gateway.get_object_files("A")
+
+    object_files = asyncio.run(store_and_read())
+
+    assert set(object_files) == set([
+        ObjectFile(logical_path=Path("some"), literal_path=Path("some")),
+        ObjectFile(logical_path=Path("some/path"), literal_path=Path("some/path"))
+    ])
+
+
+def test_async_gateway_raises_gateway_errors() -> None:
+    gateway = ThreadedAsyncRepositoryGateway(FakeRepositoryGateway())
+
+    with pytest.raises(ObjectDoesNotExistError):
+        asyncio.run(gateway.log("Z"))
+
+
+def test_async_gateway_overlaps_calls_up_to_concurrency_limit() -> None:
+    fake_gateway = SlowFakeRepositoryGateway(delay=0.1)
+    gateway = ThreadedAsyncRepositoryGateway(fake_gateway, max_concurrency=4)
+
+    async def check_objects() -> list[bool]:
+        return await asyncio.gather(*[gateway.has_object(str(index)) for index in range(8)])
+
+    start = time.perf_counter()
+    results = asyncio.run(check_objects())
+    elapsed = time.perf_counter() - start
+
+    assert results == [False] * 8
+    assert fake_gateway.max_running == 4
+    assert elapsed < 0.8
+
+
+def test_sync_gateway_runs_async_gateway_for_blocking_callers(bundle_a: Bundle) -> None:
+    gateway = SyncRepositoryGateway(ThreadedAsyncRepositoryGateway(FakeRepositoryGateway()))
+
+    gateway.create_staged_object("A")
+    summary = gateway.stage_object_files("A", bundle_a)
+    gateway.commit_object_changes("A", Coordinator("test", "test@example.edu"), "First version!")
+
+    assert summary.staged_files == 2
+    assert gateway.has_object("A")
+    assert [version.message for version in gateway.log("A")] == ["First version!"]
+    gateway.close()
+
+
+def test_async_gateway_drops_object_locks_once_released(bundle_a: Bundle) -> None:
+    gateway = ThreadedAsyncRepositoryGateway(FakeRepositoryGateway())
+
+    async def stage_objects() -> None:
+        await asyncio.gather(*[gateway.create_staged_object(str(index)) for index in range(4)])
+        await asyncio.gather(*[gateway.stage_object_files(str(index % 4), bundle_a) for index in range(8)])
+
+    asyncio.run(stage_objects())
+
+    assert gateway.object_locks == {}
+    assert gateway.object_lock_users == {}
+
+
+def test_sync_gateway_shares_limits_across_calling_threads() -> None:
+    fake_gateway = SlowFakeRepositoryGateway(delay=0.05)
+    gateway = SyncRepositoryGateway(ThreadedAsyncRepositoryGateway(fake_gateway, max_concurrency=2))
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(gateway.has_object, [str(index) for index in range(12)]))
+    gateway.close()
+
+    assert results == [False] * 12
+    assert fake_gateway.max_running == 2
+
+
+def test_sync_gateway_holds_object_lock_across_calls(tmp_path: Path) -> None:
+    native_gateway = NativeOcflRepositoryGateway(
+        storage_path=tmp_path, object_locker=ObjectLocker(tmp_path, timeout=2)
+    )
+    native_gateway.create_repository()
+    gateway = SyncRepositoryGateway(ThreadedAsyncRepositoryGateway(native_gateway))
+    other_locker = ObjectLocker(tmp_path)
+    bundle = Bundle(root_path=Path("tests/fixtures/test_deposit/deposit_one"), entries=[Path("A.txt")])
+
+    with gateway.lock_object("deposit_one"):
+        gateway.create_staged_object("deposit_one")
+        gateway.stage_object_files("deposit_one", bundle)
+        with pytest.raises(ObjectLockTimeoutError):
+            with other_locker.lock("deposit_one", timeout=0.1):
+                pass
+        gateway.commit_object_changes("deposit_one", Coordinator("test", "test@example.edu"), "First version!")
+
+    with other_locker.lock("deposit_one", timeout=0.1):
+        pass
+    assert [version.message for version in gateway.log("deposit_one")] == ["First version!"]
+    gateway.close()
@@ -1,10 +1,14 @@
+import os
+import shutil
 from pathlib import Path
 from typing import Callable
+from unittest.mock import patch
 
 import pytest
 
-from dor.adapters.bag_adapter import BagAdapter, DorInfoMissingError, ValidationError
+from dor.adapters.bag_adapter import BagAdapter, DorInfoMissingError, ValidationError, choose_workers
 from dor.providers.file_system_file_provider import FilesystemFileProvider
+from utils.digest_ledger import DigestLedger, LedgerEntry, TrustPolicy
 
 
 @pytest.fixture
@@ -117,3 +121,142 @@ def test_adapter_can_add_dor_info(payload_path):
 
     assert dor_info == bag.dor_info
     bag.validate()
+
+
+def test_fails_validation_when_file_content_changes_but_size_does_not(payload_path):
+    file_provider = FilesystemFileProvider()
+    bag = BagAdapter.make(payload_path, file_provider)
+    with open(payload_path / "data" / "hello.txt", "w") as file:
+        file.write("Hello Earth!\n")
+
+    with pytest.raises(ValidationError) as excinfo:
+        bag.validate()
+    assert excinfo.value.message.startswith(
+        "Validation failed with the following message: \"Bag validation failed: data/hello.txt sha256 validation failed"
+    )
+
+
+def test_adapter_makes_and_validates_bag_with_several_workers(payload_path):
+    for number in range(8):
+        (payload_path / f"page{number}.txt").write_text(f"Page {number}\n")
+    file_provider = FilesystemFileProvider()
+    BagAdapter.make(payload_path, file_provider, workers=2)
+    (payload_path / "data" / "page5.txt").write_text("Page 6\n")
+
+    with pytest.raises(ValidationError) as excinfo:
+        BagAdapter.load(payload_path, file_provider).validate(workers=4)
+    assert "data/page5.txt sha256 validation failed" in excinfo.value.message
+
+
+def test_choose_workers_uses_one_worker_for_small_payloads():
+    assert choose_workers([]) == 1
+    assert choose_workers([1024] * 1000) == 1
+
+
+def test_choose_workers_is_limited_by_cores_and_largest_file():
+    megabyte = 1024 * 1024
+    with patch("os.cpu_count", return_value=16):
+        assert choose_workers([100 * megabyte] * 40) == 16
+        assert choose_workers([100 * megabyte] * 3) == 3
+        assert choose_workers([1000 * megabyte] + [100 * megabyte] * 20) == 3
+
+
+def test_adapter_copies_validated_bag(test_bags_path: Path, tmp_path: Path):
+    bag = BagAdapter.load(test_bags_path / "test_bag_valid_with_dor_info", FilesystemFileProvider())
+
+    bag_copy = bag.copy_validated(tmp_path / "copy", workers=2)
+
+    assert bag_copy.dor_info == bag.dor_info
+    bag_copy.validate()
+
+
+def test_adapter_fails_copy_when_file_has_been_modified(payload_path, tmp_path: Path):
+    file_provider = FilesystemFileProvider()
+    BagAdapter.make(payload_path, file_provider)
+    with open(payload_path / "data" / "hello.txt", "w") as file:
+        file.write("Hello Earth!\n")
+
+    with pytest.raises(ValidationError) as excinfo:
+        BagAdapter.load(payload_path, file_provider).copy_validated(tmp_path / "copy")
+    assert "data/hello.txt sha256 validation failed" in excinfo.value.message
+    assert not (tmp_path / "copy").exists()
+
+
+def test_adapter_makes_bag_from_digest_ledger(payload_path):
+    digest_ledger = DigestLedger.record_directory(payload_path)
+    file_provider = FilesystemFileProvider()
+
+    with patch("utils.digest_ledger.compute_digests") as compute_digests:
+        bag = BagAdapter.make(payload_path, file_provider, digest_ledger=digest_ledger, trust_policy=TrustPolicy.reuse)
+    compute_digests.assert_not_called()
+
+    assert bag.bag.info["Payload-Oxum"] == "13.1"
+    bag.add_dor_info(dor_info={"Action": "store"})
+    BagAdapter.load(payload_path, file_provider).validate()
+
+
+def test_adapter_hashes_payload_when_sampled_ledger_entry_does_not_match(payload_path):
+    digest_ledger = DigestLedger.record_directory(payload_path)
+    (payload_path / "hello.txt").write_text("Hello Earth!\n")
+    file_provider = FilesystemFileProvider()
+
+    # With a single recorded file, that file is always in the sample
+    BagAdapter.make(payload_path, file_provider, digest_ledger=digest_ledger, trust_policy=TrustPolicy.sample)
+
+    BagAdapter.load(payload_path, file_provider).validate()
+
+
+def test_validation_under_reuse_policy_only_checks_completeness(payload_path):
+    file_provider = FilesystemFileProvider()
+    bag = BagAdapter.make(payload_path, file_provider)
+    with open(payload_path / "data" / "hello.txt", "w") as file:
+        file.write("Hello Earth!\n")
+
+    bag.validate(trust_policy=TrustPolicy.reuse)
+    with pytest.raises(ValidationError):
+        bag.validate(trust_policy=TrustPolicy.full)
+
+
+def test_adapter_gets_digest_ledger_from_manifests(payload_path):
+    bag = BagAdapter.make(payload_path, FilesystemFileProvider())
+
+    ledger = bag.get_digest_ledger()
+
+    assert ledger.entries == {"data/hello.txt": LedgerEntry.for_file(
+        payload_path / "data" / "hello.txt", bag.bag.entries["data/hello.txt"]
+    )}
+
+
+def test_validation_reports_mismatches_in_algorithm_order(payload_path):
+    file_provider = FilesystemFileProvider()
+    bag = BagAdapter.make(payload_path, file_provider)
+    with open(payload_path / "data" / "hello.txt", "w") as file:
+        file.write("Hello Earth!\n")
+    expected_digests = bag.bag.entries["data/hello.txt"]
+    bag.bag.entries["data/hello.txt"] = dict(reversed(list(expected_digests.items())))
+
+    with pytest.raises(ValidationError) as excinfo:
+        bag.validate()
+    message = excinfo.value.message
+    assert message.index("data/hello.txt sha256 validation failed") < message.index(
+        "data/hello.txt sha512 validation failed"
+    )
+
+
+def test_adapter_makes_same_bag_from_digest_ledger_as_bagit(payload_path, tmp_path: Path):
+    (payload_path / "pages").mkdir()
+    (payload_path / "pages" / "page1.txt").write_text("Page 1\n")
+    bagit_payload_path = tmp_path / "bagit"
+    shutil.copytree(payload_path, bagit_payload_path)
+    digest_ledger = DigestLedger.record_directory(payload_path)
+    file_provider = FilesystemFileProvider()
+
+    bag = BagAdapter.make(payload_path, file_provider, digest_ledger=digest_ledger, trust_policy=TrustPolicy.reuse)
+    bagit_bag = BagAdapter.make(bagit_payload_path, file_provider)
+
+    assert sorted(os.listdir(payload_path)) == sorted(os.listdir(bagit_payload_path))
+    for manifest_name in ["manifest-sha256.txt", "manifest-sha512.txt", "bagit.txt"]:
+        assert (payload_path / manifest_name).read_text() == (bagit_payload_path / manifest_name).read_text()
+    assert bag.bag.info == bagit_bag.bag.info
+    assert not list(payload_path.parent.glob(f".{payload_path.name}.*"))
+    bag.validate()
@@ -0,0 +1,170 @@
+import uuid
+from datetime import datetime, UTC
+from typing import Callable
+
+import pytest
+
+from dor.domain.events import (
+    Event, PackageNotVerified, PackageStored, PackageSubmitted, PackageUnpacked, PackageVerified, RevisionCataloged
+)
+from dor.domain.models import VersionInfo, WorkflowEventType
+from dor.providers.models import Agent, PackageResource, PreservationEvent
+from dor.service_layer.checkpoint_service import (
+    CheckpointNotFoundError, create_checkpoint, rehydrate_event, resume_ingest
+)
+from dor.service_layer.handlers.record_checkpoint import record_checkpoint
+from dor.service_layer.message_bus.memory_message_bus import MemoryMessageBus
+from dor.service_layer.unit_of_work import UnitOfWork
+from gateway.coordinator import Coordinator
+from gateway.fake_repository_gateway import FakeRepositoryGateway
+
+
+@pytest.fixture
+def unpacked_event() -> PackageUnpacked:
+    return PackageUnpacked(
+        package_identifier="xyzzy-00000000-0000-0000-0000-000000000001-v1",
+        tracking_identifier="tracking",
+        identifier="00000000-0000-0000-0000-000000000001",
+        resources=[PackageResource(
+            id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+            type="Monograph",
+            root=True,
+            events=[PreservationEvent(
+                identifier="e01727d0-b4d9-47a5-925a-4018f87a6e0a",
+                type="ingest",
+                datetime=datetime(2025, 2, 5, 12, 0, 0, tzinfo=UTC),
+                detail=None,
+                agent=Agent(address="test@example.edu", role="collection manager")
+            )]
+        )],
+        version_info=VersionInfo(coordinator=Coordinator("test", "test@example.edu"), message="First version"),
+        workspace_identifier="/tmp/workspace"
+    )
+
+
+def test_checkpoint_rehydrates_event(unpacked_event: PackageUnpacked) -> None:
+    checkpoint = create_checkpoint(unpacked_event)
+
+    assert checkpoint.tracking_identifier == "tracking"
+    assert checkpoint.event_type == WorkflowEventType.PACKAGE_UNPACKED
+    assert rehydrate_event(checkpoint) == unpacked_event
+
+
+class Pipeline:
+
+    def __init__(self) -> None:
+        self.uow = UnitOfWork(gateway=FakeRepositoryGateway())
+        self.handled: list[Event] = []
+        self.fail_on: type[Event] | None = None
+
+        def handle(next_event: Callable[[Event], Event] | None) -> Callable[[Event], None]:
+            def handler(event: Event) -> None:
+                if type(event) is self.fail_on:
+                    raise RuntimeError("Worker stopped")
+                self.handled.append(event)
+                if next_event is not None:
+                    self.uow.add_event(next_event(event))
+            return handler
+
+        def verified(event: Event) -> Event:
+            return PackageVerified(
+                package_identifier=event.package_identifier,
+                tracking_identifier=event.tracking_identifier,
+                workspace_identifier="/tmp/workspace"
+            )
+
+        def cataloged(event: Event) -> Event:
+            return RevisionCataloged(
+                package_identifier=event.package_identifier,
+                tracking_identifier=event.tracking_identifier,
+                identifier="00000000-0000-0000-0000-000000000001",
+                workspace_identifier=event.workspace_identifier
+            )
+        self.message_bus = MemoryMessageBus(
+            event_handlers={
+                PackageSubmitted: [lambda event: record_checkpoint(event, self.uow), handle(verified)],
+                PackageVerified: [lambda event: record_checkpoint(event, self.uow), handle(cataloged)],
+                RevisionCataloged: [lambda event: record_checkpoint(event, self.uow), handle(None)],
+            },
+            command_handlers={},
+            uow=self.uow
+        )
+
+
+def test_resume_ingest_continues_after_last_completed_stage() -> None:
+    pipeline = Pipeline()
+    pipeline.fail_on = PackageVerified
+    with pytest.raises(RuntimeError):
+        pipeline.message_bus.handle(PackageSubmitted(package_identifier="package", tracking_identifier="tracking"))
+    assert pipeline.uow.checkpoint_store.get("tracking").event_type == WorkflowEventType.PACKAGE_VERIFIED
+
+    pipeline.fail_on = None
+    pipeline.handled = []
+    checkpoint = resume_ingest("tracking", pipeline.uow, pipeline.message_bus)
+
+    assert checkpoint.event_type == WorkflowEventType.PACKAGE_VERIFIED
+    assert [type(event) for event in pipeline.handled] == [PackageVerified, RevisionCataloged]
+    assert pipeline.uow.checkpoint_store.get("tracking").event_type == WorkflowEventType.REVISION_CATALOGED
+
+
+def test_resume_ingest_does_nothing_after_ingest_ended() -> None:
+    pipeline = Pipeline()
+    pipeline.uow.checkpoint_store.add(create_checkpoint(PackageNotVerified(
+        package_identifier="package", tracking_identifier="tracking", message="Validation failed"
+    )))
+
+    checkpoint = resume_ingest("tracking", pipeline.uow, pipeline.message_bus)
+
+    assert checkpoint.event_type == WorkflowEventType.PACKAGE_NOT_VERIFIED
+    assert pipeline.handled == []
+
+
+def test_resume_ingest_raises_without_checkpoint() -> None:
+    with pytest.raises(CheckpointNotFoundError):
+        resume_ingest("tracking", UnitOfWork(gateway=FakeRepositoryGateway()), Pipeline().message_bus)
+
+
+def test_resume_ingest_carries_on_from_version_committed_before_stopping(unpacked_event: PackageUnpacked) -> None:
+    uow = UnitOfWork(gateway=FakeRepositoryGateway())
+    uow.gateway.create_staged_object(unpacked_event.identifier)
+    uow.gateway.commit_object_changes(
+        unpacked_event.identifier, unpacked_event.version_info.coordinator, unpacked_event.version_info.message
+    )
+    uow.checkpoint_store.add(create_checkpoint(unpacked_event))
+    handled: list[Event] = []
+    message_bus = MemoryMessageBus(
+        event_handlers={PackageUnpacked: [handled.append], PackageStored: [handled.append]},
+        command_handlers={},
+        uow=uow
+    )
+
+    resume_ingest("tracking", uow, message_bus)
+
+    assert handled == [PackageStored(
+        package_identifier=unpacked_event.package_identifier,
+        tracking_identifier="tracking",
+        identifier=unpacked_event.identifier,
+        resources=unpacked_event.resources,
+        workspace_identifier=unpacked_event.workspace_identifier,
+        revision_number=1,
+    )]
+    assert len(uow.gateway.log(unpacked_event.identifier)) == 1
+
+
+def test_resume_ingest_stores_files_when_head_version_has_another_message(unpacked_event: PackageUnpacked) -> None:
+    uow = UnitOfWork(gateway=FakeRepositoryGateway())
+    uow.gateway.create_staged_object(unpacked_event.identifier)
+    uow.gateway.commit_object_changes(
+        unpacked_event.identifier, unpacked_event.version_info.coordinator, "Another version"
+    )
+    uow.checkpoint_store.add(create_checkpoint(unpacked_event))
+    handled: list[Event] = []
+    message_bus = MemoryMessageBus(
+        event_handlers={PackageUnpacked: [handled.append], PackageStored: [handled.append]},
+        command_handlers={},
+        uow=uow
+    )
+
+    resume_ingest("tracking", uow, message_bus)
+
+    assert handled == [unpacked_event]
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from dor.adapters.checkpoint_store import MemoryCheckpointStore, SqlalchemyCheckpointStore
+from dor.domain.models import IngestCheckpoint, WorkflowEventType
+from tests.database import requires_database
+
+
+@pytest.fixture
+def checkpoint() -> IngestCheckpoint:
+    return IngestCheckpoint(
+        tracking_identifier="some-tracking-id",
+        package_identifier="00000000-0000-0000-0000-000000000001_20250620120000",
+        event_type=WorkflowEventType.PACKAGE_VERIFIED,
+        event_data={
+            "package_identifier": "00000000-0000-0000-0000-000000000001_20250620120000",
+            "tracking_identifier": "some-tracking-id",
+            "update_flag": False,
+            "workspace_identifier": "/tmp/some-workspace"
+        },
+        recorded_at=datetime(2025, 6, 20, 12, 0, 0, tzinfo=UTC)
+    )
+
+
+@pytest.fixture
+def later_checkpoint(checkpoint: IngestCheckpoint) -> IngestCheckpoint:
+    return IngestCheckpoint(
+        tracking_identifier=checkpoint.tracking_identifier,
+        package_identifier=checkpoint.package_identifier,
+        event_type=WorkflowEventType.REVISION_CATALOGED,
+        event_data={**checkpoint.event_data, "identifier": "00000000-0000-0000-0000-000000000001"},
+        recorded_at=checkpoint.recorded_at + timedelta(minutes=5)
+    )
+
+
+def test_memory_checkpoint_store_replaces_checkpoint(
+    checkpoint: IngestCheckpoint, later_checkpoint: IngestCheckpoint
+) -> None:
+    store = MemoryCheckpointStore()
+    store.add(checkpoint)
+    assert store.get("some-tracking-id") == checkpoint
+
+    store.add(later_checkpoint)
+    assert store.get("some-tracking-id") == later_checkpoint
+    assert store.get("other-tracking-id") is None
+
+
+@requires_database
+@pytest.mark.usefixtures("db_session")
+def test_sqlalchemy_checkpoint_store_adds_and_replaces_checkpoint(
+    db_session, checkpoint: IngestCheckpoint, later_checkpoint: IngestCheckpoint
+) -> None:
+    store = SqlalchemyCheckpointStore(db_session)
+    with db_session.begin():
+        store.add(checkpoint)
+        db_session.commit()
+
+    with db_session.begin():
+        store.add(later_checkpoint)
+        db_session.commit()
+
+    assert store.get("some-tracking-id") == later_checkpoint
+    assert store.get("other-tracking-id") is None
@@ -0,0 +1,95 @@
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.digest_ledger import DigestLedger, DigestLedgerMismatchError, LedgerEntry, TrustPolicy
+
+
+@pytest.fixture
+def directory(tmp_path: Path) -> Path:
+    directory = tmp_path / "file_set"
+    (directory / "data").mkdir(parents=True)
+    (directory / "data" / "page.txt").write_text("Page\n")
+    (directory / "descriptor.xml").write_text("<descriptor/>\n")
+    return directory
+
+
+def test_ledger_records_directory_and_round_trips_through_its_sidecar(directory: Path) -> None:
+    ledger = DigestLedger.record_directory(directory)
+    sidecar_path = DigestLedger.get_sidecar_path(directory)
+    ledger.write(sidecar_path)
+
+    assert sidecar_path == directory.parent / "file_set.digests.json"
+    entries = DigestLedger.read(sidecar_path).entries
+    assert entries == ledger.entries
+    assert entries["data/page.txt"] == LedgerEntry.for_file(
+        directory / "data" / "page.txt",
+        {"sha256": hashlib.sha256(b"Page\n").hexdigest(), "sha512": hashlib.sha512(b"Page\n").hexdigest()}
+    )
+    assert entries["data/page.txt"].size == 5
+
+
+def test_ledger_reads_missing_sidecar_as_empty(tmp_path: Path) -> None:
+    assert DigestLedger.read(tmp_path / "missing.digests.json").entries == {}
+
+
+def test_ledger_merges_with_prefix(directory: Path) -> None:
+    ledger = DigestLedger()
+    ledger.merge(DigestLedger.record_directory(directory), prefix="file_set")
+
+    assert sorted(ledger.entries) == ["file_set/data/page.txt", "file_set/descriptor.xml"]
+
+
+def test_ledger_ignores_entry_when_size_has_changed(directory: Path) -> None:
+    ledger = DigestLedger.record_directory(directory)
+    (directory / "data" / "page.txt").write_text("Page two\n")
+
+    assert ledger.get_current(directory, "data/page.txt") is None
+    assert ledger.get_current(directory, "descriptor.xml", ["sha512"]) == {
+        "sha512": hashlib.sha512(b"<descriptor/>\n").hexdigest()
+    }
+
+
+def test_ledger_ignores_entry_when_file_is_rewritten_at_the_same_size(directory: Path) -> None:
+    ledger = DigestLedger.record_directory(directory)
+    file_path = directory / "data" / "page.txt"
+    recorded_mtime_ns = file_path.stat().st_mtime_ns
+    file_path.write_text("Pago\n")
+    os.utime(file_path, ns=(recorded_mtime_ns + 1_000_000, recorded_mtime_ns + 1_000_000))
+
+    assert ledger.get_current(directory, "data/page.txt") is None
+
+
+def test_ledger_ignores_entry_without_modification_time(directory: Path) -> None:
+    ledger = DigestLedger({"data/page.txt": LedgerEntry(size=5, digests={"sha256": "a" * 64})})
+
+    assert ledger.get_current(directory, "data/page.txt") is None
+
+
+def test_ledger_resolve_reuses_recorded_digests(directory: Path) -> None:
+    recorded_digests = {"sha256": "a" * 64, "sha512": "b" * 128}
+    ledger = DigestLedger({"data/page.txt": LedgerEntry.for_file(directory / "data" / "page.txt", recorded_digests)})
+
+    digests = ledger.resolve(directory, ["data/page.txt", "descriptor.xml"], ["sha256", "sha512"], TrustPolicy.reuse)
+
+    assert digests["data/page.txt"] == recorded_digests
+    assert digests["descriptor.xml"]["sha256"] == hashlib.sha256(b"<descriptor/>\n").hexdigest()
+
+
+def test_ledger_resolve_hashes_everything_under_full_policy(directory: Path) -> None:
+    entry = LedgerEntry.for_file(directory / "data" / "page.txt", {"sha256": "a" * 64})
+    ledger = DigestLedger({"data/page.txt": entry})
+
+    digests = ledger.resolve(directory, ["data/page.txt"], ["sha256"], TrustPolicy.full)
+
+    assert digests == {"data/page.txt": {"sha256": hashlib.sha256(b"Page\n").hexdigest()}}
+
+
+def test_ledger_resolve_raises_when_sampled_file_does_not_match(directory: Path) -> None:
+    entry = LedgerEntry.for_file(directory / "data" / "page.txt", {"sha256": "a" * 64})
+    ledger = DigestLedger({"data/page.txt": entry})
+
+    with pytest.raises(DigestLedgerMismatchError):
+        ledger.resolve(directory, ["data/page.txt"], ["sha256"], TrustPolicy.sample, sample_rate=1.0)
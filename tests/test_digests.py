@@ -0,0 +1,36 @@
+import hashlib
+from pathlib import Path
+
+from utils.digests import compute_digest, compute_digests, copy_with_digests
+
+
+def test_compute_digests_computes_each_algorithm(tmp_path: Path) -> None:
+    file_path = tmp_path / "file.txt"
+    content = b"Hello World!\n" * 1000
+    file_path.write_bytes(content)
+
+    digests = compute_digests(file_path, ["md5", "sha256", "sha512"], buffer_size=1024)
+
+    assert digests == {
+        "md5": hashlib.md5(content).hexdigest(),
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "sha512": hashlib.sha512(content).hexdigest(),
+    }
+
+
+def test_compute_digest_handles_empty_file(tmp_path: Path) -> None:
+    file_path = tmp_path / "empty.txt"
+    file_path.write_bytes(b"")
+
+    assert compute_digest(file_path, "sha512") == hashlib.sha512(b"").hexdigest()
+
+
+def test_copy_with_digests_copies_and_hashes(tmp_path: Path) -> None:
+    source_path = tmp_path / "source.txt"
+    content = b"Hello World!\n" * 1000
+    source_path.write_bytes(content)
+
+    digests = copy_with_digests(source_path, tmp_path / "dest.txt", ["sha256"], buffer_size=1024)
+
+    assert (tmp_path / "dest.txt").read_bytes() == content
+    assert digests == {"sha256": hashlib.sha256(content).hexdigest()}
@@ -6,8 +6,14 @@ import pytest
 from gateway.bundle import Bundle
 from gateway.coordinator import Coordinator
 from gateway.enumerations import LogOrder
-from gateway.exceptions import ObjectDoesNotExistError, StagedObjectAlreadyExistsError
+from gateway.exceptions import (
+    ObjectDoesNotExistError,
+    ObjectFileDoesNotExistError,
+    RepositoryGatewayError,
+    StagedObjectAlreadyExistsError,
+)
 from gateway.fake_repository_gateway import FakeRepositoryGateway
+from gateway.object_diff import FileChange
 from gateway.object_file import ObjectFile
 from gateway.version_info import VersionInfo
 
@@ -229,3 +235,44 @@ def test_gateway_log_optional_ascending_order(gateway_with_committed_bundle: Fak
     log = gateway.log("A", order=LogOrder.ascending)
     assert log[0].version == 1
     assert log[1].version == 2
+
+
+def test_gateway_diffs_versions(gateway_with_committed_bundle: FakeRepositoryGateway, bundle_a_update: Bundle) -> None:
+    gateway = gateway_with_committed_bundle
+    gateway.stage_object_files("A", Bundle(root_path=Path("/"), entries=[Path("some/path")]))
+    gateway.stage_object_files("A", bundle_a_update)
+    gateway.commit_object_changes("A", Coordinator("test", "test@example.edu"), "Second version!")
+
+    diff = gateway.diff("A", 1, 2)
+
+    assert diff.added == [FileChange(Path("some/other/path"), None, None)]
+    assert diff.removed == []
+    assert diff.modified == [FileChange(Path("some/path"), None, None)]
+
+
+def test_gateway_diffs_from_empty_state_to_head(gateway_with_committed_bundle: FakeRepositoryGateway) -> None:
+    diff = gateway_with_committed_bundle.diff("A", 0)
+
+    assert diff.to_version == 1
+    assert [change.logical_path for change in diff.added] == [Path("some"), Path("some/path")]
+
+
+def test_gateway_diff_raises_for_unknown_version(gateway_with_committed_bundle: FakeRepositoryGateway) -> None:
+    with pytest.raises(RepositoryGatewayError):
+        gateway_with_committed_bundle.diff("A", 1, 2)
+
+
+def test_gateway_diff_raises_for_object_that_does_not_exist() -> None:
+    with pytest.raises(ObjectDoesNotExistError):
+        FakeRepositoryGateway().diff("Z", 0)
+
+
+def test_gateway_gets_object_file(gateway_with_committed_bundle: FakeRepositoryGateway) -> None:
+    object_file = gateway_with_committed_bundle.get_object_file("A", Path("some/path"))
+
+    assert object_file == ObjectFile(Path("some/path"), Path("some/path"))
+
+
+def test_gateway_get_object_file_raises_for_missing_file(gateway_with_committed_bundle: FakeRepositoryGateway) -> None:
+    with pytest.raises(ObjectFileDoesNotExistError):
+        gateway_with_committed_bundle.get_object_file("A", Path("some/other/path"))
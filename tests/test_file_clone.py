@@ -0,0 +1,60 @@
+import errno
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from utils.file_clone import CloneMethod, clone_file, clone_tree
+
+
+@pytest.fixture
+def source_path(tmp_path: Path) -> Path:
+    source_path = tmp_path / "source.tif"
+    source_path.write_bytes(b"\x00\x01" * 1024)
+    return source_path
+
+
+def test_clone_file_hard_links_on_same_filesystem(tmp_path: Path, source_path: Path) -> None:
+    dest_path = tmp_path / "dest.tif"
+
+    method = clone_file(source_path, dest_path, methods=(CloneMethod.HARDLINK, CloneMethod.COPY))
+
+    assert method == CloneMethod.HARDLINK
+    assert dest_path.stat().st_ino == source_path.stat().st_ino
+
+
+def test_clone_file_falls_back_when_reflinks_are_unsupported(tmp_path: Path, source_path: Path) -> None:
+    dest_path = tmp_path / "dest.tif"
+
+    with patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "Operation not supported")):
+        method = clone_file(source_path, dest_path)
+
+    assert method == CloneMethod.HARDLINK
+    assert dest_path.read_bytes() == source_path.read_bytes()
+
+
+def test_clone_file_copies_across_filesystems(tmp_path: Path, source_path: Path) -> None:
+    dest_path = tmp_path / "dest.tif"
+
+    with patch("os.link", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+        method = clone_file(source_path, dest_path, methods=(CloneMethod.HARDLINK, CloneMethod.COPY))
+
+    assert method == CloneMethod.COPY
+    assert dest_path.stat().st_ino != source_path.stat().st_ino
+    assert dest_path.read_bytes() == source_path.read_bytes()
+
+
+def test_clone_file_raises_when_source_does_not_exist(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        clone_file(tmp_path / "missing.tif", tmp_path / "dest.tif")
+
+
+def test_clone_tree_recreates_directories(tmp_path: Path, source_path: Path) -> None:
+    (tmp_path / "tree" / "data").mkdir(parents=True)
+    (tmp_path / "tree" / "data" / "page.txt").write_text("page one")
+    source_path.rename(tmp_path / "tree" / "source.tif")
+
+    clone_tree(tmp_path / "tree", tmp_path / "clone", methods=(CloneMethod.HARDLINK, CloneMethod.COPY))
+
+    assert (tmp_path / "clone" / "data" / "page.txt").read_text() == "page one"
+    assert (tmp_path / "clone" / "source.tif").stat().st_ino == (tmp_path / "tree" / "source.tif").stat().st_ino
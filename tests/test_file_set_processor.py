@@ -10,6 +10,7 @@ from dor.providers.build_file_set import (
     Input,
     build_file_set,
 )
+from utils.digest_ledger import DigestLedger, TrustPolicy
 
 
 @pytest.fixture
@@ -113,3 +114,17 @@ def test_process_basic_image_creates_source_event_metadata(file_set_identifier,
         output_path=output_path
     )
     assert event_metadata_file.exists()
+
+
+@pytest.mark.parametrize("trust_policy, records_digests", [(TrustPolicy.full, False), (TrustPolicy.sample, True)])
+def test_process_records_digests_only_when_packaging_may_trust_them(
+    file_set_identifier, output_path, trust_policy, records_digests
+):
+    assert build_file_set(
+        file_set_identifier=file_set_identifier,
+        inputs=[],
+        output_path=output_path,
+        trust_policy=trust_policy
+    )
+    sidecar_path = DigestLedger.get_sidecar_path(output_path / file_set_identifier.identifier)
+    assert sidecar_path.exists() == records_digests
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from dor.adapters.fixity_ledger import MemoryFixityLedger, SqlalchemyFixityLedger
+from dor.domain.models import FixityRecord
+from tests.database import requires_database
+
+
+@pytest.fixture
+def fixity_record() -> FixityRecord:
+    return FixityRecord(
+        identifier="00000000-0000-0000-0000-000000000001",
+        inventory_digest="abc123",
+        validated_at=datetime(2025, 6, 20, 12, 0, 0, tzinfo=UTC)
+    )
+
+
+def test_memory_fixity_ledger_adds_record(fixity_record: FixityRecord) -> None:
+    ledger = MemoryFixityLedger()
+    ledger.add(fixity_record)
+
+    assert ledger.get(fixity_record.identifier) == fixity_record
+    assert ledger.get("00000000-0000-0000-0000-000000000002") is None
+
+
+def test_memory_fixity_ledger_replaces_record(fixity_record: FixityRecord) -> None:
+    ledger = MemoryFixityLedger()
+    ledger.add(fixity_record)
+    newer_record = FixityRecord(
+        identifier=fixity_record.identifier,
+        inventory_digest="def456",
+        validated_at=fixity_record.validated_at + timedelta(days=1)
+    )
+    ledger.add(newer_record)
+
+    assert ledger.get_all() == [newer_record]
+
+
+def test_memory_fixity_ledger_gets_many_records(fixity_record: FixityRecord) -> None:
+    ledger = MemoryFixityLedger()
+    ledger.add(fixity_record)
+    failed_record = FixityRecord(
+        identifier="00000000-0000-0000-0000-000000000002",
+        inventory_digest="def456",
+        validated_at=None,
+        failed_at=fixity_record.validated_at
+    )
+    ledger.add(failed_record)
+
+    assert ledger.get_many([failed_record.identifier, "00000000-0000-0000-0000-000000000003"]) == [failed_record]
+
+
+@requires_database
+@pytest.mark.usefixtures("db_session")
+def test_sqlalchemy_fixity_ledger_adds_and_replaces_record(db_session, fixity_record: FixityRecord) -> None:
+    ledger = SqlalchemyFixityLedger(db_session)
+    with db_session.begin():
+        ledger.add(fixity_record)
+        db_session.commit()
+
+    newer_record = FixityRecord(
+        identifier=fixity_record.identifier,
+        inventory_digest="def456",
+        validated_at=fixity_record.validated_at + timedelta(days=1)
+    )
+    with db_session.begin():
+        ledger.add(newer_record)
+        db_session.commit()
+
+    assert ledger.get(fixity_record.identifier) == newer_record
+    assert ledger.get_all() == [newer_record]
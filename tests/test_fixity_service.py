@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from dor.domain.models import FixityRecord
+from dor.service_layer.fixity_service import (
+    DEFAULT_RETRY_AFTER, AuditCandidate, audit_fixity, audit_pool_fixity, find_audit_candidates,
+    select_due_candidates
+)
+from dor.service_layer.unit_of_work import UnitOfWork
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.fake_repository_gateway import FakeRepositoryGateway
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.validate import ParallelFixityValidator, RocflOCFLFixityValidator, parse_validation_output
+
+
+@pytest.fixture
+def now() -> datetime:
+    return datetime(2025, 6, 20, 12, 0, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def candidates() -> list[AuditCandidate]:
+    return [
+        AuditCandidate(identifier=f"object-{i}", object_path=Path(f"object-{i}"), inventory_digest=f"digest-{i}")
+        for i in range(1, 6)
+    ]
+
+
+def test_fixity_service_finds_candidates_with_inventory_digests() -> None:
+    candidates = list(find_audit_candidates(Path("tests/fixtures/test_rocfl_repo")))
+
+    assert len(candidates) == 5
+    assert AuditCandidate(
+        identifier="ark:123/abc",
+        object_path=Path("object-2"),
+        inventory_digest=Path("tests/fixtures/test_rocfl_repo/object-2/inventory.json.sha512").read_text().split()[0]
+    ) in candidates
+
+
+def test_fixity_service_selects_unvalidated_changed_and_stale_objects(
+    candidates: list[AuditCandidate], now: datetime
+) -> None:
+    records = {
+        "object-1": FixityRecord("object-1", "digest-1", now - timedelta(days=1)),
+        "object-2": FixityRecord("object-2", "old-digest", now - timedelta(days=1)),
+        "object-3": FixityRecord("object-3", "digest-3", now - timedelta(days=400)),
+        "object-4": FixityRecord("object-4", "digest-4", now - timedelta(days=10)),
+    }
+
+    due = select_due_candidates(candidates, records, now, max_age=timedelta(days=365))
+
+    assert [candidate.identifier for candidate in due] == ["object-2", "object-5", "object-3"]
+
+
+def test_fixity_service_spreads_stale_objects_over_window(
+    candidates: list[AuditCandidate], now: datetime
+) -> None:
+    records = {
+        candidate.identifier: FixityRecord(
+            candidate.identifier, candidate.inventory_digest, now - timedelta(days=400 + i)
+        )
+        for i, candidate in enumerate(candidates)
+    }
+    records["object-1"] = FixityRecord("object-1", "old-digest", now)
+
+    due = select_due_candidates(candidates, records, now, max_age=timedelta(days=365), window_runs=2)
+
+    assert [candidate.identifier for candidate in due] == ["object-1", "object-5", "object-4", "object-3"]
+
+
+def test_fixity_service_records_validations_and_retries_failures_on_schedule(now: datetime) -> None:
+    rocflvalidator = MagicMock(spec=RocflOCFLFixityValidator)
+    rocflvalidator.repository_path = Path("tests/fixtures/test_rocfl_repo")
+    rocflvalidator.iter_objects_by_path.side_effect = lambda paths, *args: parse_validation_output([
+        "Error: [E023]" if paths[0] == "E023_extra_file" else "Valid"
+    ])
+    uow = UnitOfWork(gateway=FakeRepositoryGateway())
+
+    results = list(audit_fixity(
+        uow, ParallelFixityValidator(rocflvalidator, workers=2), now, max_age=timedelta(days=365), page_size=2
+    ))
+
+    assert len(results) == 5
+    assert [result.identifier for result in results if not result.is_valid] == ["info:bad05"]
+    records = {record.identifier: record for record in uow.fixity_ledger.get_all()}
+    assert len(records) == 5
+    assert records["info:bad05"].validated_at is None
+    assert records["info:bad05"].failed_at is not None
+    assert all(record.failed_at is None for identifier, record in records.items() if identifier != "info:bad05")
+
+    rocflvalidator.iter_objects_by_path.reset_mock()
+    checked_at = records["info:bad05"].failed_at
+    assert list(audit_fixity(
+        uow, ParallelFixityValidator(rocflvalidator, workers=2), checked_at, max_age=timedelta(days=365)
+    )) == []
+    rocflvalidator.iter_objects_by_path.assert_not_called()
+
+    assert [result.identifier for result in audit_fixity(
+        uow, ParallelFixityValidator(rocflvalidator, workers=2), checked_at + DEFAULT_RETRY_AFTER,
+        max_age=timedelta(days=365)
+    )] == ["info:bad05"]
+    rocflvalidator.iter_objects_by_path.assert_called_once()
+
+
+def test_fixity_service_checks_changed_object_after_failure(now: datetime) -> None:
+    candidate = AuditCandidate(identifier="object-1", object_path=Path("object-1"), inventory_digest="new-digest")
+    records = {"object-1": FixityRecord("object-1", "old-digest", None, failed_at=now)}
+
+    due = select_due_candidates([candidate], records, now, max_age=timedelta(days=365))
+
+    assert due == [candidate]
+
+
+def test_fixity_service_audits_every_root_of_a_pool(tmp_path: Path, now: datetime) -> None:
+    validators = []
+    for id in ["deposit_one", "deposit_two"]:
+        gateway = NativeOcflRepositoryGateway(storage_path=tmp_path / id)
+        gateway.storage_path.mkdir()
+        gateway.create_repository()
+        gateway.create_staged_object(id)
+        gateway.stage_object_files(id, Bundle(
+            root_path=Path("tests/fixtures/test_deposit/deposit_one"), entries=[Path("A.txt")]
+        ))
+        gateway.commit_object_changes(id, Coordinator("test", "test@example.edu"), "First version!")
+        rocflvalidator = MagicMock(spec=RocflOCFLFixityValidator)
+        rocflvalidator.repository_path = gateway.storage_path
+        rocflvalidator.iter_objects_by_path.side_effect = lambda paths, *args: parse_validation_output(["Valid"])
+        validators.append(ParallelFixityValidator(rocflvalidator))
+    uow = UnitOfWork(gateway=FakeRepositoryGateway())
+
+    results = list(audit_pool_fixity(uow, validators, now, max_age=timedelta(days=365)))
+
+    assert sorted(result.object_path for result in results) == [
+        tmp_path / "deposit_one" / "deposit_one", tmp_path / "deposit_two" / "deposit_two"
+    ]
+    assert sorted(record.identifier for record in uow.fixity_ledger.get_all()) == ["deposit_one", "deposit_two"]
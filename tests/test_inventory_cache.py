@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from gateway.inventory_cache import InventoryCache, InventoryCacheStats
+
+
+@pytest.fixture
+def object_path(tmp_path: Path) -> Path:
+    path = tmp_path / "object-2"
+    shutil.copytree(Path("tests/fixtures/test_rocfl_repo/object-2"), path)
+    return path
+
+
+def rewrite_inventory(object_path: Path, message: str) -> None:
+    inventory_path = object_path / "inventory.json"
+    inventory_data = json.loads(inventory_path.read_text())
+    inventory_data["versions"]["v1"]["message"] = message
+    stat_result = os.stat(inventory_path)
+    inventory_path.write_text(json.dumps(inventory_data))
+    # Keep the mtime so only the sidecar reveals the change
+    os.utime(inventory_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    (object_path / "inventory.json.sha512").write_text(f"{message} inventory.json")
+
+
+def test_cache_counts_misses_and_hits(object_path: Path) -> None:
+    cache = InventoryCache()
+
+    first = cache.get(object_path)
+    second = cache.get(object_path)
+
+    assert first is second
+    assert cache.stats == InventoryCacheStats(hits=1, misses=1, size=1)
+
+
+def test_cache_returns_none_for_missing_inventory(tmp_path: Path) -> None:
+    cache = InventoryCache()
+
+    assert cache.get(tmp_path / "object-zero") is None
+    assert cache.stats == InventoryCacheStats(hits=0, misses=0, size=0)
+
+
+def test_cache_rereads_inventory_when_sidecar_changes(object_path: Path) -> None:
+    cache = InventoryCache()
+    cache.get(object_path)
+
+    rewrite_inventory(object_path, "Changed")
+    inventory = cache.get(object_path)
+
+    assert inventory.get_version(1).message == "Changed"
+    assert cache.stats == InventoryCacheStats(hits=0, misses=2, size=1)
+
+
+def test_cache_rereads_inventory_once_invalidated(object_path: Path) -> None:
+    cache = InventoryCache()
+    first = cache.get(object_path)
+
+    cache.invalidate(object_path)
+    second = cache.get(object_path)
+
+    assert first is not second
+    assert cache.stats.misses == 2
+
+
+def test_cache_evicts_least_recently_used_inventory(tmp_path: Path) -> None:
+    paths = []
+    for name in ["object-1", "object-2", "W004_uses_sha256"]:
+        path = tmp_path / name
+        shutil.copytree(Path("tests/fixtures/test_rocfl_repo") / name, path)
+        paths.append(path)
+    cache = InventoryCache(max_size=2)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert list(cache.entries.keys()) == [paths[0], paths[2]]
@@ -0,0 +1,116 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.exceptions import ObjectLockTimeoutError, RepositoryGatewayError
+from gateway.layout_migration import LayoutMigration
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.object_lock import ObjectLocker
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+from gateway.storage_layout import StorageLayout
+from gateway.storage_root import read_storage_layout
+
+OBJECT_IDS = ["deposit_one", "deposit_two"]
+
+
+@pytest.fixture
+def storage_path(tmp_path: Path) -> Path:
+    storage_path = tmp_path / "repo"
+    storage_path.mkdir()
+    gateway = NativeOcflRepositoryGateway(storage_path=storage_path)
+    gateway.create_repository()
+    bundle = Bundle(root_path=Path("tests/fixtures/test_deposit/deposit_one"), entries=[Path("A.txt")])
+    for id in OBJECT_IDS:
+        gateway.create_staged_object(id)
+        gateway.stage_object_files(id, bundle)
+        gateway.commit_object_changes(id, Coordinator("test", "test@example.edu"), "First version!")
+    return storage_path
+
+
+def test_migration_moves_objects_into_target_layout(storage_path: Path) -> None:
+    migration = LayoutMigration(storage_path, StorageLayout.FLAT_DIRECT, StorageLayout.HASHED_N_TUPLE, workers=2)
+    migration.start()
+
+    migrated_objects = list(migration.run())
+    migration.finish()
+
+    assert sorted(migrated_object.id for migrated_object in migrated_objects) == OBJECT_IDS
+    for id in OBJECT_IDS:
+        assert not (storage_path / id).exists()
+        assert (storage_path / StorageLayout.HASHED_N_TUPLE.get_object_path(id) / "inventory.json").is_file()
+    assert read_storage_layout(storage_path) == StorageLayout.HASHED_N_TUPLE
+    assert not (storage_path / "extensions" / StorageLayout.FLAT_DIRECT.value).exists()
+    layout_config_path = storage_path / "extensions" / StorageLayout.HASHED_N_TUPLE.value / "config.json"
+    assert json.loads(layout_config_path.read_text())["tupleSize"] == 3
+    assert not (storage_path / "extensions" / LayoutMigration.extension_name).exists()
+
+
+def test_migration_resumes_from_checkpoint(storage_path: Path) -> None:
+    migration = LayoutMigration(storage_path, StorageLayout.FLAT_DIRECT, StorageLayout.HASHED_N_TUPLE, workers=1)
+    migration.start()
+    first_object = migration._migrate_object(Path("deposit_one"))
+
+    resumed_migration = LayoutMigration.read_in_progress(storage_path)
+    assert resumed_migration is not None
+    assert resumed_migration.source_layout == StorageLayout.FLAT_DIRECT
+    assert resumed_migration.target_layout == StorageLayout.HASHED_N_TUPLE
+    assert resumed_migration.read_checkpoint() == set([first_object.source_path])
+
+    remaining_objects = list(resumed_migration.run())
+
+    assert [migrated_object.id for migrated_object in remaining_objects] == ["deposit_two"]
+
+
+def test_migration_waits_for_object_lock(storage_path: Path) -> None:
+    gateway = NativeOcflRepositoryGateway(
+        storage_path=storage_path, object_locker=ObjectLocker(storage_path, timeout=0.1, poll_interval=0.01)
+    )
+    migration = LayoutMigration(
+        storage_path, StorageLayout.FLAT_DIRECT, StorageLayout.HASHED_N_TUPLE, workers=1, gateway=gateway
+    )
+    migration.start()
+
+    with gateway.lock_object("deposit_one"), ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ObjectLockTimeoutError):
+            executor.submit(migration._migrate_object, Path("deposit_one")).result()
+
+    assert (storage_path / "deposit_one" / "inventory.json").is_file()
+    assert migration.read_checkpoint() == set()
+
+
+def test_gateway_finds_objects_in_either_layout_during_migration(storage_path: Path) -> None:
+    migration = LayoutMigration(storage_path, StorageLayout.FLAT_DIRECT, StorageLayout.HASHED_N_TUPLE, workers=1)
+    migration.start()
+    migration._migrate_object(Path("deposit_one"))
+    gateway = NativeOcflRepositoryGateway(
+        storage_path=storage_path,
+        storage_layout=StorageLayout.HASHED_N_TUPLE,
+        previous_storage_layout=StorageLayout.FLAT_DIRECT
+    )
+
+    for id in OBJECT_IDS:
+        assert gateway.has_object(id)
+        assert [object_file.logical_path for object_file in gateway.get_object_files(id)] == [Path("A.txt")]
+
+    gateway.stage_object_files("deposit_two", Bundle(
+        root_path=Path("tests/fixtures/test_deposit/deposit_one"), entries=[Path("B/B.txt")]
+    ))
+    gateway.commit_object_changes("deposit_two", Coordinator("test", "test@example.edu"), "Second version!")
+    assert (storage_path / "deposit_two" / "v2").is_dir()
+
+
+def test_rocfl_gateway_refuses_writes_during_migration(storage_path: Path) -> None:
+    LayoutMigration(storage_path, StorageLayout.FLAT_DIRECT, StorageLayout.HASHED_N_TUPLE).start()
+    gateway = OcflRepositoryGateway(storage_path=storage_path)
+
+    with pytest.raises(RepositoryGatewayError):
+        gateway.create_staged_object("deposit_three")
+    with pytest.raises(RepositoryGatewayError):
+        gateway.commit_object_changes("deposit_one", Coordinator("test", "test@example.edu"), "Second version!")
+    with pytest.raises(RepositoryGatewayError):
+        gateway.purge_object("deposit_one")
+    assert gateway.has_object("deposit_one")
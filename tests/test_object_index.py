@@ -0,0 +1,115 @@
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gateway.object_index import ObjectIndex, ObjectIndexEntry
+from gateway.ocfl_repository_gateway import OcflRepositoryGateway
+
+
+@pytest.fixture
+def storage_path(tmp_path: Path) -> Path:
+    storage_path = tmp_path / "repo"
+    shutil.copytree(Path("tests/fixtures/test_rocfl_repo"), storage_path)
+    return storage_path
+
+
+def test_object_index_reads_entry_from_object(storage_path: Path) -> None:
+    entry = ObjectIndex(storage_path).read_entry(Path("object-1"))
+
+    assert entry is not None
+    assert entry.id == "ark:/12345/bcd987"
+    assert entry.path == Path("object-1")
+    assert entry.head == "v3"
+    assert entry.inventory_digest == (storage_path / "object-1" / "inventory.json.sha512").read_text().split()[0]
+    assert entry.total_size == sum(
+        path.stat().st_size for path in (storage_path / "object-1").glob("v*/content/**/*") if path.is_file()
+    )
+
+
+def test_object_index_puts_gets_and_removes_entries(storage_path: Path) -> None:
+    object_index = ObjectIndex(storage_path)
+    object_index.create()
+    entry = ObjectIndexEntry(id="deposit_one", path=Path("deposit_one"), head="v1", inventory_digest="abc", total_size=5)
+
+    object_index.put(entry)
+    assert object_index.has("deposit_one")
+    assert object_index.get("deposit_one") == entry
+
+    object_index.put(ObjectIndexEntry(id="deposit_one", path=Path("deposit_one"), head="v2", inventory_digest="def", total_size=9))
+    assert object_index.get("deposit_one").head == "v2"
+
+    object_index.remove("deposit_one")
+    assert not object_index.has("deposit_one")
+    assert object_index.get("deposit_one") is None
+
+
+def test_object_index_rebuilds_from_storage_root(storage_path: Path) -> None:
+    object_index = ObjectIndex(storage_path)
+    object_index.create()
+    object_index.put(ObjectIndexEntry(id="purged", path=Path("purged"), head="v1", inventory_digest=None, total_size=0))
+
+    total = object_index.rebuild(workers=2)
+
+    entries = object_index.get_entries()
+    assert total == 5
+    assert len(entries) == 5
+    assert not object_index.has("purged")
+    assert object_index.get("ark:/12345/bcd987").path == Path("object-1")
+
+
+def test_object_index_rebuild_reads_objects_written_during_the_scan(storage_path: Path) -> None:
+    object_index = ObjectIndex(storage_path)
+    object_index.rebuild()
+    read_entries = object_index._read_entries
+
+    def read_entries_then_purge(object_paths, workers):
+        yield from read_entries(object_paths, workers)
+        shutil.rmtree(storage_path / "object-1")
+        object_index.remove("ark:/12345/bcd987")
+
+    with patch.object(object_index, "_read_entries", read_entries_then_purge):
+        total = object_index.rebuild()
+
+    assert total == 4
+    assert not object_index.has("ark:/12345/bcd987")
+
+
+def test_object_index_rebuild_keeps_a_bounded_number_of_reads_pending(storage_path: Path) -> None:
+    object_index = ObjectIndex(storage_path)
+    consumed = []
+
+    def object_paths():
+        for number in range(100):
+            consumed.append(number)
+            yield Path("object-1")
+
+    entries = object_index._read_entries(object_paths(), workers=1)
+    next(entries)
+
+    assert len(consumed) <= 3
+    assert len([next(entries)] + list(entries)) == 99
+
+
+def test_gateway_uses_object_index_for_existence_once_built(storage_path: Path) -> None:
+    object_index = ObjectIndex(storage_path)
+    gateway = OcflRepositoryGateway(storage_path=storage_path, object_index=object_index)
+    assert gateway.has_object("object-1")
+
+    object_index.create()
+    assert not gateway.has_object("object-1")
+
+    object_index.put(ObjectIndexEntry(id="object-1", path=Path("object-1"), head="v3", inventory_digest=None, total_size=0))
+    assert gateway.has_object("object-1")
+
+
+def test_gateway_lists_object_ids(storage_path: Path) -> None:
+    object_index = ObjectIndex(storage_path)
+    gateway = OcflRepositoryGateway(storage_path=storage_path, object_index=object_index)
+    scanned_ids = gateway.get_object_ids()
+
+    object_index.rebuild()
+
+    assert "ark:/12345/bcd987" in scanned_ids
+    assert gateway.get_object_ids() == scanned_ids
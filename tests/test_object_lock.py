@@ -0,0 +1,76 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from gateway.exceptions import ObjectLockTimeoutError
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.object_lock import ObjectLocker
+
+
+def hold_lock(locker: ObjectLocker, id: str, acquired: threading.Event, release: threading.Event) -> None:
+    with locker.lock(id):
+        acquired.set()
+        release.wait(5)
+
+
+@pytest.fixture
+def held_lock(tmp_path: Path):
+    locker = ObjectLocker(tmp_path)
+    acquired = threading.Event()
+    release = threading.Event()
+    thread = threading.Thread(target=hold_lock, args=(locker, "deposit_one", acquired, release))
+    thread.start()
+    acquired.wait(5)
+    yield release
+    release.set()
+    thread.join()
+
+
+def test_locker_is_reentrant_within_a_thread(tmp_path: Path) -> None:
+    locker = ObjectLocker(tmp_path, timeout=0)
+
+    with locker.lock("deposit_one"):
+        with locker.lock("deposit_one"):
+            pass
+
+    assert locker.stats.acquisitions == 1
+
+
+def test_locker_times_out_while_another_worker_holds_the_lock(tmp_path: Path, held_lock: threading.Event) -> None:
+    locker = ObjectLocker(tmp_path, timeout=0.1, poll_interval=0.01)
+
+    with pytest.raises(ObjectLockTimeoutError):
+        with locker.lock("deposit_one"):
+            pass
+    with locker.lock("deposit_two"):
+        pass
+
+    assert locker.stats.timeouts == 1
+    assert locker.stats.acquisitions == 1
+
+
+def test_locker_records_wait_time(tmp_path: Path, held_lock: threading.Event) -> None:
+    locker = ObjectLocker(tmp_path, timeout=5, poll_interval=0.01)
+    threading.Timer(0.2, held_lock.set).start()
+
+    with locker.lock("deposit_one"):
+        pass
+
+    assert locker.stats.acquisitions == 1
+    assert locker.stats.max_wait_seconds >= 0.15
+    assert locker.stats.total_wait_seconds == locker.stats.max_wait_seconds
+
+
+def test_gateway_write_waits_for_object_lock(tmp_path: Path, held_lock: threading.Event) -> None:
+    gateway = NativeOcflRepositoryGateway(
+        storage_path=tmp_path, object_locker=ObjectLocker(tmp_path, timeout=0.1, poll_interval=0.01)
+    )
+    gateway.create_repository()
+
+    with pytest.raises(ObjectLockTimeoutError):
+        gateway.create_staged_object("deposit_one")
+    gateway.create_staged_object("deposit_two")
+
+    with gateway.lock_object("deposit_two"):
+        gateway.purge_object("deposit_two")
@@ -0,0 +1,83 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from gateway.exceptions import RepositoryGatewayError
+from gateway.ocfl_inventory import InventoryVersion, OcflInventory
+from gateway.storage_layout import StorageLayout
+
+
+@pytest.fixture
+def object_path() -> Path:
+    return Path("tests/fixtures/test_rocfl_repo/object-1")
+
+
+def test_inventory_reads_object_inventory(object_path: Path) -> None:
+    inventory = OcflInventory.read(object_path)
+
+    assert inventory is not None
+    assert inventory.id == "ark:/12345/bcd987"
+    assert inventory.digest_algorithm == "sha512"
+    assert inventory.head == "v3"
+    assert inventory.head_version_number == 3
+
+
+def test_inventory_returns_none_when_inventory_does_not_exist() -> None:
+    assert OcflInventory.read(Path("tests/fixtures/test_rocfl_repo/object-zero")) is None
+
+
+def test_inventory_raises_when_inventory_is_not_valid_json(tmp_path: Path) -> None:
+    (tmp_path / "inventory.json").write_text("{")
+
+    with pytest.raises(RepositoryGatewayError):
+        OcflInventory.read(tmp_path)
+
+
+def test_inventory_lists_versions_in_order(object_path: Path) -> None:
+    inventory = OcflInventory.read(object_path)
+
+    versions = inventory.get_versions()
+    assert [version.number for version in versions] == [1, 2, 3]
+    assert versions[0] == InventoryVersion(
+        number=1,
+        created="2018-01-01T01:01:01Z",
+        message="Initial import",
+        user_name="Alice",
+        user_address="mailto:alice@example.com",
+        state=inventory.data["versions"]["v1"]["state"]
+    )
+
+
+def test_inventory_provides_head_logical_paths(object_path: Path) -> None:
+    inventory = OcflInventory.read(object_path)
+
+    logical_paths = inventory.get_logical_paths()
+    assert set(logical_paths.keys()) == set(["foo/bar.xml", "empty2.txt", "image.tiff"])
+    assert inventory.get_content_path(logical_paths["foo/bar.xml"]) == "v2/content/foo/bar.xml"
+    assert inventory.get_content_path(logical_paths["empty2.txt"]) == "v1/content/empty.txt"
+
+
+def test_inventory_provides_logical_paths_for_earlier_version(object_path: Path) -> None:
+    inventory = OcflInventory.read(object_path)
+
+    logical_paths = inventory.get_logical_paths(2)
+    assert set(logical_paths.keys()) == set(["foo/bar.xml", "empty.txt", "empty2.txt"])
+
+
+def test_inventory_raises_for_unknown_version(object_path: Path) -> None:
+    inventory = OcflInventory.read(object_path)
+
+    with pytest.raises(RepositoryGatewayError):
+        inventory.get_version(4)
+
+
+def test_flat_direct_layout_uses_identifier_as_object_path() -> None:
+    assert StorageLayout.FLAT_DIRECT.get_object_path("deposit_one") == Path("deposit_one")
+
+
+def test_hashed_n_tuple_layout_uses_digest_of_identifier() -> None:
+    digest = hashlib.sha256(b"deposit_one").hexdigest()
+    object_path = StorageLayout.HASHED_N_TUPLE.get_object_path("deposit_one")
+
+    assert object_path == Path(digest[0:3], digest[3:6], digest[6:9], digest)
@@ -2,26 +2,34 @@ from datetime import datetime, timezone
 import hashlib
 import json
 from pathlib import Path
+import shutil
 from typing import Any
 from unittest import TestCase
+from unittest.mock import patch
 
 import pytest
 
 from dor.providers.file_system_file_provider import FilesystemFileProvider
 from gateway.bundle import Bundle
 from gateway.coordinator import Coordinator
-from gateway.enumerations import LogOrder
+from gateway.enumerations import LogOrder, StagingMode
 from gateway.exceptions import (
     NoStagedChangesError,
     ObjectDoesNotExistError,
+    ObjectFileDoesNotExistError,
+    RepositoryGatewayError,
     StagedObjectAlreadyExistsError,
 )
+from gateway.object_diff import FileChange
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
 from gateway.object_file import ObjectFile
 from gateway.ocfl_repository_gateway import OcflRepositoryGateway, StorageLayout
+from gateway.staging_summary import StagingSummary
 from gateway.version_info import VersionInfo
 
 
 class OcflRepositoryGatewayTest(TestCase):
+    gateway_class: type[OcflRepositoryGateway] = OcflRepositoryGateway
 
     def setUp(self):
         test_deposit_path = Path("tests/fixtures/test_deposit")
@@ -70,13 +78,13 @@ class OcflRepositoryGatewayTest(TestCase):
         return Path().joinpath(*n_tuple, digest)
 
     def test_gateway_creates_repository(self):
-        OcflRepositoryGateway(self.pres_storage).create_repository()
+        self.gateway_class(self.pres_storage).create_repository()
 
         namaste_path = self.pres_storage / "0=ocfl_1.1"
         self.assertTrue(namaste_path.exists())
 
     def test_gateway_creates_staged_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
 
@@ -97,7 +105,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertListEqual([], logical_paths)
 
     def test_gateway_raises_when_creating_staged_object_that_already_exists(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
 
@@ -105,7 +113,7 @@ class OcflRepositoryGatewayTest(TestCase):
             gateway.create_staged_object("deposit_one")
 
     def test_gateway_stages_changes(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -129,13 +137,13 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertSetEqual(set(["A.txt", "B/B.txt", "C/D/D.txt"]), set(logical_paths))
 
     def test_gateway_raises_when_staging_changes_for_object_that_does_not_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         with self.assertRaises(ObjectDoesNotExistError):
             gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
 
     def test_gateway_commits_changes(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -163,7 +171,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertEqual("mailto:test@example.edu", head_version["user"]["address"])
 
     def test_gateway_can_use_a_different_storage_layout_for_committed_object(self):
-        gateway = OcflRepositoryGateway(
+        gateway = self.gateway_class(
             storage_path=self.pres_storage, storage_layout=StorageLayout.HASHED_N_TUPLE
         )
         gateway.create_repository()
@@ -182,7 +190,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertTrue(full_object_path.exists())
 
     def test_gateway_raises_when_committing_an_object_that_is_not_staged(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
 
         with self.assertRaises(NoStagedChangesError):
@@ -193,7 +201,7 @@ class OcflRepositoryGatewayTest(TestCase):
             )
 
     def test_gateway_commits_empty_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.commit_object_changes(
@@ -214,7 +222,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertListEqual([], logical_paths)
 
     def test_gateway_purges_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -232,19 +240,19 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertFalse(full_object_path.exists())
 
     def test_gateway_does_not_raise_when_purging_object_that_does_not_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.purge_object("deposit_zero")
 
     def test_gateway_indicates_it_does_not_have_an_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         result = gateway.has_object("deposit_zero")
 
         self.assertEqual(False, result)
 
     def test_gateway_indicates_it_does_not_have_an_object_once_staged(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         result = gateway.has_object("deposit_one")
@@ -252,7 +260,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertEqual(False, result)
 
     def test_gateway_indicates_it_does_have_an_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -266,7 +274,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertEqual(True, result)
 
     def test_gateway_provides_object_files(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -301,7 +309,7 @@ class OcflRepositoryGatewayTest(TestCase):
         )
 
     def test_gateway_provides_no_object_files_when_there_are_none(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.commit_object_changes(
@@ -311,7 +319,7 @@ class OcflRepositoryGatewayTest(TestCase):
         self.assertListEqual([], object_files)
 
     def test_gateway_provides_object_files_when_only_staged_ones_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -337,7 +345,7 @@ class OcflRepositoryGatewayTest(TestCase):
         )
 
     def test_gateway_provides_object_files_when_no_staged_ones_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -364,7 +372,7 @@ class OcflRepositoryGatewayTest(TestCase):
         )
 
     def test_gateway_provides_object_files_when_versioned_and_staged_files_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -403,21 +411,21 @@ class OcflRepositoryGatewayTest(TestCase):
         )
 
     def test_gateway_raises_when_providing_files_for_object_that_does_not_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
 
         with self.assertRaises(ObjectDoesNotExistError):
             gateway.get_object_files("deposit_zero")
 
     def test_gateway_log_raises_for_object_that_does_not_exist(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
 
         with pytest.raises(ObjectDoesNotExistError):
             gateway.log("deposit_one")
 
     def test_gateway_log_raises_for_a_staged_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -426,7 +434,7 @@ class OcflRepositoryGatewayTest(TestCase):
             gateway.log("deposit_one")
 
     def test_gateway_log_committed_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -445,7 +453,7 @@ class OcflRepositoryGatewayTest(TestCase):
                                      date=rfc7231ish, message='Adding first version!')
 
     def test_gateway_log_committed_staged_object(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -460,7 +468,7 @@ class OcflRepositoryGatewayTest(TestCase):
         assert len(log) == 1
 
     def test_gateway_log_default_descending_order(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -481,7 +489,7 @@ class OcflRepositoryGatewayTest(TestCase):
         assert log[1].version == 1
 
     def test_gateway_log_optional_ascending_order(self):
-        gateway = OcflRepositoryGateway(self.pres_storage)
+        gateway = self.gateway_class(self.pres_storage)
         gateway.create_repository()
         gateway.create_staged_object("deposit_one")
         gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
@@ -500,3 +508,348 @@ class OcflRepositoryGatewayTest(TestCase):
         log = gateway.log("deposit_one", order=LogOrder.ascending)
         assert log[0].version == 1
         assert log[1].version == 2
+
+
+class NativeOcflRepositoryGatewayTest(OcflRepositoryGatewayTest):
+    gateway_class = NativeOcflRepositoryGateway
+
+    def test_gateway_stores_identical_content_once(self):
+        gateway = NativeOcflRepositoryGateway(self.pres_storage)
+        gateway.create_repository()
+        gateway.create_staged_object("deposit_one")
+        gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
+        gateway.commit_object_changes("deposit_one", Coordinator("test", "test@example.edu"), "First version!")
+
+        (self.storage_path / "copy").mkdir()
+        shutil.copy(self.deposit_one_bundle.root_path / "A.txt", self.storage_path / "copy" / "A_copy.txt")
+        gateway.stage_object_files(
+            "deposit_one", Bundle(root_path=self.storage_path / "copy", entries=[Path("A_copy.txt")])
+        )
+        gateway.commit_object_changes("deposit_one", Coordinator("test", "test@example.edu"), "Second version!")
+
+        object_files = {str(file.logical_path): file.literal_path for file in gateway.get_object_files("deposit_one")}
+        self.assertEqual(object_files["A.txt"], object_files["A_copy.txt"])
+        self.assertFalse((self.pres_storage / "deposit_one" / "v2" / "content").exists())
+
+    def test_gateway_writes_inventory_sidecars(self):
+        gateway = NativeOcflRepositoryGateway(self.pres_storage)
+        gateway.create_repository()
+        gateway.create_staged_object("deposit_one")
+        gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
+        gateway.commit_object_changes("deposit_one", Coordinator("test", "test@example.edu"), "First version!")
+
+        object_path = self.pres_storage / "deposit_one"
+        for inventory_path in [object_path, object_path / "v1"]:
+            inventory_bytes = (inventory_path / "inventory.json").read_bytes()
+            sidecar = (inventory_path / "inventory.json.sha512").read_text().split()
+            self.assertListEqual([hashlib.sha512(inventory_bytes).hexdigest(), "inventory.json"], sidecar)
+        self.assertTrue((object_path / "0=ocfl_object_1.1").is_file())
+        self.assertListEqual([], list((self.pres_storage / "extensions" / "rocfl-staging").rglob("*.json")))
+
+    def test_gateway_replaces_restaged_content_in_staged_version(self):
+        gateway = NativeOcflRepositoryGateway(self.pres_storage)
+        gateway.create_repository()
+        gateway.create_staged_object("deposit_one")
+        gateway.stage_object_files("deposit_one", self.deposit_one_bundle)
+        update_bundle = Bundle(root_path=self.deposit_one_update_bundle.root_path, entries=[Path("B/B.txt")])
+        gateway.stage_object_files("deposit_one", update_bundle)
+
+        staged_object_path = self.extensions_path / self.get_hashed_n_tuple_object_path("deposit_one")
+        inventory_data = self.read_inventory(staged_object_path / "inventory.json")
+        self.assertEqual(3, len(inventory_data["manifest"]))
+        self.assertEqual(
+            (update_bundle.root_path / "B" / "B.txt").read_text(),
+            (staged_object_path / "v1" / "content" / "B" / "B.txt").read_text()
+        )
+
+
+    def test_gateway_stages_files_using_bundle_digests(self):
+        gateway = NativeOcflRepositoryGateway(self.pres_storage)
+        gateway.create_repository()
+        gateway.create_staged_object("deposit_one")
+        bundle = Bundle(
+            root_path=self.deposit_one_bundle.root_path,
+            entries=[Path("A.txt")],
+            digests={Path("A.txt"): {"sha512": "a" * 128}}
+        )
+
+        with patch("gateway.ocfl_repository_gateway.compute_digest") as compute_digest:
+            gateway.stage_object_files("deposit_one", bundle)
+
+        compute_digest.assert_not_called()
+        staged_object_path = self.extensions_path / self.get_hashed_n_tuple_object_path("deposit_one")
+        inventory_data = self.read_inventory(staged_object_path / "inventory.json")
+        self.assertListEqual(["a" * 128], list(inventory_data["manifest"]))
+
+
+class OcflRepositoryGatewayInventoryTest(TestCase):
+
+    def setUp(self):
+        self.storage_path = Path("tests/output/test_ocfl_repository_gateway_inventory")
+        self.file_provider = FilesystemFileProvider()
+        if self.storage_path.exists():
+            self.file_provider.delete_dir_and_contents(self.storage_path)
+        self.file_provider.create_directories(self.storage_path)
+
+        self.object_id = "ark:123/abc"
+        object_path = StorageLayout.HASHED_N_TUPLE.get_object_path(self.object_id)
+        self.full_object_path = self.storage_path / object_path
+        shutil.copytree(Path("tests/fixtures/test_rocfl_repo/object-2"), self.full_object_path)
+        self.full_staged_object_path = (
+            self.storage_path / "extensions" / "rocfl-staging" / object_path
+        )
+
+        self.gateway = OcflRepositoryGateway(
+            storage_path=self.storage_path, storage_layout=StorageLayout.HASHED_N_TUPLE
+        )
+
+        return super().setUp()
+
+    def stage_b_file(self):
+        inventory_data = OcflRepositoryGatewayTest.read_inventory(self.full_object_path / "inventory.json")
+        inventory_data["head"] = "v2"
+        inventory_data["manifest"]["abc123"] = ["v2/content/b_file.txt"]
+        state = dict(inventory_data["versions"]["v1"]["state"])
+        state["abc123"] = ["b_file.txt"]
+        inventory_data["versions"]["v2"] = {"created": "2019-02-01T02:03:04Z", "state": state}
+
+        self.file_provider.create_directories(self.full_staged_object_path / "v2" / "content")
+        (self.full_staged_object_path / "v2" / "content" / "b_file.txt").write_text("b")
+        (self.full_staged_object_path / "inventory.json").write_text(json.dumps(inventory_data))
+
+    def test_gateway_reads_object_existence_from_inventory(self):
+        self.assertTrue(self.gateway.has_object(self.object_id))
+        self.assertFalse(self.gateway.has_object("ark:123/zero"))
+
+    def test_gateway_reads_object_files_from_inventory(self):
+        object_files = self.gateway.get_object_files(self.object_id)
+
+        self.assertListEqual(
+            [ObjectFile(Path("a_file.txt"), self.full_object_path.joinpath("v1", "content", "a_file.txt"))],
+            object_files
+        )
+
+    def test_gateway_reads_staged_object_files_from_staged_inventory(self):
+        self.stage_b_file()
+
+        object_files = self.gateway.get_object_files(self.object_id, include_staged=True)
+
+        self.assertListEqual(
+            [
+                ObjectFile(Path("a_file.txt"), self.full_object_path.joinpath("v1", "content", "a_file.txt")),
+                ObjectFile(Path("b_file.txt"), self.full_staged_object_path.joinpath("v2", "content", "b_file.txt"))
+            ],
+            object_files
+        )
+        self.assertEqual(1, len(self.gateway.get_object_files(self.object_id)))
+
+    def test_gateway_reads_log_from_inventory(self):
+        self.stage_b_file()
+
+        log = self.gateway.log(self.object_id)
+
+        date = datetime(2019, 1, 1, 2, 3, 4, tzinfo=timezone.utc).astimezone()
+        self.assertListEqual(
+            [
+                VersionInfo(
+                    version=1,
+                    author="A Person <mailto:a_person@example.org>",
+                    date=date.strftime("%a, %d %b %Y %H:%M:%S %z"),
+                    message="An version with one file"
+                )
+            ],
+            log
+        )
+
+
+    def test_gateway_reuses_cached_inventories(self):
+        self.gateway.get_object_files(self.object_id)
+        self.gateway.log(self.object_id)
+
+        self.assertEqual(1, self.gateway.inventory_cache.stats.hits)
+        self.assertEqual(1, self.gateway.inventory_cache.stats.misses)
+
+
+class OcflRepositoryGatewayStagingTest(TestCase):
+
+    def setUp(self):
+        self.storage_path = Path("tests/output/test_ocfl_repository_gateway_staging")
+        self.file_provider = FilesystemFileProvider()
+        if self.storage_path.exists():
+            self.file_provider.delete_dir_and_contents(self.storage_path)
+        self.file_provider.create_directories(self.storage_path)
+
+        self.gateway = OcflRepositoryGateway(self.storage_path)
+        self.mock_run = patch("subprocess.run").start()
+        patch.object(self.gateway, "has_object", return_value=True).start()
+
+        return super().setUp()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def make_bundle(self, entries: list[Path]) -> Bundle:
+        root_path = self.storage_path / "deposit"
+        for entry in entries:
+            (root_path / entry).parent.mkdir(parents=True, exist_ok=True)
+            (root_path / entry).write_text(str(entry))
+        return Bundle(root_path=root_path, entries=entries)
+
+    def get_copy_args(self) -> list[list[str | Path]]:
+        return [call.args[0][5:] for call in self.mock_run.call_args_list]
+
+    def test_gateway_stages_files_sharing_a_directory_in_one_invocation(self):
+        bundle = self.make_bundle(
+            [Path("A.txt"), Path("B/B1.txt"), Path("B/B2.txt"), Path("C/D/D.txt"), Path("E.txt")]
+        )
+        root_path = bundle.root_path
+
+        summary = self.gateway.stage_object_files("deposit_one", bundle)
+
+        self.assertListEqual(
+            [
+                ["deposit_one", root_path / "A.txt", root_path / "E.txt", "--", "/"],
+                ["deposit_one", root_path / "B/B1.txt", root_path / "B/B2.txt", "--", "B/"],
+                ["deposit_one", root_path / "C/D/D.txt", "--", "C/D/D.txt"],
+            ],
+            self.get_copy_args()
+        )
+        self.assertEqual(StagingSummary(staged_files=5, staged_bytes=35), summary)
+
+    def test_gateway_splits_large_directories_across_invocations(self):
+        self.gateway.max_files_per_copy = 2
+        bundle = self.make_bundle([Path(f"pages/{i}.tif") for i in range(5)])
+
+        self.gateway.stage_object_files("deposit_one", bundle)
+
+        self.assertListEqual([2, 2, 1], [len(args) - 3 for args in self.get_copy_args()])
+        self.assertTrue(all(args[-1] == "pages/" for args in self.get_copy_args()))
+
+    def test_gateway_moves_clones_into_staging_in_clone_mode(self):
+        self.gateway.staging_mode = StagingMode.clone
+        bundle = self.make_bundle([Path("B/B1.txt"), Path("B/B2.txt")])
+        moved_contents = []
+        self.mock_run.side_effect = lambda args, **kwargs: moved_contents.extend(
+            Path(arg).read_text() for arg in args[5:-2]
+        )
+
+        self.gateway.stage_object_files("deposit_one", bundle)
+
+        args = self.mock_run.call_args.args[0]
+        self.assertListEqual(["rocfl", "-r", self.storage_path, "mv", "deposit_one"], args[:5])
+        self.assertListEqual(["B1.txt", "B2.txt"], [Path(arg).name for arg in args[5:-2]])
+        self.assertListEqual(["--", "B/"], args[-2:])
+        self.assertListEqual(["B/B1.txt", "B/B2.txt"], moved_contents)
+        self.assertListEqual([], list((self.storage_path / "extensions" / "dor-clone-staging").iterdir()))
+
+    def test_gateway_skips_files_unchanged_in_current_version(self):
+        object_path = self.storage_path / "ark:123"
+        shutil.copytree(Path("tests/fixtures/test_rocfl_repo/object-2"), object_path)
+        bundle = self.make_bundle([Path("a_file.txt"), Path("b_file.txt")])
+        shutil.copy(object_path / "v1" / "content" / "a_file.txt", bundle.root_path / "a_file.txt")
+
+        summary = self.gateway.stage_object_files("ark:123", bundle)
+
+        self.assertListEqual(
+            [["ark:123", bundle.root_path / "b_file.txt", "--", "b_file.txt"]],
+            self.get_copy_args()
+        )
+        a_file_size = (bundle.root_path / "a_file.txt").stat().st_size
+        self.assertEqual(
+            StagingSummary(staged_files=1, staged_bytes=10, skipped_files=1, skipped_bytes=a_file_size),
+            summary
+        )
+
+
+    def test_gateway_skips_unchanged_files_using_bundle_digests(self):
+        object_path = self.storage_path / "ark:123"
+        shutil.copytree(Path("tests/fixtures/test_rocfl_repo/object-2"), object_path)
+        bundle = self.make_bundle([Path("a_file.txt")])
+        shutil.copy(object_path / "v1" / "content" / "a_file.txt", bundle.root_path / "a_file.txt")
+        bundle.digests = {
+            Path("a_file.txt"): {"sha512": hashlib.sha512((bundle.root_path / "a_file.txt").read_bytes()).hexdigest()}
+        }
+
+        with patch("gateway.ocfl_repository_gateway.compute_digest") as compute_digest:
+            summary = self.gateway.stage_object_files("ark:123", bundle)
+
+        compute_digest.assert_not_called()
+        self.assertListEqual([], self.get_copy_args())
+        self.assertEqual(1, summary.skipped_files)
+
+
+class OcflRepositoryGatewayDiffTest(TestCase):
+
+    def setUp(self):
+        self.object_path = Path("tests/fixtures/test_rocfl_repo/object-1")
+        self.gateway = OcflRepositoryGateway(storage_path=Path("tests/fixtures/test_rocfl_repo"))
+        self.states = {
+            version_name: {
+                logical_path: digest
+                for digest, logical_paths in version["state"].items()
+                for logical_path in logical_paths
+            }
+            for version_name, version in
+            OcflRepositoryGatewayTest.read_inventory(self.object_path / "inventory.json")["versions"].items()
+        }
+        return super().setUp()
+
+    def test_gateway_diffs_versions_from_inventory_state(self):
+        v1, v2 = self.states["v1"], self.states["v2"]
+
+        diff = self.gateway.diff("object-1", 1, 2)
+
+        self.assertEqual((1, 2), (diff.from_version, diff.to_version))
+        self.assertListEqual([FileChange(Path("empty2.txt"), None, v2["empty2.txt"])], diff.added)
+        self.assertListEqual([FileChange(Path("image.tiff"), v1["image.tiff"], None)], diff.removed)
+        self.assertListEqual(
+            [FileChange(Path("foo/bar.xml"), v1["foo/bar.xml"], v2["foo/bar.xml"])], diff.modified
+        )
+
+    def test_gateway_diffs_from_empty_state_to_head(self):
+        diff = self.gateway.diff("object-1", 0)
+
+        self.assertEqual(3, diff.to_version)
+        self.assertListEqual(
+            sorted(self.states["v3"].keys()), [str(change.logical_path) for change in diff.added]
+        )
+        self.assertListEqual([], diff.removed + diff.modified)
+
+    def test_gateway_raises_when_diffing_unknown_version(self):
+        with self.assertRaises(RepositoryGatewayError):
+            self.gateway.diff("object-1", 1, 4)
+
+    def test_gateway_raises_when_diffing_object_that_does_not_exist(self):
+        with self.assertRaises(ObjectDoesNotExistError):
+            self.gateway.diff("object-zero", 1, 2)
+
+
+class OcflRepositoryGatewayObjectFileTest(TestCase):
+
+    def setUp(self):
+        self.object_path = Path("tests/fixtures/test_rocfl_repo/object-1")
+        self.gateway = OcflRepositoryGateway(storage_path=Path("tests/fixtures/test_rocfl_repo"))
+        self.inventory = OcflRepositoryGatewayTest.read_inventory(self.object_path / "inventory.json")
+        return super().setUp()
+
+    def test_gateway_resolves_logical_path_in_head_version(self):
+        digest = next(
+            digest for digest, logical_paths in self.inventory["versions"]["v3"]["state"].items()
+            if "foo/bar.xml" in logical_paths
+        )
+
+        object_file = self.gateway.get_object_file("object-1", Path("foo/bar.xml"))
+
+        self.assertEqual(
+            ObjectFile(Path("foo/bar.xml"), self.object_path / self.inventory["manifest"][digest][0], digest),
+            object_file
+        )
+
+    def test_gateway_resolves_logical_path_in_earlier_version(self):
+        object_file = self.gateway.get_object_file("object-1", Path("image.tiff"), version=1)
+
+        self.assertEqual(self.object_path / "v1/content/image.tiff", object_file.literal_path)
+
+    def test_gateway_raises_for_logical_path_not_in_version(self):
+        with self.assertRaises(ObjectFileDoesNotExistError):
+            self.gateway.get_object_file("object-1", Path("empty.txt"))
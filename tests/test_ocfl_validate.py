@@ -1,11 +1,21 @@
 import hashlib
+import io
+import json
 from pathlib import Path
 import subprocess
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 
 from dor.providers.file_system_file_provider import FilesystemFileProvider
-from gateway.validate import  FixityValidator, RocflOCFLFixityValidator
+from gateway.validate import (
+    FixityValidator,
+    ParallelFixityValidator,
+    RocflOCFLFixityValidator,
+    Severity,
+    ValidationRecord,
+    parse_validation_output,
+    write_validation_report,
+)
 
 class TestRocflOCFLFixityValidator(unittest.TestCase):
     def setUp(self):
@@ -232,14 +242,93 @@ class TestRocflOCFLFixityValidator(unittest.TestCase):
 class TestFixityValidator(unittest.TestCase):
     def test_validator_checks_object_fixity(self):
         self.mockrocflvalidator = MagicMock(spec = RocflOCFLFixityValidator)
-        self.mockrocflvalidator.validate_objects.return_value = "Object object-1 is valid"
+        self.mockrocflvalidator.iter_objects.return_value = iter(
+            parse_validation_output(["Object object-1 is valid"])
+        )
         self.fixityValidator = FixityValidator(self.mockrocflvalidator)
         result = self.fixityValidator.check_objects_fixity(object_ids=["object-1"])
         
-        self.mockrocflvalidator.validate_objects.assert_called_once_with(["object-1"])
+        self.mockrocflvalidator.iter_objects.assert_called_once_with(["object-1"])
         self.assertTrue(result.is_valid)
         self.assertEqual("Object object-1 is valid", result.message)
 
+    def test_validator_does_not_treat_mentions_of_error_as_invalid(self):
+        self.mockrocflvalidator = MagicMock(spec = RocflOCFLFixityValidator)
+        self.mockrocflvalidator.iter_objects.return_value = iter(
+            parse_validation_output(["Object error-handling-guide is valid"])
+        )
+        result = FixityValidator(self.mockrocflvalidator).check_objects_fixity(object_ids=["error-handling-guide"])
+
+        self.assertTrue(result.is_valid)
+
+
+class TestValidationRecords(unittest.TestCase):
+    def test_parser_attributes_problems_to_objects(self):
+        output = [
+            "Object ark:123/abc1 is valid\n",
+            "  Warnings:\n",
+            "    1. [W004] 'For content-addressing, OCFL Objects SHOULD use sha512.'\n",
+            "Object info:bad05 is invalid\n",
+            "  Errors:\n",
+            "    1. [E023] Object contains a file not listed in the manifest\n",
+            "\n",
+            "Total objects: 2\n",
+        ]
+
+        records = list(parse_validation_output(output))
+
+        self.assertListEqual([
+            ValidationRecord("ark:123/abc1", Severity.info, None, "Object ark:123/abc1 is valid"),
+            ValidationRecord(
+                "ark:123/abc1", Severity.warning, "W004",
+                "1. [W004] 'For content-addressing, OCFL Objects SHOULD use sha512.'"
+            ),
+            ValidationRecord("info:bad05", Severity.error, None, "Object info:bad05 is invalid"),
+            ValidationRecord(
+                "info:bad05", Severity.error, "E023", "1. [E023] Object contains a file not listed in the manifest"
+            ),
+            ValidationRecord(None, Severity.info, None, "Total objects: 2"),
+        ], records)
+
+    def test_parser_reads_uncoded_errors(self):
+        records = list(parse_validation_output(["[ERROR] Not found: Object invalid-object-1\n"]))
+
+        self.assertEqual(Severity.error, records[0].severity)
+
+    def test_rocfl_output_is_streamed_as_records(self):
+        validator = RocflOCFLFixityValidator(repository_path=Path("tests/fixtures/test_rocfl_repo"))
+        command = ["sh", "-c", "echo 'Object object-1 is valid'; echo '[ERROR] Not found: Object x' >&2; exit 1"]
+
+        records = list(validator._stream_rocfl_command(command))
+
+        self.assertListEqual(
+            [Severity.info, Severity.error], [record.severity for record in records]
+        )
+
+    def test_rocfl_failure_without_output_is_an_error(self):
+        validator = RocflOCFLFixityValidator(repository_path=Path("tests/fixtures/test_rocfl_repo"))
+
+        records = list(validator._stream_rocfl_command(["sh", "-c", "exit 2"]))
+
+        self.assertListEqual(
+            [ValidationRecord(None, Severity.error, None, "rocfl exited with status 2")], records
+        )
+
+    def test_report_writer_writes_json_lines(self):
+        report = io.StringIO()
+        records = parse_validation_output([
+            "Object info:bad05 is invalid\n", "  [E023] extra file\n", "  [W004] sha256 used\n"
+        ])
+
+        summary = write_validation_report(records, report)
+
+        lines = [json.loads(line) for line in report.getvalue().splitlines()]
+        self.assertDictEqual(
+            {"object_id": "info:bad05", "severity": "error", "code": "E023", "message": "[E023] extra file"},
+            lines[1]
+        )
+        self.assertEqual((3, 2, 1), (summary.records, summary.errors, summary.warnings))
+
 class RocflOCFLFixityValidatorIntegrationTest(unittest.TestCase):   
     def setUp(self):
         # Link to fixtures -> https://github.com/OCFL/fixtures
@@ -385,3 +474,44 @@ class RocflOCFLFixityValidatorIntegrationTest(unittest.TestCase):
             self.assertIn("Object info:bad05 is invalid", result_fixity)           
         except RuntimeError as e:
             self.fail(f"ROCFL validation failed with error: {e}")          
+
+
+class TestParallelFixityValidator(unittest.TestCase):
+    def setUp(self):
+        self.mockrocflvalidator = MagicMock(spec=RocflOCFLFixityValidator)
+        self.mockrocflvalidator.repository_path = Path("tests/fixtures/test_rocfl_repo")
+        self.mockrocflvalidator.iter_objects_by_path.side_effect = lambda paths, *args: parse_validation_output((
+            f"Object {paths[0]} is invalid\n  Error: [E023]" if paths[0] == "E023_extra_file" else f"Object {paths[0]} is valid"
+        ).splitlines())
+
+    def test_validator_validates_every_object_in_repository(self):
+        validator = ParallelFixityValidator(self.mockrocflvalidator, workers=2)
+
+        results = list(validator.validate_repository())
+
+        self.assertSetEqual(
+            set(["E023_extra_file", "W004_uses_sha256", "fixity_check_object", "object-1", "object-2"]),
+            set(str(result.object_path) for result in results)
+        )
+        invalid_paths = [str(result.object_path) for result in results if not result.is_valid]
+        self.assertListEqual(["E023_extra_file"], invalid_paths)
+
+    def test_validator_passes_flags_for_each_object(self):
+        validator = ParallelFixityValidator(self.mockrocflvalidator, workers=1)
+
+        list(validator.validate_objects_by_path([Path("object-1")], no_fixity=True, log_level="Error"))
+
+        self.mockrocflvalidator.iter_objects_by_path.assert_called_once_with(
+            ["object-1"], True, "Error", None
+        )
+
+    def test_validator_marks_object_invalid_when_rocfl_fails(self):
+        rocflvalidator = RocflOCFLFixityValidator(repository_path=Path("tests/fixtures/test_rocfl_repo"))
+        validator = ParallelFixityValidator(rocflvalidator, workers=1)
+        command = ["sh", "-c", "echo 'Object object-1 is valid'; exit 137"]
+
+        with patch.object(rocflvalidator, "_build_command", return_value=command):
+            results = list(validator.validate_objects_by_path([Path("object-1")]))
+
+        self.assertFalse(results[0].is_valid)
+        self.assertIn("rocfl exited with status 137", results[0].message)
@@ -0,0 +1,160 @@
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.exceptions import ObjectDoesNotExistError
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.pooled_repository_gateway import PlacementPolicy, PooledRepositoryGateway, PoolLookup
+from gateway.validate import ObjectValidationResult, ParallelFixityValidator, RocflOCFLFixityValidator
+
+BUNDLE = Bundle(root_path=Path("tests/fixtures/test_deposit/deposit_one"), entries=[Path("A.txt"), Path("B/B.txt")])
+COORDINATOR = Coordinator("test", "test@example.edu")
+
+
+@pytest.fixture
+def roots(tmp_path: Path) -> list[Path]:
+    roots = [tmp_path / f"volume_{index}" for index in range(3)]
+    for root in roots:
+        root.mkdir()
+    return roots
+
+
+def make_pool(roots: list[Path], **kwargs) -> PooledRepositoryGateway:
+    return PooledRepositoryGateway([NativeOcflRepositoryGateway(storage_path=root) for root in roots], **kwargs)
+
+
+def store(pool: PooledRepositoryGateway, id: str) -> None:
+    pool.create_staged_object(id)
+    pool.stage_object_files(id, BUNDLE)
+    pool.commit_object_changes(id, COORDINATOR, "First version!")
+
+
+def test_pool_spreads_objects_across_roots(roots: list[Path]) -> None:
+    pool = make_pool(roots)
+    pool.create_repository()
+
+    # Placement hashes the roots' temporary paths; with 60 objects a root is left empty about once in 10**10 runs
+    for index in range(60):
+        store(pool, f"deposit_{index}")
+
+    object_counts = [len([path for path in root.iterdir() if path.name.startswith("deposit_")]) for root in roots]
+    assert sum(object_counts) == 60
+    assert all(count > 0 for count in object_counts)
+    assert pool.has_object("deposit_5")
+    assert [object_file.logical_path for object_file in pool.get_object_files("deposit_5")] == [
+        Path("A.txt"), Path("B/B.txt")
+    ]
+
+
+def test_pool_places_objects_deterministically(roots: list[Path]) -> None:
+    first_pool = make_pool(roots)
+    second_pool = make_pool(list(reversed(roots)))
+
+    for index in range(12):
+        id = f"deposit_{index}"
+        assert first_pool._place(id).storage_path == second_pool._place(id).storage_path
+
+
+def test_pool_weights_placement_by_free_space(roots: list[Path]) -> None:
+    pool = make_pool(roots, placement_policy=PlacementPolicy.free_space)
+    free_space = {roots[0]: 1, roots[1]: 1, roots[2]: 10**12}
+
+    with patch.object(pool, "_get_weight", side_effect=lambda root: free_space[root]):
+        placed_roots = [pool._place(f"deposit_{index}").storage_path for index in range(20)]
+
+    assert placed_roots == [roots[2]] * 20
+
+
+def test_pool_finds_objects_missing_from_lookup(roots: list[Path], tmp_path: Path) -> None:
+    pool = make_pool(roots, lookup=PoolLookup(tmp_path / "lookup.sqlite3"))
+    pool.create_repository()
+    store(pool, "deposit_one")
+    root = pool.lookup.get("deposit_one")
+
+    reopened_pool = make_pool(roots, lookup=PoolLookup(tmp_path / "lookup.sqlite3"))
+    assert reopened_pool.lookup.get("deposit_one") == root
+
+    unrecorded_pool = make_pool(roots)
+    assert unrecorded_pool.has_object("deposit_one")
+    assert unrecorded_pool.lookup.get("deposit_one") == root
+
+
+def test_pool_purges_object(roots: list[Path]) -> None:
+    pool = make_pool(roots)
+    pool.create_repository()
+    store(pool, "deposit_one")
+
+    pool.purge_object("deposit_one")
+
+    assert not pool.has_object("deposit_one")
+    assert pool.lookup.get("deposit_one") is None
+    with pytest.raises(ObjectDoesNotExistError):
+        pool.log("deposit_one")
+
+
+def test_pool_reads_many_objects(roots: list[Path]) -> None:
+    pool = make_pool(roots)
+    pool.create_repository()
+    ids = [f"deposit_{index}" for index in range(6)]
+    for id in ids:
+        store(pool, id)
+
+    object_files = pool.get_many_object_files(ids)
+
+    assert list(object_files.keys()) == ids
+    assert all(len(files) == 2 for files in object_files.values())
+
+
+def test_pool_validates_every_root(roots: list[Path]) -> None:
+    pool = make_pool(roots)
+    pool.create_repository()
+    for index in range(6):
+        store(pool, f"deposit_{index}")
+
+    with patch.object(RocflOCFLFixityValidator, "iter_objects_by_path", side_effect=lambda *args: iter([])) as validate:
+        results = list(pool.validate_repositories(workers_per_root=2))
+
+    assert validate.call_count == 6
+    assert sorted(result.object_path.name for result in results) == [f"deposit_{index}" for index in range(6)]
+    assert all(result.object_path.parent in roots and result.is_valid for result in results)
+
+
+def test_pool_keeps_placement_recorded_at_first_use(roots: list[Path]) -> None:
+    pool = make_pool(roots, placement_policy=PlacementPolicy.free_space)
+    pool.create_repository()
+    free_space = {roots[0]: 1, roots[1]: 1, roots[2]: 10**12}
+
+    with patch.object(pool, "_get_weight", side_effect=lambda root: free_space[root]):
+        with pool.lock_object("deposit_one"):
+            free_space[roots[2]] = 1
+            free_space[roots[0]] = 10**12
+            store(pool, "deposit_one")
+
+    assert pool.lookup.get("deposit_one") == roots[2]
+    assert (roots[2] / "deposit_one").is_dir()
+
+
+def test_pool_stops_validating_roots_when_results_are_no_longer_read(roots: list[Path]) -> None:
+    pool = make_pool(roots)
+    finished = threading.Event()
+    finished_roots = []
+
+    def validate_repository(self, no_fixity=False):
+        try:
+            while True:
+                yield ObjectValidationResult(Path("deposit_one"), True, "")
+        finally:
+            finished_roots.append(self.rocflvalidator.repository_path)
+            if len(finished_roots) == len(roots):
+                finished.set()
+
+    with patch.object(ParallelFixityValidator, "validate_repository", validate_repository):
+        results = pool.validate_repositories()
+        next(results)
+        results.close()
+
+        assert finished.wait(timeout=5)
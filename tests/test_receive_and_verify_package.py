@@ -0,0 +1,84 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from dor.adapters.bag_adapter import BagAdapter
+from dor.domain.events import PackageNotVerified, PackageSubmitted, PackageVerified
+from dor.providers.file_system_file_provider import FilesystemFileProvider
+from dor.providers.translocator import Translocator
+from dor.service_layer.handlers.receive_and_verify_package import receive_and_verify_package
+from dor.service_layer.unit_of_work import UnitOfWork
+from gateway.fake_repository_gateway import FakeRepositoryGateway
+from utils.digest_ledger import DigestLedger, TrustPolicy
+
+PACKAGE_IDENTIFIER = "xyzzy-00000000-0000-0000-0000-000000000001-v1"
+
+
+@pytest.fixture
+def inbox_path(tmp_path: Path) -> Path:
+    shutil.copytree(Path("tests/fixtures/test_inbox") / PACKAGE_IDENTIFIER, tmp_path / "inbox" / PACKAGE_IDENTIFIER)
+    return tmp_path / "inbox"
+
+
+@pytest.fixture
+def translocator(inbox_path: Path, tmp_path: Path) -> Translocator:
+    return Translocator(
+        inbox_path=inbox_path,
+        workspaces_path=tmp_path / "workspaces",
+        minter=lambda: "some_id",
+        file_provider=FilesystemFileProvider()
+    )
+
+
+def receive(translocator: Translocator, trust_policy: TrustPolicy = TrustPolicy.full) -> UnitOfWork:
+    uow = UnitOfWork(gateway=FakeRepositoryGateway())
+    event = PackageSubmitted(package_identifier=PACKAGE_IDENTIFIER, tracking_identifier="tracking")
+    receive_and_verify_package(
+        event, uow, translocator, BagAdapter, FilesystemFileProvider(), trust_policy=trust_policy
+    )
+    return uow
+
+
+def test_receive_and_verify_package_copies_and_verifies(translocator: Translocator, tmp_path: Path) -> None:
+    uow = receive(translocator)
+
+    bag = BagAdapter.load(tmp_path / "workspaces" / "some_id", FilesystemFileProvider())
+    assert uow.events == [PackageVerified(
+        package_identifier=PACKAGE_IDENTIFIER,
+        tracking_identifier="tracking",
+        workspace_identifier=str(tmp_path / "workspaces" / "some_id"),
+        dor_info=bag.dor_info,
+    )]
+    bag.validate()
+
+
+def test_receive_and_verify_package_rejects_modified_package(
+    translocator: Translocator, inbox_path: Path, tmp_path: Path
+) -> None:
+    payload_path = next(path for path in (inbox_path / PACKAGE_IDENTIFIER / "data").rglob("*") if path.is_file())
+    payload_path.write_bytes(payload_path.read_bytes() + b"\n")
+
+    uow = receive(translocator)
+
+    assert len(uow.events) == 1
+    assert isinstance(uow.events[0], PackageNotVerified)
+    assert not (tmp_path / "workspaces" / "some_id").exists()
+
+
+def test_receive_and_verify_package_writes_workspace_ledger(translocator: Translocator, tmp_path: Path) -> None:
+    receive(translocator, trust_policy=TrustPolicy.sample)
+
+    workspace_path = tmp_path / "workspaces" / "some_id"
+    ledger = DigestLedger.read(DigestLedger.get_sidecar_path(workspace_path))
+    bag = BagAdapter.load(workspace_path, FilesystemFileProvider())
+    assert ledger.entries == bag.get_digest_ledger().entries
+    assert len(ledger.entries) > 0
+
+
+def test_receive_and_verify_package_writes_no_ledger_under_full_policy(
+    translocator: Translocator, tmp_path: Path
+) -> None:
+    receive(translocator)
+
+    assert not DigestLedger.get_sidecar_path(tmp_path / "workspaces" / "some_id").exists()
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.object_index import ObjectIndex
+from gateway.replication import ReplicationStatus, StorageRootReplicator
+
+DEPOSIT_PATH = Path("tests/fixtures/test_deposit")
+COORDINATOR = Coordinator("test", "test@example.edu")
+
+
+@pytest.fixture
+def source_gateway(tmp_path: Path) -> NativeOcflRepositoryGateway:
+    storage_path = tmp_path / "source"
+    storage_path.mkdir()
+    gateway = NativeOcflRepositoryGateway(storage_path=storage_path)
+    gateway.create_repository()
+    for id in ["deposit_one", "deposit_two"]:
+        gateway.create_staged_object(id)
+        gateway.stage_object_files(id, Bundle(root_path=DEPOSIT_PATH / "deposit_one", entries=[Path("A.txt")]))
+        gateway.commit_object_changes(id, COORDINATOR, "First version!")
+    return gateway
+
+
+def get_statuses(replicator: StorageRootReplicator) -> dict[str, ReplicationStatus]:
+    return {str(result.object_path): result.status for result in replicator.replicate()}
+
+
+def test_replicator_copies_new_objects(source_gateway: NativeOcflRepositoryGateway, tmp_path: Path) -> None:
+    replicator = StorageRootReplicator(source_gateway.storage_path, tmp_path / "mirror", workers=2)
+
+    statuses = get_statuses(replicator)
+
+    assert statuses == {"deposit_one": ReplicationStatus.created, "deposit_two": ReplicationStatus.created}
+    mirror_gateway = NativeOcflRepositoryGateway(storage_path=tmp_path / "mirror")
+    assert (tmp_path / "mirror" / "0=ocfl_1.1").is_file()
+    assert mirror_gateway.log("deposit_one") == source_gateway.log("deposit_one")
+    assert (tmp_path / "mirror" / "deposit_one" / "v1" / "content" / "A.txt").read_text() == (
+        DEPOSIT_PATH / "deposit_one" / "A.txt"
+    ).read_text()
+
+
+def test_replicator_copies_only_new_versions(source_gateway: NativeOcflRepositoryGateway, tmp_path: Path) -> None:
+    replicator = StorageRootReplicator(source_gateway.storage_path, tmp_path / "mirror")
+    get_statuses(replicator)
+    v1_content_path = tmp_path / "mirror" / "deposit_one" / "v1" / "content" / "A.txt"
+    v1_modified_ns = v1_content_path.stat().st_mtime_ns
+
+    source_gateway.stage_object_files("deposit_one", Bundle(
+        root_path=DEPOSIT_PATH / "deposit_one_update", entries=[Path("E.txt")]
+    ))
+    source_gateway.commit_object_changes("deposit_one", COORDINATOR, "Second version!")
+    results = {str(result.object_path): result for result in replicator.replicate()}
+
+    assert results["deposit_two"].status == ReplicationStatus.unchanged
+    assert results["deposit_one"].status == ReplicationStatus.updated
+    assert results["deposit_one"].copied_versions == 1
+    assert v1_content_path.stat().st_mtime_ns == v1_modified_ns
+    assert (tmp_path / "mirror" / "deposit_one" / "inventory.json").read_bytes() == (
+        source_gateway.storage_path / "deposit_one" / "inventory.json"
+    ).read_bytes()
+
+
+def test_replicator_fails_object_when_copy_does_not_verify(
+    source_gateway: NativeOcflRepositoryGateway, tmp_path: Path
+) -> None:
+    (source_gateway.storage_path / "deposit_one" / "v1" / "content" / "A.txt").write_text("Changed on disk")
+    replicator = StorageRootReplicator(source_gateway.storage_path, tmp_path / "mirror")
+
+    statuses = get_statuses(replicator)
+
+    assert statuses["deposit_one"] == ReplicationStatus.failed
+    assert not (tmp_path / "mirror" / "deposit_one" / "inventory.json").exists()
+    assert not (tmp_path / "mirror" / "deposit_one" / "v1").exists()
+
+
+def test_replicator_uses_source_object_index(source_gateway: NativeOcflRepositoryGateway, tmp_path: Path) -> None:
+    ObjectIndex(source_gateway.storage_path).rebuild()
+    replicator = StorageRootReplicator(source_gateway.storage_path, tmp_path / "mirror")
+    get_statuses(replicator)
+
+    assert get_statuses(replicator) == {}
+
+
+def test_replicator_writes_inventory_it_copied_versions_against(
+    source_gateway: NativeOcflRepositoryGateway, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    verify_version = StorageRootReplicator._verify_version
+
+    def commit_during_copy(inventory, version_path: Path, version_name: str) -> None:
+        verify_version(inventory, version_path, version_name)
+        if inventory.id == "deposit_one" and version_name == "v1":
+            source_gateway.stage_object_files("deposit_one", Bundle(
+                root_path=DEPOSIT_PATH / "deposit_one_update", entries=[Path("E.txt")]
+            ))
+            source_gateway.commit_object_changes("deposit_one", COORDINATOR, "Second version!")
+
+    monkeypatch.setattr(StorageRootReplicator, "_verify_version", staticmethod(commit_during_copy))
+    replicator = StorageRootReplicator(source_gateway.storage_path, tmp_path / "mirror", workers=1)
+    get_statuses(replicator)
+    monkeypatch.undo()
+
+    mirror_gateway = NativeOcflRepositoryGateway(storage_path=tmp_path / "mirror")
+    assert len(mirror_gateway.log("deposit_one")) == 1
+    results = {str(result.object_path): result for result in replicator.replicate()}
+    assert results["deposit_one"].status == ReplicationStatus.updated
+    assert results["deposit_one"].copied_versions == 1
+    assert mirror_gateway.log("deposit_one") == source_gateway.log("deposit_one")
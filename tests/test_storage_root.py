@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from gateway.storage_root import find_object_paths, is_object_path
+
+
+def test_storage_root_finds_object_paths() -> None:
+    object_paths = list(find_object_paths(Path("tests/fixtures/test_rocfl_repo")))
+
+    assert object_paths == [
+        Path("E023_extra_file"),
+        Path("W004_uses_sha256"),
+        Path("fixity_check_object"),
+        Path("object-1"),
+        Path("object-2"),
+    ]
+
+
+def test_storage_root_finds_nested_object_paths_and_skips_extensions(tmp_path: Path) -> None:
+    for object_path in ["abc/def/abcdef", "extensions/rocfl-staging/abc/abcdef"]:
+        (tmp_path / object_path / "v1" / "content").mkdir(parents=True)
+        (tmp_path / object_path / "0=ocfl_object_1.1").write_text("ocfl_object_1.1\n")
+
+    assert list(find_object_paths(tmp_path)) == [Path("abc/def/abcdef")]
+
+
+def test_storage_root_recognizes_object_path() -> None:
+    assert is_object_path(Path("tests/fixtures/test_rocfl_repo/object-1"))
+    assert not is_object_path(Path("tests/fixtures/test_rocfl_repo"))
+    assert not is_object_path(Path("tests/fixtures/test_rocfl_repo/object-zero"))
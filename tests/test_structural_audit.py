@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+
+from gateway.bundle import Bundle
+from gateway.coordinator import Coordinator
+from gateway.native_ocfl_repository_gateway import NativeOcflRepositoryGateway
+from gateway.object_index import ObjectIndex
+from gateway.structural_audit import StructuralAuditor
+
+DEPOSIT_PATH = Path("tests/fixtures/test_deposit")
+COORDINATOR = Coordinator("test", "test@example.edu")
+
+
+@pytest.fixture
+def gateway(tmp_path: Path) -> NativeOcflRepositoryGateway:
+    gateway = NativeOcflRepositoryGateway(storage_path=tmp_path, object_index=ObjectIndex(tmp_path))
+    gateway.create_repository()
+    for id in ["deposit_one", "deposit_two"]:
+        gateway.create_staged_object(id)
+        gateway.stage_object_files(id, Bundle(root_path=DEPOSIT_PATH / "deposit_one", entries=[Path("A.txt")]))
+        gateway.commit_object_changes(id, COORDINATOR, "First version!")
+    return gateway
+
+
+def get_codes(auditor: StructuralAuditor) -> dict[str, list[str | None]]:
+    return {
+        str(result.object_path): [record.code for record in result.records]
+        for result in auditor.audit_repository()
+    }
+
+
+def test_auditor_passes_intact_objects(gateway: NativeOcflRepositoryGateway) -> None:
+    results = list(StructuralAuditor(gateway.storage_path, workers=2).audit_repository())
+
+    assert len(results) == 2
+    assert all(result.is_valid for result in results)
+
+
+def test_auditor_finds_inventory_not_matching_sidecar(gateway: NativeOcflRepositoryGateway) -> None:
+    inventory_path = gateway.storage_path / "deposit_one" / "inventory.json"
+    inventory_path.write_text(inventory_path.read_text().replace("First version!", "Edited!"))
+
+    codes = get_codes(StructuralAuditor(gateway.storage_path))
+
+    assert codes == {"deposit_one": ["E060"], "deposit_two": []}
+
+
+def test_auditor_finds_missing_sidecar_and_content(gateway: NativeOcflRepositoryGateway) -> None:
+    (gateway.storage_path / "deposit_one" / "inventory.json.sha512").unlink()
+    (gateway.storage_path / "deposit_two" / "v1" / "content" / "A.txt").unlink()
+
+    codes = get_codes(StructuralAuditor(gateway.storage_path))
+
+    assert codes == {"deposit_one": ["E058"], "deposit_two": ["E092"]}
+
+
+def test_auditor_compares_content_size_with_object_index(gateway: NativeOcflRepositoryGateway) -> None:
+    (gateway.storage_path / "deposit_one" / "v1" / "content" / "A.txt").write_text("truncated")
+
+    results = {str(result.object_path): result for result in StructuralAuditor(gateway.storage_path).audit_repository()}
+
+    assert not results["deposit_one"].is_valid
+    assert "object index records" in results["deposit_one"].message
+    assert results["deposit_two"].is_valid
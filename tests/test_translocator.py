@@ -1,9 +1,19 @@
+import shutil
 from pathlib import Path
 
 import pytest
 
+from dor.adapters.bag_adapter import BagAdapter
+from dor.domain.events import PackageReceived, PackageStored, PackageSubmitted, PackageUnpacked, PackageVerified
 from dor.providers.file_system_file_provider import FilesystemFileProvider
-from dor.providers.translocator import Translocator
+from dor.providers.package_resource_provider import PackageResourceProvider
+from dor.providers.translocator import InboxPolicy, Translocator, Workspace
+from dor.service_layer.handlers.receive_package import receive_package
+from dor.service_layer.handlers.store_files import store_files
+from dor.service_layer.handlers.unpack_package import unpack_package
+from dor.service_layer.handlers.verify_package import verify_package
+from dor.service_layer.unit_of_work import UnitOfWork
+from gateway.fake_repository_gateway import FakeRepositoryGateway
 
 
 @pytest.fixture
@@ -37,3 +47,84 @@ def test_translocator_can_create_workspace(inbox_path: Path, workspaces_path: Pa
 
     assert workspace.identifier == str(workspaces_path / "some_id")
     assert Path(workspace.identifier).exists()
+
+
+@pytest.fixture
+def tmp_inbox_path(inbox_path: Path, tmp_path: Path) -> Path:
+    shutil.copytree(inbox_path, tmp_path / "inbox")
+    return tmp_path / "inbox"
+
+
+def create_workspace(inbox_path: Path, workspaces_path: Path, inbox_policy: InboxPolicy) -> Path:
+    translocator = Translocator(
+        inbox_path=inbox_path,
+        workspaces_path=workspaces_path,
+        minter=lambda: "some_id",
+        file_provider=FilesystemFileProvider(),
+        inbox_policy=inbox_policy
+    )
+    return Path(translocator.create_workspace_for_package("xyzzy-00000000-0000-0000-0000-000000000001-v1").identifier)
+
+
+def get_files(path: Path) -> dict[Path, bytes]:
+    return {file.relative_to(path): file.read_bytes() for file in path.rglob("*") if file.is_file()}
+
+
+@pytest.mark.parametrize("inbox_policy", [InboxPolicy.keep, InboxPolicy.share])
+def test_translocator_keeps_inbox_copy(tmp_inbox_path: Path, tmp_path: Path, inbox_policy: InboxPolicy) -> None:
+    package_path = tmp_inbox_path / "xyzzy-00000000-0000-0000-0000-000000000001-v1"
+    package_files = get_files(package_path)
+
+    workspace_path = create_workspace(tmp_inbox_path, tmp_path / "workspaces", inbox_policy)
+
+    assert get_files(workspace_path) == package_files
+    assert get_files(package_path) == package_files
+
+
+def test_translocator_keep_policy_does_not_share_files(tmp_inbox_path: Path, tmp_path: Path) -> None:
+    package_path = tmp_inbox_path / "xyzzy-00000000-0000-0000-0000-000000000001-v1"
+
+    workspace_path = create_workspace(tmp_inbox_path, tmp_path / "workspaces", InboxPolicy.keep)
+
+    for file in workspace_path.rglob("*"):
+        if file.is_file():
+            assert file.stat().st_ino != (package_path / file.relative_to(workspace_path)).stat().st_ino
+
+
+def test_translocator_moves_package_out_of_inbox(tmp_inbox_path: Path, tmp_path: Path) -> None:
+    package_path = tmp_inbox_path / "xyzzy-00000000-0000-0000-0000-000000000001-v1"
+    package_files = get_files(package_path)
+
+    workspace_path = create_workspace(tmp_inbox_path, tmp_path / "workspaces", InboxPolicy.consume)
+
+    assert get_files(workspace_path) == package_files
+    assert not package_path.exists()
+
+
+def test_ingest_under_share_policy_leaves_inbox_package_valid(tmp_inbox_path: Path, tmp_path: Path) -> None:
+    package_identifier = "xyzzy-00000000-0000-0000-0000-000000000001-v1"
+    file_provider = FilesystemFileProvider()
+    translocator = Translocator(
+        inbox_path=tmp_inbox_path,
+        workspaces_path=tmp_path / "workspaces",
+        minter=lambda: "some_id",
+        file_provider=file_provider,
+        inbox_policy=InboxPolicy.share
+    )
+    uow = UnitOfWork(gateway=FakeRepositoryGateway())
+    handlers = {
+        PackageSubmitted: lambda event: receive_package(event, uow, translocator),
+        PackageReceived: lambda event: verify_package(event, uow, BagAdapter, Workspace, file_provider),
+        PackageVerified: lambda event: unpack_package(
+            event, uow, BagAdapter, PackageResourceProvider, Workspace, file_provider
+        ),
+        PackageUnpacked: lambda event: store_files(event, uow, Workspace),
+    }
+
+    uow.add_event(PackageSubmitted(package_identifier=package_identifier, tracking_identifier="tracking"))
+    while (event := uow.pop_event()) is not None and type(event) in handlers:
+        handlers[type(event)](event)
+
+    assert isinstance(event, PackageStored)
+    assert event.staging_summary.staged_files == len(get_files(tmp_path / "workspaces" / "some_id" / "data"))
+    BagAdapter.load(tmp_inbox_path / package_identifier, file_provider).validate()
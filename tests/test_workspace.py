@@ -1,5 +1,7 @@
+import os
 from pathlib import Path
 from dor.providers.translocator import Workspace
+from utils.digest_ledger import DigestLedger, LedgerEntry
 import pytest
 
 
@@ -37,3 +39,25 @@ def test_provides_bundle() -> None:
         Path("00000000-0000-0000-0000-000000000001/metadata/file.xml"),
         Path("00000000-0000-0000-0000-000000000001/data/file.jpg"),
     ]
+
+def test_provides_bundle_with_digests_from_workspace_ledger(tmp_path: Path) -> None:
+    package_directory = tmp_path / "UID-00001"
+    (package_directory / "data" / "root").mkdir(parents=True)
+    file_path = package_directory / "data" / "root" / "file.txt"
+    file_path.write_text("File\n")
+    changed_path = package_directory / "data" / "root" / "changed.txt"
+    changed_path.write_text("Changed\n")
+    DigestLedger({
+        "data/root/file.txt": LedgerEntry.for_file(file_path, {"sha512": "a" * 128}),
+        "data/root/changed.txt": LedgerEntry.for_file(changed_path, {"sha512": "b" * 128}),
+    }).write(DigestLedger.get_sidecar_path(package_directory))
+    # Rewritten at the same size, as regenerated descriptors usually are
+    recorded_mtime_ns = changed_path.stat().st_mtime_ns
+    changed_path.write_text("Chanted\n")
+    os.utime(changed_path, ns=(recorded_mtime_ns + 1_000_000, recorded_mtime_ns + 1_000_000))
+    workspace = Workspace(identifier=str(package_directory), root_identifier="root")
+
+    result = workspace.get_bundle([Path("root/file.txt"), Path("root/changed.txt")])
+
+    assert result.digests == {Path("root/file.txt"): {"sha512": "a" * 128}}
+    assert workspace.get_bundle([Path("root/file.txt")], with_digests=False).digests == {}
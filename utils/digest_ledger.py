@@ -0,0 +1,159 @@
+import json
+import math
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Iterable, Self
+
+from utils.digests import compute_digests
+
+# The algorithms bags are made with; sha512 is also what OCFL objects use
+LEDGER_ALGORITHMS = ["sha256", "sha512"]
+
+# The share of recorded digests checked under the sample policy
+DEFAULT_SAMPLE_RATE = 0.05
+
+
+def choose_sample(paths: Iterable[str], sample_rate: float = DEFAULT_SAMPLE_RATE) -> list[str]:
+    """Picks at least one of paths, if there are any, at random."""
+    paths = sorted(paths)
+    return random.sample(paths, math.ceil(len(paths) * sample_rate))
+
+
+class TrustPolicy(Enum):
+    # Recorded digests are used as they are
+    reuse = "reuse"
+    # A random sample of recorded digests is checked against the files before the rest are used
+    sample = "sample"
+    # Every file is hashed again and recorded digests are ignored
+    full = "full"
+
+
+class DigestLedgerMismatchError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    size: int
+    digests: dict[str, str]
+    # Copies made with shutil.copy2 or copystat keep it; entries without one are never current
+    mtime_ns: int | None = None
+
+    @classmethod
+    def for_file(cls, file_path: Path, digests: dict[str, str]) -> Self:
+        stat = file_path.stat()
+        return cls(size=stat.st_size, digests=digests, mtime_ns=stat.st_mtime_ns)
+
+    def is_current(self, file_path: Path) -> bool:
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+
+class DigestLedger:
+    """
+    Digests of the files under a directory, recorded when the files are produced and kept in a
+    JSON sidecar beside the directory, so later stages can use them instead of hashing the files again.
+    Paths are relative to the directory. An entry is only used while its file keeps the recorded size and
+    modification time, so a file rewritten in place is hashed again.
+    """
+
+    sidecar_suffix = ".digests.json"
+
+    def __init__(self, entries: dict[str, LedgerEntry] | None = None) -> None:
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def get_sidecar_path(cls, directory: Path) -> Path:
+        return directory.with_name(directory.name + cls.sidecar_suffix)
+
+    @classmethod
+    def read(cls, sidecar_path: Path) -> Self:
+        try:
+            data = json.loads(sidecar_path.read_text())
+        except FileNotFoundError:
+            return cls()
+        return cls({
+            path: LedgerEntry(size=entry["size"], digests=entry["digests"], mtime_ns=entry.get("mtime_ns"))
+            for path, entry in data.items()
+        })
+
+    def write(self, sidecar_path: Path) -> None:
+        temp_path = sidecar_path.with_name(f".{sidecar_path.name}.tmp")
+        temp_path.write_text(json.dumps({
+            path: {"size": entry.size, "mtime_ns": entry.mtime_ns, "digests": entry.digests}
+            for path, entry in sorted(self.entries.items())
+        }, indent=2))
+        os.replace(temp_path, sidecar_path)
+
+    @classmethod
+    def record_directory(
+        cls, directory: Path, algorithms: list[str] = LEDGER_ALGORITHMS, workers: int | None = None
+    ) -> Self:
+        file_paths = [
+            Path(parent) / file_name for parent, _, file_names in os.walk(directory) for file_name in file_names
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = executor.map(lambda file_path: compute_digests(file_path, algorithms), file_paths)
+            return cls({
+                file_path.relative_to(directory).as_posix(): LedgerEntry.for_file(file_path, file_digests)
+                for file_path, file_digests in zip(file_paths, digests)
+            })
+
+    def merge(self, other: "DigestLedger", prefix: str) -> None:
+        """Adds other's entries, recorded for a subdirectory named prefix."""
+        for path, entry in other.entries.items():
+            self.entries[f"{prefix}/{path}"] = entry
+
+    def get_current(
+        self, directory: Path, path: str, algorithms: Iterable[str] | None = None
+    ) -> dict[str, str] | None:
+        """
+        The recorded digests for path, for algorithms or else all of them, if the entry covers algorithms
+        and the file still has the recorded size and modification time.
+        """
+        entry = self.entries.get(path)
+        if algorithms is None and entry is not None:
+            algorithms = list(entry.digests)
+        if entry is None or any(algorithm not in entry.digests for algorithm in algorithms):
+            return None
+        if not entry.is_current(directory / path):
+            return None
+        return {algorithm: entry.digests[algorithm] for algorithm in algorithms}
+
+    def resolve(
+        self,
+        directory: Path,
+        paths: list[str],
+        algorithms: list[str],
+        trust_policy: TrustPolicy,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        workers: int | None = None,
+    ) -> dict[str, dict[str, str]]:
+        """
+        Gets the digests of each path, from the ledger where the trust policy allows and otherwise by hashing.
+        Under the sample policy, raises DigestLedgerMismatchError if a sampled file no longer matches its entry.
+        """
+        recorded = {}
+        if trust_policy != TrustPolicy.full:
+            for path in paths:
+                if (digests := self.get_current(directory, path, algorithms)) is not None:
+                    recorded[path] = digests
+        to_hash = [path for path in paths if path not in recorded]
+        to_check = choose_sample(recorded, sample_rate) if trust_policy == TrustPolicy.sample else []
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            hashed = dict(zip(
+                to_hash + to_check,
+                executor.map(lambda path: compute_digests(directory / path, algorithms), to_hash + to_check)
+            ))
+        for path in to_check:
+            if hashed[path] != recorded[path]:
+                raise DigestLedgerMismatchError(f"{path} does not match its recorded digests")
+        return {path: recorded.get(path) or hashed[path] for path in paths}
@@ -0,0 +1,43 @@
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+# Large reads keep the number of system calls low on multi-gigabyte images
+BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def compute_digests(file_path: Path, algorithms: Iterable[str], buffer_size: int = BUFFER_SIZE) -> dict[str, str]:
+    """
+    Computes a hex digest for each algorithm (e.g. "sha256", "sha512", "md5") from a single read of the file.
+    """
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as file:
+        while size := file.readinto(buffer):
+            chunk = view[:size]
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
+def copy_with_digests(
+    source_path: Path, dest_path: Path, algorithms: Iterable[str], buffer_size: int = BUFFER_SIZE
+) -> dict[str, str]:
+    """
+    Copies source_path to the new file dest_path, computing a hex digest for each algorithm from the same read.
+    """
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(source_path, "rb", buffering=0) as source, open(dest_path, "xb", buffering=0) as dest:
+        while size := source.readinto(buffer):
+            chunk = view[:size]
+            for hasher in hashers.values():
+                hasher.update(chunk)
+            dest.write(chunk)
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
+def compute_digest(file_path: Path, algorithm: str, buffer_size: int = BUFFER_SIZE) -> str:
+    return compute_digests(file_path, [algorithm], buffer_size)[algorithm]
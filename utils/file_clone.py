@@ -0,0 +1,64 @@
+import errno
+import fcntl
+import os
+import shutil
+from enum import Enum
+from pathlib import Path
+
+# Linux ioctl that shares a file's extents with another file (btrfs, XFS with reflink, bcachefs)
+FICLONE = 0x40049409
+
+# Errors meaning a method is unavailable for this pair of paths, rather than that the copy failed
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM, errno.EMLINK}
+
+
+class CloneMethod(Enum):
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    COPY = "copy"
+
+
+def reflink(source_path: Path, dest_path: Path) -> None:
+    with open(source_path, "rb") as source, open(dest_path, "xb") as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+        except OSError:
+            dest.close()
+            dest_path.unlink()
+            raise
+
+
+def clone_file(
+    source_path: Path,
+    dest_path: Path,
+    methods: tuple[CloneMethod, ...] = (CloneMethod.REFLINK, CloneMethod.HARDLINK, CloneMethod.COPY)
+) -> CloneMethod:
+    """
+    Places source_path's content at dest_path using the first of methods the filesystem supports,
+    returning the method used. Reflinks and hard links only work within a single filesystem.
+    """
+    for method in methods:
+        try:
+            match method:
+                case CloneMethod.REFLINK:
+                    reflink(source_path, dest_path)
+                case CloneMethod.HARDLINK:
+                    os.link(source_path, dest_path)
+                case CloneMethod.COPY:
+                    shutil.copy2(source_path, dest_path)
+            return method
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS or method == methods[-1]:
+                raise
+    raise ValueError("No clone methods given")
+
+
+def clone_tree(
+    source_path: Path,
+    dest_path: Path,
+    methods: tuple[CloneMethod, ...] = (CloneMethod.REFLINK, CloneMethod.HARDLINK, CloneMethod.COPY)
+) -> None:
+    """Recreates the directory tree at source_path as dest_path, placing each file with clone_file."""
+    shutil.copytree(
+        source_path, dest_path, copy_function=lambda source, dest: clone_file(Path(source), Path(dest), methods)
+    )